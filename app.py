@@ -4,18 +4,20 @@
 基于Flask的Web应用，提供友好的用户界面
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Request, Response, render_template, request, jsonify, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 import os
 import sys
 from pathlib import Path
 import uuid
 import threading
+import time
 import json
 
 # 导入项目模块（基础模块，无重型依赖）
-from calibration import Calibrator, ArUcoMarkerGenerator
-from writer import WriterMachine
+from calibration import Calibrator, ArUcoMarkerGenerator, ImageUnwarp
+from writer import WriterMachine, GlyphCache
+from engine_registry import EngineRegistry
 from bambu_adapter import BambuPrinterAdapter, PrinterConfig
 from bambu_camera import get_camera_manager, BambuCameraConfig, BambuCamera
 
@@ -53,10 +55,27 @@ except Exception as e:
     print(f"警告: 自动抄写模块加载失败: {e}")
     print("自动抄写功能将不可用")
 
+# 允许上传大文件的接口（请求体直接流式写入磁盘）
+LARGE_UPLOAD_ENDPOINTS = {'api_import_words_upload', 'api_ocr_batch'}
+
+
+class AppRequest(Request):
+    """按接口区分请求体大小上限"""
+
+    @property
+    def max_content_length(self):
+        if self.url_rule is not None and self.url_rule.endpoint in LARGE_UPLOAD_ENDPOINTS:
+            return app.config['IMPORT_MAX_CONTENT_LENGTH']
+        return app.config['MAX_CONTENT_LENGTH']
+
+
 app = Flask(__name__)
+app.request_class = AppRequest
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['IMPORT_MAX_CONTENT_LENGTH'] = 512 * 1024 * 1024  # 单词书导入文件上限
+app.config['IMPORT_CHUNK_SIZE'] = 1000  # 单词书导入时每批写入的单词数
 
 # 创建上传目录
 Path(app.config['UPLOAD_FOLDER']).mkdir(exist_ok=True)
@@ -64,6 +83,140 @@ Path(app.config['UPLOAD_FOLDER']).mkdir(exist_ok=True)
 # 全局变量存储任务状态
 task_status = {}
 
+# 学生词库池（进程内共享，复用长连接和内存集合，同时打开的词库数量有上限）
+app.config['KNOWN_WORDS_MAX_OPEN'] = 64
+# 超大词库可以改用布隆过滤器快照（多进程共享内存映射）代替每个进程的内存集合
+app.config['KNOWN_WORDS_BLOOM'] = False
+app.config['KNOWN_WORDS_BLOOM_FPR'] = 0.01
+known_words_pool = None
+known_words_pool_lock = threading.Lock()
+
+
+def get_known_words_pool():
+    """获取共享的学生词库池"""
+    global known_words_pool
+    with known_words_pool_lock:
+        if known_words_pool is None:
+            from auto_lookup import KnownWordsPool
+            known_words_pool = KnownWordsPool(
+                max_open=app.config['KNOWN_WORDS_MAX_OPEN'],
+                use_bloom=app.config['KNOWN_WORDS_BLOOM'],
+                bloom_fpr=app.config['KNOWN_WORDS_BLOOM_FPR']
+            )
+        return known_words_pool
+
+
+def get_profile_id():
+    """
+    获取当前请求的学生ID
+
+    依次读取查询参数 profile、请求头 X-Profile-Id、表单/JSON 中的 profile 字段，
+    都没有时返回 None（使用默认词库）。
+    """
+    profile_id = request.args.get('profile') or request.headers.get('X-Profile-Id')
+    if not profile_id and request.form:
+        profile_id = request.form.get('profile')
+    if not profile_id and request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            profile_id = data.get('profile')
+    return profile_id or None
+
+
+def get_known_words_db(profile_id=None):
+    """获取学生的已知单词数据库（默认使用当前请求的学生）"""
+    if profile_id is None:
+        profile_id = get_profile_id()
+    return get_known_words_pool().get(profile_id)
+
+
+# 共享引擎（OCR、图像矫正、查词、写字机）：每个进程只加载一次，所有请求复用
+# 服务启动时在后台预热，未预热完成的引擎在首次使用时加载
+app.config['ENGINE_WARMUP'] = True
+# 查词/抄写使用的图像矫正后端（none / traditional / learned），校准接口不做矫正
+app.config['UNWARP_BACKEND'] = ImageUnwarp.BACKEND_LEARNED
+engine_registry = EngineRegistry()
+
+
+def _create_unwarper():
+    unwarper = ImageUnwarp(backend=app.config['UNWARP_BACKEND'])
+    unwarper.warm_up()
+    return unwarper
+
+
+engine_registry.register('unwarp', _create_unwarper)
+# 字形笔画缓存（进程内共享，书写请求直接拼接缓存的字形）
+glyph_cache = GlyphCache()
+
+
+def _create_writer():
+    writer = WriterMachine(work_area_width=217.0, work_area_height=299.0, glyph_cache=glyph_cache)
+    writer.warm_up_glyphs()
+    return writer
+
+
+engine_registry.register('writer', _create_writer)
+
+
+# OCR结果缓存（按图像内容寻址，同一张图片重新查词时跳过OCR；目录为None时禁用）
+app.config['OCR_CACHE_DIR'] = 'ocr_cache'
+app.config['OCR_CACHE_MAX_BYTES'] = 256 * 1024 * 1024
+
+
+def _create_text_extractor():
+    from auto_lookup import TextExtractor
+    from ocr_cache import OCRCache
+    cache = None
+    if app.config['OCR_CACHE_DIR']:
+        cache = OCRCache(app.config['OCR_CACHE_DIR'], max_bytes=app.config['OCR_CACHE_MAX_BYTES'])
+    return TextExtractor(unwarper=engine_registry.get('unwarp'), cache=cache)
+
+
+def _create_word_lookup():
+    from word_lookup import WordLookup
+    return WordLookup(use_semantic_search=True)
+
+
+# 多页批量OCR的工作进程数（<=1 时使用进程内共享的OCR引擎）
+app.config['OCR_WORKERS'] = 1
+
+
+def _create_ocr_pool():
+    from auto_lookup import BatchTextExtractor
+    pool = BatchTextExtractor(
+        workers=app.config['OCR_WORKERS'],
+        unwarp_backend=app.config['UNWARP_BACKEND']
+    )
+    pool.warm_up()
+    return pool
+
+
+if AUTO_LOOKUP_AVAILABLE:
+    engine_registry.register('ocr', _create_text_extractor)
+    engine_registry.register('lookup', _create_word_lookup)
+
+_ocr_pool_lock = threading.Lock()
+
+
+def _register_ocr_pool():
+    """
+    按配置注册多进程OCR池（OCR_WORKERS > 1 时才注册，
+    否则它永远不会被构建，引擎总状态也就永远不会就绪）
+    """
+    if not AUTO_LOOKUP_AVAILABLE or app.config['OCR_WORKERS'] <= 1:
+        return
+    with _ocr_pool_lock:
+        if 'ocr_pool' not in engine_registry.names():
+            engine_registry.register('ocr_pool', _create_ocr_pool)
+
+
+def get_page_extractor():
+    """获取多页OCR使用的引擎（多进程池或进程内共享引擎）"""
+    if app.config['OCR_WORKERS'] > 1:
+        _register_ocr_pool()
+        return engine_registry.get('ocr_pool')
+    return engine_registry.get('ocr')
+
 
 @app.route('/')
 def index():
@@ -216,7 +369,8 @@ def api_write():
             printer_model=printer_model,
             layer_height=layer_height,
             nozzle_temp=nozzle_temp,
-            bed_temp=bed_temp
+            bed_temp=bed_temp,
+            glyph_cache=glyph_cache
         )
 
         filename = f"write_{uuid.uuid4().hex[:8]}.gcode"
@@ -263,8 +417,16 @@ def api_auto_lookup():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
 
-        # 处理
-        auto_lookup = AutoLookup()
+        # 处理（使用当前学生的词库和共享引擎）
+        auto_lookup = AutoLookup(
+            profile_id=get_profile_id(),
+            known_words_pool=get_known_words_pool(),
+            text_extractor=engine_registry.get('ocr'),
+            word_lookup=engine_registry.get('lookup'),
+            writer=engine_registry.get('writer'),
+            unwarper=engine_registry.get('unwarp'),
+            dedupe_policy=request.form.get('dedupe', AutoLookup.DEDUPE_EVERY)
+        )
 
         # 添加已知单词
         if known_words:
@@ -291,7 +453,10 @@ def api_auto_lookup():
                 'gcode_file': gcode_file,
                 'annotated_file': annotated_file,
                 'gcode_url': f'/api/download/{gcode_file}',
-                'annotated_url': f'/api/download/{annotated_file}'
+                'annotated_url': f'/api/download/{annotated_file}',
+                'pipeline': auto_lookup.last_pipeline_stats.to_dict(),
+                'dedupe': auto_lookup.last_dedupe_report.to_dict() if auto_lookup.last_dedupe_report else None,
+                'skipped_easy': auto_lookup.last_skipped_easy
             })
         else:
             return jsonify({'success': False, 'error': '处理失败'})
@@ -300,6 +465,91 @@ def api_auto_lookup():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/ocr/batch', methods=['POST'])
+def api_ocr_batch():
+    """
+    多页批量OCR
+
+    接受多个图片文件（字段 images）或多页PDF/TIFF，每页识别完成后立即以
+    NDJSON 流式返回（type=page），最后返回汇总行（type=summary，含页/分钟）。
+    """
+    if not AUTO_LOOKUP_AVAILABLE:
+        return jsonify({
+            'success': False,
+            'error': '自动查词模块未加载，请检查依赖安装（PaddleOCR、OpenCV等）'
+        })
+
+    try:
+        from auto_lookup import iter_document_pages, pages_per_minute
+
+        files = [f for f in request.files.getlist('images') if f.filename]
+        if not files:
+            return jsonify({'success': False, 'error': '未上传图片'})
+
+        unwarp = request.form.get('unwarp', 'true').lower() != 'false'
+
+        saved = []
+        for file in files:
+            filename = f"batch_{uuid.uuid4().hex[:8]}_{secure_filename(file.filename)}"
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            file.save(filepath)
+            saved.append((file.filename, filepath))
+
+        extractor = get_page_extractor()
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+    # 页码 -> (来源文件, 文件内页码)，按读取顺序追加
+    page_sources = []
+
+    def iter_pages():
+        for source, filepath in saved:
+            for number, image in enumerate(iter_document_pages(filepath), 1):
+                page_sources.append((source, number))
+                yield image
+
+    def generate():
+        start = time.perf_counter()
+        count = 0
+        error = None
+        try:
+            for page in extractor.extract_pages(iter_pages(), unwarp=unwarp):
+                count += 1
+                source, number = page_sources[page.page_index]
+                yield json.dumps({
+                    'type': 'page',
+                    'page_index': page.page_index,
+                    'source': source,
+                    'source_page': number,
+                    'seconds': round(page.seconds, 3),
+                    'results': [
+                        {
+                            'text': r.text,
+                            'bbox': [[float(x), float(y)] for x, y in r.bbox],
+                            'confidence': float(r.confidence),
+                            'center': [r.center[0], r.center[1]]
+                        }
+                        for r in page.results
+                    ],
+                    'pages_done': count,
+                    'pages_per_minute': pages_per_minute(count, time.perf_counter() - start)
+                }, ensure_ascii=False) + '\n'
+        except Exception as e:
+            error = str(e)
+
+        elapsed = time.perf_counter() - start
+        yield json.dumps({
+            'type': 'summary',
+            'success': error is None,
+            'error': error,
+            'pages': count,
+            'elapsed_seconds': round(elapsed, 3),
+            'pages_per_minute': pages_per_minute(count, elapsed)
+        }, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @app.route('/api/auto-copy', methods=['POST'])
 def api_auto_copy():
     """自动抄写"""
@@ -323,8 +573,11 @@ def api_auto_copy():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
 
-        # 处理
-        auto_copy = AutoCopy()
+        # 处理（使用共享引擎）
+        auto_copy = AutoCopy(
+            writer=engine_registry.get('writer'),
+            unwarper=engine_registry.get('unwarp')
+        )
 
         # 输出文件
         gcode_file = f"copy_{uuid.uuid4().hex[:8]}.gcode"
@@ -356,6 +609,21 @@ def api_auto_copy():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/engines/status')
+def api_engines_status():
+    """获取共享引擎的加载状态"""
+    response = {
+        'success': True,
+        'ready': engine_registry.is_ready(),
+        'engines': engine_registry.status()
+    }
+    if 'ocr' in engine_registry.names() and engine_registry.is_ready('ocr'):
+        cache = engine_registry.get('ocr').cache
+        if cache is not None:
+            response['ocr_cache'] = cache.stats()
+    return jsonify(response)
+
+
 @app.route('/api/download/<filename>')
 def api_download(filename):
     """下载文件"""
@@ -392,24 +660,10 @@ def api_add_known_words():
         if not words:
             return jsonify({'success': False, 'error': '单词列表为空'})
 
-        # 创建数据库实例
-        from auto_lookup import KnownWordsDatabase
-        db = KnownWordsDatabase()
-
-        # 统计
-        added_count = 0
-        skipped_count = 0
-
-        for word in words:
-            if not word:
-                continue
-
-            # 检查是否已存在
-            if db.is_known(word):
-                skipped_count += 1
-            else:
-                db.add_word(word)
-                added_count += 1
+        # 单个事务批量写入
+        result = get_known_words_db().add_words(words)
+        added_count = result['added']
+        skipped_count = result['skipped']
 
         return jsonify({
             'success': True,
@@ -422,19 +676,253 @@ def api_add_known_words():
         return jsonify({'success': False, 'error': str(e)})
 
 
+def _known_words_etag(version: int) -> str:
+    """
+    已知单词列表的ETag（不同查询参数的URL由浏览器分别缓存）
+
+    每个学生的数据版本各自递增，学生ID可能来自请求头（URL不变），
+    因此ETag中包含学生ID，避免两个版本号相同的学生互相命中304。
+    """
+    from auto_lookup import KnownWordsPool
+    profile_id = KnownWordsPool.normalize_profile_id(get_profile_id())
+    return f'known-words-{profile_id}-{version}'
+
+
+def _known_words_not_modified(version: int):
+    """如果客户端的 If-None-Match 与当前版本一致，返回304响应，否则返回None"""
+    etag = _known_words_etag(version)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        return _with_known_words_etag(response, version)
+    return None
+
+
+def _with_known_words_etag(response, version: int):
+    """为响应设置ETag，并要求浏览器每次使用前重新验证"""
+    response.set_etag(_known_words_etag(version))
+    response.headers['Cache-Control'] = 'no-cache'
+    # 学生ID可以通过请求头指定，缓存需要按该请求头区分
+    response.vary.add('X-Profile-Id')
+    return response
+
+
+def _run_import_task(task_id: str, file_path: str, chunk_size: int, profile_id=None):
+    """
+    后台导入单词书文件（逐行/逐个对象解析，分批写入数据库）
+
+    Args:
+        task_id: 任务ID
+        file_path: 已保存到磁盘的上传文件
+        chunk_size: 每批写入的单词数
+        profile_id: 学生ID
+    """
+    from validate_json import iter_word_records
+
+    status = task_status[task_id]
+    stats = {}
+    chunk = []
+
+    def flush():
+        result = get_known_words_pool().get(profile_id).add_words(chunk)
+        status['added'] += result['added']
+        status['skipped'] += result['skipped']
+        chunk.clear()
+
+    try:
+        for record in iter_word_records(file_path, stats):
+            status['format'] = stats.get('format')
+            word = str(record.get('headWord', '')).strip()
+            if not word:
+                continue
+            chunk.append(word)
+            status['processed'] += 1
+            if len(chunk) >= chunk_size:
+                flush()
+
+        if chunk:
+            flush()
+
+        status['format'] = stats.get('format')
+        status['errors'] = stats.get('errors', 0)
+        status['status'] = 'completed'
+        status['message'] = f"导入完成：新增 {status['added']} 个，跳过 {status['skipped']} 个"
+
+    except Exception as e:
+        status['status'] = 'failed'
+        status['error'] = str(e)
+
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+@app.route('/api/import-words/upload', methods=['POST'])
+def api_import_words_upload():
+    """
+    上传单词书文件并在服务器端导入为已知单词
+
+    支持直接以请求体上传文件（推荐，浏览器无需读入整个文件），
+    也支持 multipart/form-data 的 file 字段。
+    文件先流式写入磁盘，再在后台线程中解析和分批写入，
+    通过 /api/task-status/<task_id> 查询进度。
+    """
+    try:
+        # 先校验学生ID，避免写完大文件后才失败
+        profile_id = get_known_words_pool().normalize_profile_id(request.args.get('profile'))
+
+        task_id = uuid.uuid4().hex
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"import_{task_id}.json")
+
+        if 'file' in request.files:
+            request.files['file'].save(file_path)
+        else:
+            with open(file_path, 'wb') as f:
+                while True:
+                    data = request.stream.read(1024 * 1024)
+                    if not data:
+                        break
+                    f.write(data)
+
+        if os.path.getsize(file_path) == 0:
+            os.remove(file_path)
+            return jsonify({'success': False, 'error': '文件为空'})
+
+        task_status[task_id] = {
+            'status': 'running',
+            'type': 'import_words',
+            'profile': profile_id,
+            'filename': request.args.get('filename') or request.headers.get('X-Filename', ''),
+            'format': None,
+            'processed': 0,
+            'added': 0,
+            'skipped': 0,
+            'errors': 0
+        }
+
+        thread = threading.Thread(
+            target=_run_import_task,
+            args=(task_id, file_path, app.config['IMPORT_CHUNK_SIZE'], profile_id),
+            daemon=True
+        )
+        thread.start()
+
+        return jsonify({'success': True, 'task_id': task_id})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @app.route('/api/get-known-words', methods=['GET'])
 def api_get_known_words():
     """获取所有已知单词"""
     try:
-        from auto_lookup import KnownWordsDatabase
-        db = KnownWordsDatabase()
+        db = get_known_words_db()
+        version = db.get_version()
+        not_modified = _known_words_not_modified(version)
+        if not_modified is not None:
+            return not_modified
+
         words = db.get_all_words()
 
-        return jsonify({
+        return _with_known_words_etag(jsonify({
             'success': True,
+            'version': version,
             'words': words,
             'count': len(words)
-        })
+        }), version)
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@app.route('/api/known-words', methods=['GET'])
+def api_list_known_words():
+    """
+    分页获取已知单词
+
+    查询参数：
+        prefix: 单词前缀
+        limit: 每页数量（1-500，默认100）
+        cursor: 上一页返回的 next_cursor
+        order: desc（最新在前，默认）或 asc
+    """
+    try:
+        prefix = request.args.get('prefix', '')
+        cursor = request.args.get('cursor') or None
+        order = request.args.get('order', 'desc')
+        try:
+            limit = min(max(int(request.args.get('limit', 100)), 1), 500)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'limit必须是整数'}), 400
+
+        db = get_known_words_db()
+
+        # 数据未变化时直接返回304（先取版本号，之后的写入最多让客户端多拿到新数据）
+        version = db.get_version()
+        not_modified = _known_words_not_modified(version)
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            page = db.list_words(prefix=prefix, limit=limit, cursor=cursor,
+                                 descending=(order != 'asc'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        result = {
+            'success': True,
+            'version': version,
+            'words': page['words'],
+            'next_cursor': page['next_cursor']
+        }
+        # 总数只在第一页返回
+        if not cursor:
+            result['total'] = db.count_words(prefix)
+
+        return _with_known_words_etag(jsonify(result), version)
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@app.route('/api/known-words/changes', methods=['GET'])
+def api_known_words_changes():
+    """
+    获取已知单词的增量变化
+
+    查询参数：
+        since: 客户端已同步到的版本号（来自列表接口或上一次增量结果的 version）
+        prefix: 可选，同时返回该前缀下的单词总数（与列表接口的 total 一致）
+
+    客户端版本号比服务器还新（例如数据库被替换）时返回 reset=true，需要重新加载完整列表。
+    """
+    try:
+        try:
+            since = int(request.args.get('since', ''))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'since必须是整数'}), 400
+
+        db = get_known_words_db()
+        version = db.get_version()
+
+        if since < 0 or since > version:
+            return jsonify({'success': True, 'reset': True, 'version': version})
+
+        not_modified = _known_words_not_modified(version)
+        if not_modified is not None:
+            return not_modified
+
+        changes = db.get_changes(since)
+        return _with_known_words_etag(jsonify({
+            'success': True,
+            'reset': False,
+            'version': changes['version'],
+            'added': changes['added'],
+            'removed': changes['removed'],
+            'total': db.count_words(request.args.get('prefix', ''))
+        }), changes['version'])
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -450,9 +938,7 @@ def api_remove_known_word():
         if not word:
             return jsonify({'success': False, 'error': '单词不能为空'})
 
-        from auto_lookup import KnownWordsDatabase
-        db = KnownWordsDatabase()
-        db.remove_word(word)
+        get_known_words_db().remove_word(word)
 
         return jsonify({
             'success': True,
@@ -463,6 +949,31 @@ def api_remove_known_word():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/known-words/skip-rank', methods=['GET', 'POST'])
+def api_known_words_skip_rank():
+    """
+    获取/设置学生的简单词跳过阈值
+
+    POST JSON: {"skip_rank": N}，词频排名前N的单词在查词时直接跳过（0表示不跳过）
+    """
+    try:
+        db = get_known_words_db()
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            try:
+                skip_rank = int(data.get('skip_rank', 0))
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'skip_rank 必须是整数'}), 400
+            if skip_rank < 0:
+                return jsonify({'success': False, 'error': 'skip_rank 不能为负数'}), 400
+            db.set_skip_rank(skip_rank)
+
+        return jsonify({'success': True, 'skip_rank': db.get_skip_rank()})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @app.route('/api/task-status/<task_id>')
 def api_task_status(task_id):
     """获取任务状态"""
@@ -952,8 +1463,16 @@ def api_printer_delete():
         return jsonify({'success': False, 'error': str(e)})
 
 
-def run_server(host='127.0.0.1', port=5000, debug=True):
-    """运行服务器"""
+def run_server(host='127.0.0.1', port=5000, debug=True, warmup=None):
+    """
+    运行服务器
+
+    Args:
+        host: 监听地址
+        port: 监听端口
+        debug: 调试模式
+        warmup: 是否在后台预热共享引擎（默认读取 ENGINE_WARMUP 配置）
+    """
     # 构建功能状态信息
     features = []
     features.append("[OK] 生成ArUco标记")
@@ -988,6 +1507,16 @@ def run_server(host='127.0.0.1', port=5000, debug=True):
 ======================================================================
     """)
 
+    _register_ocr_pool()
+
+    if warmup is None:
+        warmup = app.config['ENGINE_WARMUP']
+    # 调试模式下重载器会先启动一个监控进程，只在实际提供服务的子进程中预热
+    if warmup and (not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        names = engine_registry.names()
+        print("正在后台预热引擎: " + ', '.join(names))
+        engine_registry.warm_up(names)
+
     app.run(host=host, port=port, debug=debug)
 
 
@@ -998,7 +1527,10 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='127.0.0.1', help='监听地址')
     parser.add_argument('--port', type=int, default=5000, help='监听端口')
     parser.add_argument('--debug', type=lambda x: x.lower() == 'true', default=True, help='调试模式')
+    parser.add_argument('--no-warmup', action='store_true', help='启动时不预热引擎（首次使用时加载）')
+    parser.add_argument('--ocr-workers', type=int, default=1, help='多页批量OCR的工作进程数（默认1）')
 
     args = parser.parse_args()
+    app.config['OCR_WORKERS'] = args.ocr_workers
 
-    run_server(host=args.host, port=args.port, debug=args.debug)
+    run_server(host=args.host, port=args.port, debug=args.debug, warmup=False if args.no_warmup else None)
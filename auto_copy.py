@@ -24,6 +24,7 @@ except ImportError:
     print("警告: PaddleOCR未安装")
 
 from calibration import Calibrator, ImageUnwarp
+from line_clustering import cluster_lines, estimate_skew
 from writer import WriterMachine
 
 
@@ -138,25 +139,25 @@ class LineDetector:
         if not lines:
             return []
 
-        # 按Y坐标排序
-        sorted_lines = sorted(lines, key=lambda l: l.y1)
+        # 按Y坐标聚类（相邻横线间隔不超过阈值的归为一条，倾斜的页面先校正）
+        boxes = np.asarray([[[l.x1, l.y1], [l.x2, l.y2], [l.x2, l.y2], [l.x1, l.y1]] for l in lines])
+        labels = cluster_lines(
+            np.asarray([(l.y1 + l.y2) / 2 for l in lines]),
+            threshold=y_threshold,
+            xs=np.asarray([(l.x1 + l.x2) / 2 for l in lines]),
+            slope=estimate_skew(boxes)
+        )
 
-        # 合并
+        # 合并：每组以最上面的横线为基准，扩展X范围
         merged = []
-        current_line = sorted_lines[0]
-
-        for line in sorted_lines[1:]:
-            # 如果Y坐标相近，合并
-            if abs(line.y1 - current_line.y1) < y_threshold:
-                # 扩展X范围
+        for index in np.lexsort(([l.y1 for l in lines], labels)).tolist():
+            line = lines[index]
+            if len(merged) <= labels[index]:
+                merged.append(line)
+            else:
+                current_line = merged[-1]
                 current_line.x1 = min(current_line.x1, line.x1)
                 current_line.x2 = max(current_line.x2, line.x2)
-            else:
-                # 否则，添加当前线并开始新线
-                merged.append(current_line)
-                current_line = line
-
-        merged.append(current_line)
 
         print(f"✓ 合并后剩余 {len(merged)} 条横线")
         return merged
@@ -365,7 +366,9 @@ class AutoCopy:
     def __init__(
         self,
         work_area_width: float = 217.0,
-        work_area_height: float = 299.0
+        work_area_height: float = 299.0,
+        writer: Optional[WriterMachine] = None,
+        unwarper: Optional[ImageUnwarp] = None
     ):
         """
         初始化自动抄写器
@@ -373,13 +376,16 @@ class AutoCopy:
         Args:
             work_area_width: 工作区宽度（毫米）
             work_area_height: 工作区高度（毫米）
+            writer: 共享的写字机控制器（默认新建）
+            unwarper: 共享的图像矫正器（默认新建）
         """
         self.line_detector = LineDetector()
         self.area_extractor = WriteAreaExtractor()
         self.layout_engine = TextLayoutEngine()
-        self.writer = WriterMachine(work_area_width=work_area_width, work_area_height=work_area_height)
+        self.writer = writer or WriterMachine(work_area_width=work_area_width, work_area_height=work_area_height)
+        self.unwarper = unwarper or ImageUnwarp()
+        # 校准器只做坐标变换，不需要图像矫正
         self.calibrator = Calibrator()
-        self.unwarper = ImageUnwarp()
 
     def copy_text(
         self,
@@ -13,12 +13,23 @@
 
 import cv2
 import numpy as np
+import os
 import sqlite3
 import re
+import json
+import base64
+import sys
+import time
+import threading
+import multiprocessing
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional, Set, Iterable, Iterator
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from functools import lru_cache
 
 try:
     import torch
@@ -28,11 +39,33 @@ except ImportError:
     PADDLEOCR_AVAILABLE = False
     print("警告: PaddleOCR未安装，OCR功能将不可用")
 
-from word_lookup import WordLookup
+# PDF页面渲染（可选，用于多页试卷）
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+from word_lookup import WordLookup, LookupResult, lemmatize, lemmatizer_name, lemma_candidates
+from word_frequency import WordFrequencyTable, get_frequency_table
+from bloom_filter import BloomFilter, open_bloom_filter
+from ocr_preprocess import (OCRPlan, OCRPreprocessor, crop_text_region, merge_tile_boxes,
+                            to_original_coordinates)
+from ocr_cache import OCRCache
+from occupancy import OccupancyMap
+from line_clustering import cluster_lines, estimate_skew
 from calibration import Calibrator, ImageUnwarp
 from writer import WriterMachine, Stroke, GcodePoint
 
 
+# 始终忽略的常见虚词（更多简单词按学生的词频阈值跳过，见 word_frequency）
+COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'of', 'for', 'with', 'by', 'from', 'as', 'is', 'was', 'are',
+    'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did'
+})
+
+
 @dataclass
 class OCRResult:
     """OCR识别结果"""
@@ -41,6 +74,33 @@ class OCRResult:
     confidence: float
     center: Tuple[float, float]  # 中心点坐标
 
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典"""
+        return {
+            'text': self.text,
+            'bbox': [[float(x), float(y)] for x, y in self.bbox],
+            'confidence': float(self.confidence),
+            'center': [float(self.center[0]), float(self.center[1])],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OCRResult':
+        """从 to_dict() 的结果还原"""
+        return cls(
+            text=data['text'],
+            bbox=data['bbox'],
+            confidence=data['confidence'],
+            center=tuple(data['center'])
+        )
+
+
+@dataclass
+class PageOCRResult:
+    """单页OCR结果（批量识别）"""
+    page_index: int  # 页码（从0开始，按输入顺序）
+    results: List[OCRResult]
+    seconds: float  # 该页识别耗时（秒）
+
 
 @dataclass
 class WordPosition:
@@ -55,39 +115,278 @@ class WordPosition:
 class Annotation:
     """标注信息"""
     text: str  # 要书写的文字（释义或音标）
-    position: Tuple[float, float]  # 书写位置（物理坐标，毫米）
+    position: Tuple[float, float]  # 书写位置（物理坐标，毫米，文字中心）
     is_phonetic: bool  # 是否为音标
+    width: float = 0.0  # 估计的书写宽度（避让重叠时计算）
+    height: float = 0.0  # 书写字高
+    on_print: bool = False  # 找不到空白位置、只能写在印刷文字上
 
 
 class KnownWordsDatabase:
-    """已知单词数据库"""
+    """
+    已知单词数据库
+
+    持有一个长连接（WAL模式），并把整张表镜像到内存集合中，
+    is_known 只做集合查找。其他进程/连接写入时通过 PRAGMA data_version
+    检测到变化并重新加载，保证不会返回过期数据。
 
-    def __init__(self, db_path: str = "known_words.db"):
+    每个单词在写入时计算一次词元（lemma 列，带索引），
+    标记了 decide 之后，decided/decides/deciding 也会被视为已知。
+    """
+
+    # 布隆过滤器模式下，快照之后新增的单词超过该比例（或下限）时重建快照
+    BLOOM_REBUILD_RATIO = 0.05
+    BLOOM_REBUILD_MIN = 1000
+
+    def __init__(
+        self,
+        db_path: str = "known_words.db",
+        use_bloom: bool = False,
+        bloom_fpr: float = 0.01,
+        bloom_path: Optional[str] = None
+    ):
         """
         初始化已知单词数据库
 
         Args:
             db_path: 数据库路径
+            use_bloom: 是否使用布隆过滤器代替内存集合（适合几十万词的超大词库）
+            bloom_fpr: 布隆过滤器的目标误判率
+            bloom_path: 布隆过滤器快照路径（默认为 数据库路径 + '.bloom'）
         """
         self.db_path = db_path
+        self.use_bloom = use_bloom
+        self.bloom_fpr = bloom_fpr
+        self.bloom_path = bloom_path or f"{db_path}.bloom"
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # 集合模式下是整张表的镜像；布隆过滤器模式下只保存快照之后新增的单词/词元
+        self._words: Set[str] = set()
+        self._lemmas: Set[str] = set()
+        self._data_version: Optional[int] = None
         self._init_database()
+        self._reload_words()
 
     def _init_database(self):
-        """初始化数据库"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # 创建表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS known_words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT UNIQUE NOT NULL,
-                add_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        """初始化数据库（包括为旧数据库添加词元列并回填）"""
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            try:
+                cursor.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.Error as e:
+                print(f"警告: 无法启用WAL模式: {e}")
+
+            # 创建表
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS known_words (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT UNIQUE NOT NULL,
+                    add_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    lemma TEXT
+                )
+            ''')
+
+            # 旧版本数据库没有词元列
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(known_words)')}
+            if 'lemma' not in columns:
+                cursor.execute('ALTER TABLE known_words ADD COLUMN lemma TEXT')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_known_words_lemma ON known_words (lemma)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_known_words_add_time ON known_words (add_time, id)')
+
+            # 记录词元的计算方法，方法变化后需要重新计算
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS known_words_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+            # 变更日志：由触发器维护单调递增的版本号，支持增量同步
+            changes_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'known_words_changes'"
+            ).fetchone()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS known_words_changes (
+                    version INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT NOT NULL,
+                    op TEXT NOT NULL
+                )
+            ''')
+            if not changes_exists:
+                # 旧数据库中已有的单词记为最早的添加操作
+                cursor.execute(
+                    "INSERT INTO known_words_changes (word, op) "
+                    "SELECT word, 'add' FROM known_words ORDER BY add_time, id"
+                )
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_known_words_insert AFTER INSERT ON known_words
+                BEGIN
+                    INSERT INTO known_words_changes (word, op) VALUES (NEW.word, 'add');
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_known_words_delete AFTER DELETE ON known_words
+                BEGIN
+                    INSERT INTO known_words_changes (word, op) VALUES (OLD.word, 'remove');
+                END
+            ''')
+
+            self._conn.commit()
+
+        stored = self._get_meta('lemmatizer')
+        if stored != lemmatizer_name():
+            count = self.backfill_lemmas(force=stored is not None)
+        else:
+            count = self.backfill_lemmas()
+        if count:
+            print(f"✓ 已为 {count} 个已知单词计算词元")
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        """读取元数据"""
+        row = self._conn.execute('SELECT value FROM known_words_meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def backfill_lemmas(self, force: bool = False) -> int:
+        """
+        回填词元列
+
+        Args:
+            force: 是否重新计算所有行（默认只计算词元为空的行）
+
+        Returns:
+            更新的行数
+        """
+        with self._lock:
+            sql = 'SELECT id, word FROM known_words'
+            if not force:
+                sql += ' WHERE lemma IS NULL'
+            rows = self._conn.execute(sql).fetchall()
+
+            with self._conn:
+                self._conn.executemany(
+                    'UPDATE known_words SET lemma = ? WHERE id = ?',
+                    ((lemmatize(word), row_id) for row_id, word in rows)
+                )
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO known_words_meta (key, value) VALUES (?, ?)',
+                    ('lemmatizer', lemmatizer_name())
+                )
+
+            # 词元变化后布隆过滤器快照中的词元键已失效（其他进程的快照同样需要重建）
+            if rows and (self.use_bloom or os.path.exists(self.bloom_path)):
+                self.rebuild_bloom()
+
+            self._reload_words()
+            return len(rows)
+
+    def _get_data_version(self) -> int:
+        """获取数据版本号（其他连接提交后会变化）"""
+        return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def _reload_words(self):
+        """从数据库重新加载内存集合"""
+        with self._lock:
+            self._data_version = self._get_data_version()
+            if self.use_bloom:
+                self._reload_bloom()
+                return
+
+            words = set()
+            lemmas = set()
+            for word, lemma in self._conn.execute('SELECT word, lemma FROM known_words'):
+                words.add(word)
+                lemmas.add(lemma if lemma is not None else lemmatize(word))
+            self._words = words
+            self._lemmas = lemmas
+
+    def _reload_bloom(self):
+        """加载布隆过滤器快照（必要时重建），并读取快照之后新增的单词"""
+        version = self.get_version()
+
+        bloom = self._bloom
+        if bloom is None or not self._bloom_file_unchanged(bloom):
+            if bloom is not None:
+                bloom.close()
+            bloom = self._bloom = open_bloom_filter(self.bloom_path)
+
+        # 快照比数据库还新（数据库被替换）或不存在时重新构建
+        if bloom is None or bloom.version > version:
+            self.rebuild_bloom()
+            return
+
+        words = set()
+        lemmas = set()
+        for word, lemma in self._conn.execute(
+            'SELECT c.word, k.lemma FROM known_words_changes c '
+            'JOIN known_words k ON k.word = c.word '
+            "WHERE c.version > ? AND c.op = 'add'",
+            (bloom.version,)
+        ):
+            words.add(word)
+            lemmas.add(lemma if lemma is not None else lemmatize(word))
+        self._words = words
+        self._lemmas = lemmas
+
+        self._maybe_rebuild_bloom()
+
+    def _bloom_file_unchanged(self, bloom: BloomFilter) -> bool:
+        """快照文件是否仍是已映射的那一个（其他进程重建后会被替换）"""
+        try:
+            stat = os.stat(self.bloom_path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) == bloom.file_id
+
+    def _maybe_rebuild_bloom(self):
+        """快照之后新增的单词过多时重建快照"""
+        if self._bloom is None:
+            return
+        threshold = max(self.BLOOM_REBUILD_MIN, int(self._bloom.count * self.BLOOM_REBUILD_RATIO))
+        if len(self._words) + len(self._lemmas) > threshold:
+            self.rebuild_bloom()
 
-        conn.commit()
-        conn.close()
+    def rebuild_bloom(self, false_positive_rate: Optional[float] = None) -> int:
+        """
+        重建布隆过滤器快照（单词和词元都会写入）
+
+        Args:
+            false_positive_rate: 目标误判率（默认使用初始化时的设置）
+
+        Returns:
+            写入的键数量
+        """
+        if false_positive_rate is not None:
+            self.bloom_fpr = false_positive_rate
+
+        with self._lock:
+            version = self.get_version()
+            count = self._conn.execute('SELECT COUNT(*) FROM known_words').fetchone()[0]
+
+            def keys():
+                for word, lemma in self._conn.execute('SELECT word, lemma FROM known_words'):
+                    yield 'w:' + word
+                    yield 'l:' + (lemma if lemma is not None else lemmatize(word))
+
+            inserted = BloomFilter.build(self.bloom_path, keys(), count * 2, self.bloom_fpr, version)
+
+            # 未使用布隆过滤器时只更新快照文件（供其他进程使用），内存集合保持不变
+            if not self.use_bloom:
+                return inserted
+
+            if self._bloom is not None:
+                self._bloom.close()
+            self._bloom = open_bloom_filter(self.bloom_path)
+            self._words = set()
+            self._lemmas = set()
+            return inserted
+
+    def _sync(self):
+        """如果其他连接修改过数据库，重新加载内存集合"""
+        if self._get_data_version() != self._data_version:
+            self._reload_words()
 
     def add_word(self, word: str):
         """
@@ -96,39 +395,119 @@ class KnownWordsDatabase:
         Args:
             word: 单词
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        word = word.lower()
+        lemma = lemmatize(word)
+
+        with self._lock:
+            try:
+                self._sync()
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO known_words (word, lemma) VALUES (?, ?)', (word, lemma)
+                )
+                self._conn.commit()
+                self._words.add(word)
+                self._lemmas.add(lemma)
+                if self.use_bloom:
+                    self._maybe_rebuild_bloom()
+            except Exception as e:
+                self._conn.rollback()
+                print(f"添加单词失败: {e}")
+
+    def add_words(self, words: Iterable[str]) -> Dict[str, int]:
+        """
+        批量添加已知单词（单个事务内 executemany + INSERT OR IGNORE）
 
-        try:
-            cursor.execute('INSERT OR IGNORE INTO known_words (word) VALUES (?)', (word.lower(),))
-            conn.commit()
-        except Exception as e:
-            print(f"添加单词失败: {e}")
-        finally:
-            conn.close()
+        Args:
+            words: 单词序列（会去除首尾空白、转小写并去重，空字符串忽略）
 
-    def is_known(self, word: str) -> bool:
+        Returns:
+            {'added': 新增数量, 'skipped': 已存在或重复的数量}
+        """
+        total = 0
+        unique: List[str] = []
+        seen: Set[str] = set()
+        for word in words:
+            word = str(word).strip().lower() if word else ''
+            if not word:
+                continue
+            total += 1
+            if word not in seen:
+                seen.add(word)
+                unique.append(word)
+
+        if not unique:
+            return {'added': 0, 'skipped': total}
+
+        rows = [(word, lemmatize(word)) for word in unique]
+
+        with self._lock:
+            try:
+                self._sync()
+                # total_changes 会把触发器写入 known_words_changes 的行也计算在内，
+                # 因此按事务前后的行数计算新增数量
+                with self._conn:
+                    before = self._conn.execute('SELECT COUNT(*) FROM known_words').fetchone()[0]
+                    self._conn.executemany(
+                        'INSERT OR IGNORE INTO known_words (word, lemma) VALUES (?, ?)', rows
+                    )
+                    after = self._conn.execute('SELECT COUNT(*) FROM known_words').fetchone()[0]
+                added = after - before
+                self._words.update(unique)
+                self._lemmas.update(lemma for _, lemma in rows)
+                if self.use_bloom:
+                    self._maybe_rebuild_bloom()
+            except Exception as e:
+                print(f"批量添加单词失败: {e}")
+                return {'added': 0, 'skipped': 0}
+
+        return {'added': added, 'skipped': total - added}
+
+    def is_known(self, word: str, lemma: Optional[str] = None) -> bool:
         """
-        检查单词是否已知
+        检查单词是否已知（单词本身或其词元已知即可）
+
+        没有WordNet时还会按后缀规则列出候选原形，与词库中的单词和词元比对，
+        这样只标记了 perplex 时 perplexed 也视为已知（词频表中没有 perplex）。
 
         Args:
             word: 单词
+            lemma: 预先计算好的词元（不提供时现场计算）
 
         Returns:
             是否已知
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute('SELECT 1 FROM known_words WHERE word = ?', (word.lower(),))
-            result = cursor.fetchone()
-            return result is not None
-        except Exception as e:
-            print(f"检查单词失败: {e}")
-            return False
-        finally:
-            conn.close()
+        word = word.lower()
+
+        with self._lock:
+            try:
+                self._sync()
+            except Exception as e:
+                print(f"检查单词失败: {e}")
+                return False
+            if lemma is None:
+                lemma = lemmatize(word)
+            candidates = [c for c in lemma_candidates(word) if c != lemma]
+
+            words = self._words
+            lemmas = self._lemmas
+            if not self.use_bloom:
+                return (word in words or lemma in lemmas or
+                        any(c in lemmas or c in words for c in candidates))
+
+            # 布隆过滤器判定为不存在时一定不存在；命中时（可能误判）再查询数据库确认
+            bloom = self._bloom
+            if not (word in words or lemma in lemmas or
+                    any(c in lemmas or c in words for c in candidates) or
+                    (bloom is not None and ('w:' + word in bloom or 'l:' + lemma in bloom or
+                                            any('l:' + c in bloom or 'w:' + c in bloom for c in candidates)))):
+                return False
+            bases = [lemma] + candidates
+            marks = ','.join('?' * len(bases))
+            row = self._conn.execute(
+                f'SELECT 1 FROM known_words WHERE word = ? OR lemma IN ({marks}) OR word IN ({marks}) LIMIT 1',
+                [word] + bases + bases
+            ).fetchone()
+            return row is not None
 
     def remove_word(self, word: str):
         """
@@ -137,16 +516,27 @@ class KnownWordsDatabase:
         Args:
             word: 单词
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute('DELETE FROM known_words WHERE word = ?', (word.lower(),))
-            conn.commit()
-        except Exception as e:
-            print(f"移除单词失败: {e}")
-        finally:
-            conn.close()
+        word = word.lower()
+
+        with self._lock:
+            try:
+                self._sync()
+                row = self._conn.execute(
+                    'SELECT lemma FROM known_words WHERE word = ?', (word,)
+                ).fetchone()
+                self._conn.execute('DELETE FROM known_words WHERE word = ?', (word,))
+                self._conn.commit()
+                self._words.discard(word)
+
+                # 只有没有其他单词共用这个词元时才移除
+                lemma = row[0] if row else None
+                if lemma is not None and not self._conn.execute(
+                    'SELECT 1 FROM known_words WHERE lemma = ? LIMIT 1', (lemma,)
+                ).fetchone():
+                    self._lemmas.discard(lemma)
+            except Exception as e:
+                self._conn.rollback()
+                print(f"移除单词失败: {e}")
 
     def get_all_words(self) -> List[str]:
         """
@@ -155,31 +545,441 @@ class KnownWordsDatabase:
         Returns:
             单词列表
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            try:
+                cursor = self._conn.execute('SELECT word FROM known_words')
+                return [row[0] for row in cursor.fetchall()]
+            except Exception as e:
+                print(f"获取单词列表失败: {e}")
+                return []
 
+    @staticmethod
+    def _prefix_range(prefix: str) -> Tuple[str, str]:
+        """前缀查询转换为区间查询（可以使用word列的唯一索引）"""
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    @staticmethod
+    def _encode_cursor(add_time: str, row_id: int) -> str:
+        """编码分页游标"""
+        raw = json.dumps([add_time, row_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, int]:
+        """解码分页游标"""
         try:
-            cursor.execute('SELECT word FROM known_words')
-            words = [row[0] for row in cursor.fetchall()]
-            return words
-        except Exception as e:
-            print(f"获取单词列表失败: {e}")
-            return []
-        finally:
-            conn.close()
+            add_time, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return str(add_time), int(row_id)
+        except Exception:
+            raise ValueError(f"无效的分页游标: {cursor}")
+
+    def list_words(
+        self,
+        prefix: str = '',
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        descending: bool = True
+    ) -> Dict:
+        """
+        分页获取已知单词（按添加时间排序的键集分页）
+
+        Args:
+            prefix: 单词前缀（为空时不过滤）
+            limit: 每页数量
+            cursor: 上一页返回的 next_cursor（为空时从第一页开始）
+            descending: 是否按添加时间倒序（最新的在前）
+
+        Returns:
+            {'words': [{'word', 'lemma', 'add_time'}], 'next_cursor': 下一页游标或None}
+        """
+        prefix = prefix.strip().lower()
+        limit = max(1, int(limit))
+
+        conditions = []
+        params: List = []
+        if prefix:
+            conditions.append('word >= ? AND word < ?')
+            params.extend(self._prefix_range(prefix))
+        if cursor:
+            conditions.append(f"(add_time, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(self._decode_cursor(cursor))
+
+        order = 'DESC' if descending else 'ASC'
+        sql = 'SELECT id, word, lemma, add_time FROM known_words'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f' ORDER BY add_time {order}, id {order} LIMIT ?'
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1][3], rows[-1][0])
+
+        return {
+            'words': [{'word': word, 'lemma': lemma, 'add_time': add_time}
+                      for _, word, lemma, add_time in rows],
+            'next_cursor': next_cursor
+        }
+
+    def count_words(self, prefix: str = '') -> int:
+        """
+        统计已知单词数量
+
+        Args:
+            prefix: 单词前缀（为空时统计全部）
+
+        Returns:
+            数量
+        """
+        prefix = prefix.strip().lower()
+
+        with self._lock:
+            if not prefix and not self.use_bloom:
+                self._sync()
+                return len(self._words)
+            if not prefix:
+                return self._conn.execute('SELECT COUNT(*) FROM known_words').fetchone()[0]
+            row = self._conn.execute(
+                'SELECT COUNT(*) FROM known_words WHERE word >= ? AND word < ?',
+                self._prefix_range(prefix)
+            ).fetchone()
+            return row[0]
+
+    def get_skip_rank(self) -> int:
+        """
+        获取该词库的简单词跳过阈值
+
+        Returns:
+            阈值N（词频排名前N的单词不查询、不标注），0表示不跳过
+        """
+        with self._lock:
+            value = self._get_meta('skip_rank')
+        try:
+            return max(0, int(value)) if value is not None else 0
+        except ValueError:
+            return 0
+
+    def set_skip_rank(self, rank: int):
+        """
+        设置该词库的简单词跳过阈值
+
+        Args:
+            rank: 阈值N（0表示不跳过）
+
+        Raises:
+            ValueError: 阈值为负数
+        """
+        rank = int(rank)
+        if rank < 0:
+            raise ValueError(f"跳过阈值不能为负数: {rank}")
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO known_words_meta (key, value) VALUES (?, ?)',
+                    ('skip_rank', str(rank))
+                )
+
+    def get_version(self) -> int:
+        """
+        获取当前版本号（每次添加/删除单词都会递增）
+
+        Returns:
+            版本号（空数据库为0）
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT MAX(version) FROM known_words_changes').fetchone()
+            return row[0] or 0
+
+    def get_changes(self, since: int) -> Dict:
+        """
+        获取指定版本之后的增量变化
+
+        同一个单词在区间内多次变化时只返回最终结果：
+        当前存在的单词出现在 added 中（客户端按单词覆盖），
+        在 since 时存在、现在已删除的单词出现在 removed 中。
+
+        Args:
+            since: 客户端已同步到的版本号
+
+        Returns:
+            {'version': 当前版本号, 'added': [{'word', 'lemma', 'add_time'}], 'removed': [单词]}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT version, word, op FROM known_words_changes WHERE version > ? ORDER BY version',
+                (since,)
+            ).fetchall()
+            version = rows[-1][0] if rows else max(since, 0)
+
+            first_op: Dict[str, str] = {}
+            last_op: Dict[str, str] = {}
+            for _, word, op in rows:
+                first_op.setdefault(word, op)
+                last_op[word] = op
+
+            added_words = [word for word, op in last_op.items() if op == 'add']
+            removed = [word for word, op in last_op.items()
+                       if op == 'remove' and first_op[word] == 'remove']
+
+            added = []
+            for start in range(0, len(added_words), 500):
+                batch = added_words[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                added.extend(
+                    {'word': word, 'lemma': lemma, 'add_time': add_time}
+                    for word, lemma, add_time in self._conn.execute(
+                        f'SELECT word, lemma, add_time FROM known_words WHERE word IN ({placeholders}) '
+                        'ORDER BY add_time, id',
+                        batch
+                    )
+                )
+
+        return {'version': version, 'added': added, 'removed': removed}
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.close()
+                self._bloom = None
+            self._conn.close()
+
+
+class KnownWordsPool:
+    """
+    按学生划分的已知单词数据库池
+
+    每个学生（profile）使用一个独立的SQLite文件，池中最多同时保持
+    max_open 个已打开的数据库（连接 + 内存集合），按最近使用淘汰。
+    获取某个学生的数据库只是一次字典查找，与学生总数无关。
+    """
+
+    DEFAULT_PROFILE = 'default'
+    _PROFILE_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+    def __init__(
+        self,
+        base_dir: str = "vocabularies",
+        default_db_path: str = "known_words.db",
+        max_open: int = 64,
+        use_bloom: bool = False,
+        bloom_fpr: float = 0.01
+    ):
+        """
+        初始化数据库池
+
+        Args:
+            base_dir: 学生词库文件所在目录
+            default_db_path: 默认学生使用的数据库路径（兼容原来的单一词库）
+            max_open: 最多同时打开的数据库数量
+            use_bloom: 词库是否使用布隆过滤器代替内存集合
+            bloom_fpr: 布隆过滤器的目标误判率
+        """
+        self.base_dir = Path(base_dir)
+        self.default_db_path = default_db_path
+        self.max_open = max(1, max_open)
+        self.use_bloom = use_bloom
+        self.bloom_fpr = bloom_fpr
+        self._lock = threading.Lock()
+        self._databases: 'OrderedDict[str, KnownWordsDatabase]' = OrderedDict()
+
+    @classmethod
+    def normalize_profile_id(cls, profile_id: Optional[str]) -> str:
+        """
+        校验并规范化学生ID
+
+        Args:
+            profile_id: 学生ID（为空时使用默认学生）
+
+        Returns:
+            学生ID
+
+        Raises:
+            ValueError: ID包含字母、数字、下划线、连字符以外的字符或过长
+        """
+        profile_id = (profile_id or '').strip() or cls.DEFAULT_PROFILE
+        if not cls._PROFILE_RE.match(profile_id):
+            raise ValueError(f"无效的学生ID: {profile_id}")
+        return profile_id
+
+    def get_db_path(self, profile_id: Optional[str]) -> str:
+        """获取学生词库文件路径"""
+        profile_id = self.normalize_profile_id(profile_id)
+        if profile_id == self.DEFAULT_PROFILE:
+            return self.default_db_path
+        return str(self.base_dir / f"{profile_id}.db")
+
+    def get(self, profile_id: Optional[str] = None) -> KnownWordsDatabase:
+        """
+        获取学生的已知单词数据库
+
+        Args:
+            profile_id: 学生ID（为空时使用默认学生）
+
+        Returns:
+            KnownWordsDatabase
+        """
+        profile_id = self.normalize_profile_id(profile_id)
+
+        with self._lock:
+            db = self._databases.get(profile_id)
+            if db is not None:
+                self._databases.move_to_end(profile_id)
+                return db
+
+            db_path = self.get_db_path(profile_id)
+            if profile_id != self.DEFAULT_PROFILE:
+                self.base_dir.mkdir(parents=True, exist_ok=True)
+
+            db = KnownWordsDatabase(db_path, use_bloom=self.use_bloom, bloom_fpr=self.bloom_fpr)
+            self._databases[profile_id] = db
+
+            # 淘汰最久未使用的数据库。这里只释放池的引用，不主动关闭：
+            # 仍在使用它的请求结束后，连接随对象一起释放
+            while len(self._databases) > self.max_open:
+                self._databases.popitem(last=False)
+
+            return db
+
+    def open_count(self) -> int:
+        """当前打开的数据库数量"""
+        with self._lock:
+            return len(self._databases)
+
+
+# ==================== 单词边界框 ====================
+
+# 比例字体的字符宽度（Helvetica字宽，单位为字号的1/1000），用于在行框内估算每个单词的位置
+_GLYPH_WIDTHS: Dict[str, int] = {
+    **dict(zip('abcdefghijklmnopqrstuvwxyz',
+               (556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833,
+                556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500))),
+    **dict(zip('ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+               (667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833,
+                722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611))),
+    **dict.fromkeys('0123456789', 556),
+    ' ': 278, '.': 278, ',': 278, ';': 278, ':': 278, '!': 278, '?': 556,
+    "'": 191, '"': 355, '(': 333, ')': 333, '[': 278, ']': 278, '-': 333, '/': 278,
+}
+_DEFAULT_GLYPH_WIDTH = 556
+_WIDE_GLYPH_WIDTH = 1000  # 中日韩文字和全角符号
+
+# 每行的单词边界框缓存大小（行数）
+WORD_BOX_CACHE_SIZE = 4096
+
+
+def _glyph_width(char: str) -> int:
+    """单个字符的估计宽度"""
+    width = _GLYPH_WIDTHS.get(char)
+    if width is not None:
+        return width
+    return _WIDE_GLYPH_WIDTH if ord(char) >= 0x2E80 else _DEFAULT_GLYPH_WIDTH
+
+
+def estimate_text_width(text: str, char_height: float) -> float:
+    """
+    按比例字体的字符宽度估算文字的书写宽度
+
+    Args:
+        text: 文字
+        char_height: 字高（结果与其单位相同）
+
+    Returns:
+        宽度
+    """
+    return sum(_glyph_width(char) for char in text) / 1000.0 * char_height
+
+
+@lru_cache(maxsize=WORD_BOX_CACHE_SIZE)
+def _line_word_boxes(text: str, bbox: Tuple[Tuple[float, float], ...]) -> Tuple:
+    """
+    估算一行文字中每个英文单词的边界框（按行缓存）
+
+    按比例字体的字符宽度计算单词在行内的起止比例，再沿行框的上下边插值，
+    倾斜的行框也能得到贴合的四边形。
+
+    Args:
+        text: 行文本
+        bbox: 行框的4个角点（左上、右上、右下、左下）
+
+    Returns:
+        ((单词, 边界框, 中心点), ...)
+    """
+    words = list(re.finditer(r'\b[a-zA-Z]+\b', text))
+    if not words:
+        return ()
+
+    # 字符左边界的累计宽度
+    offsets = [0]
+    for char in text:
+        offsets.append(offsets[-1] + _glyph_width(char))
+    total = offsets[-1]
+
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = bbox
+    boxes = []
+    for match in words:
+        start = offsets[match.start()] / total
+        end = offsets[match.end()] / total
+        quad = [
+            [x0 + (x1 - x0) * start, y0 + (y1 - y0) * start],
+            [x0 + (x1 - x0) * end, y0 + (y1 - y0) * end],
+            [x3 + (x2 - x3) * end, y3 + (y2 - y3) * end],
+            [x3 + (x2 - x3) * start, y3 + (y2 - y3) * start],
+        ]
+        center = (sum(p[0] for p in quad) / 4, sum(p[1] for p in quad) / 4)
+        boxes.append((match.group(), quad, center))
+    return tuple(boxes)
+
+
+def estimate_word_boxes(text: str, bbox: List[List[float]]) -> List[Tuple[str, List[List[float]], Tuple[float, float]]]:
+    """
+    从OCR行框估算每个英文单词的边界框
+
+    Args:
+        text: 行文本
+        bbox: 行框的4个角点（左上、右上、右下、左下）
+
+    Returns:
+        [(单词, 边界框, 中心点)]，按在行内出现的顺序
+    """
+    key = tuple((float(x), float(y)) for x, y in bbox)
+    # 返回副本，调用方修改边界框不会影响缓存
+    return [(word, [list(p) for p in quad], center) for word, quad, center in _line_word_boxes(text, key)]
 
 
 class TextExtractor:
     """文本提取器 - 使用OCR"""
 
-    def __init__(self, use_angle_cls: bool = True, lang: str = 'en'):
+    def __init__(self, use_angle_cls: bool = True, lang: str = 'en',
+                 unwarper: Optional[ImageUnwarp] = None,
+                 rec_batch_num: Optional[int] = None,
+                 preprocessor: Optional[OCRPreprocessor] = None,
+                 preprocess: bool = True,
+                 cache: Optional[OCRCache] = None):
         """
         初始化文本提取器
 
         Args:
             use_angle_cls: 是否使用方向分类器
             lang: 语言（en=英文, ch=中文）
+            unwarper: 共享的图像矫正器（默认新建）
+            rec_batch_num: 识别模型每批处理的文本框数量（默认使用PaddleOCR的设置）
+            preprocessor: 高分辨率图像的缩放/分块预处理器（默认新建）
+            preprocess: 是否对高分辨率图像进行自适应缩放和分块识别
+            cache: OCR结果缓存（默认不缓存）
         """
+        # PaddleOCR预测器不是线程安全的，共享实例时串行调用
+        self._ocr_lock = threading.Lock()
+        self.use_angle_cls = use_angle_cls
+        self.lang = lang
+        self.rec_batch_num = rec_batch_num
+        self.preprocessor = (preprocessor or OCRPreprocessor()) if preprocess else None
+        self.cache = cache
+
         if not PADDLEOCR_AVAILABLE:
             print("错误: PaddleOCR未安装")
             self.ocr = None
@@ -187,10 +987,14 @@ class TextExtractor:
 
         try:
             print("正在初始化PaddleOCR...")
+            options = {}
+            if rec_batch_num:
+                options['rec_batch_num'] = rec_batch_num
             self.ocr = PaddleOCR(
                 use_angle_cls=use_angle_cls,
                 lang=lang,
-                show_log=False
+                show_log=False,
+                **options
             )
             print("✓ PaddleOCR初始化成功")
         except Exception as e:
@@ -198,7 +1002,7 @@ class TextExtractor:
             self.ocr = None
 
         # 图像矫正器
-        self.unwarper = ImageUnwarp()
+        self.unwarper = unwarper if unwarper is not None else ImageUnwarp()
 
     def extract_text(self, image: np.ndarray, unwarp: bool = True) -> List[OCRResult]:
         """
@@ -211,54 +1015,228 @@ class TextExtractor:
         Returns:
             OCR结果列表
         """
+        try:
+            return list(self.iter_text(image, unwarp=unwarp))
+        except Exception as e:
+            print(f"OCR识别失败: {e}")
+            return []
+
+    def iter_text(self, image: np.ndarray, unwarp: bool = True) -> Iterator[OCRResult]:
+        """
+        逐个返回识别出的文本块
+
+        高分辨率图像分块识别时，每识别完一个文本框就立即返回，
+        调用方可以边识别边处理。完整识别完成后才写入缓存。
+
+        Args:
+            image: 输入图像
+            unwarp: 是否进行图像矫正
+
+        Yields:
+            OCR结果
+
+        Raises:
+            Exception: 识别失败（已返回的结果不完整）
+        """
         if self.ocr is None:
             print("错误: OCR未初始化")
-            return []
+            return
+
+        # 相同图像和参数直接使用缓存的结果（跳过矫正和识别）
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(image, self._cache_params(unwarp))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"✓ 命中OCR缓存: {len(cached)} 个文本块")
+                for item in cached:
+                    yield OCRResult.from_dict(item)
+                return
 
         # 图像矫正
         if unwarp:
-            image = self.unwarper.unwarp_image(image)
+            image = self.unwarp(image)
 
-        try:
-            # 执行OCR
+        ocr_results = []
+        for ocr_result in self._iter_recognize(image):
+            ocr_results.append(ocr_result)
+            yield ocr_result
+
+        if cache_key is not None:
+            try:
+                self.cache.put(cache_key, [r.to_dict() for r in ocr_results])
+            except OSError as e:
+                print(f"警告: OCR结果缓存写入失败: {e}")
+
+    def unwarp(self, image: np.ndarray) -> np.ndarray:
+        """
+        矫正图像（未配置矫正器时返回原图）
+
+        需要在矫正后的页面上做其他处理时（例如构建页面占用图），
+        先调用本方法，再以 unwarp=False 调用 iter_text，保证坐标一致。
+
+        Args:
+            image: 输入图像
+
+        Returns:
+            矫正后的图像
+        """
+        if self.unwarper is None:
+            return image
+        return self.unwarper.unwarp_image(image)
+
+    def _cache_params(self, unwarp: bool) -> Dict:
+        """影响识别结果的参数（作为缓存键的一部分）"""
+        return {
+            'lang': self.lang,
+            'use_angle_cls': self.use_angle_cls,
+            'rec_batch_num': self.rec_batch_num,
+            'unwarp': getattr(self.unwarper, 'backend', None) if unwarp else None,
+            'preprocess': dict(vars(self.preprocessor)) if self.preprocessor is not None else None,
+        }
+
+    def _iter_recognize(self, image: np.ndarray) -> Iterator[OCRResult]:
+        """
+        识别（已矫正的）图像
+
+        Args:
+            image: 输入图像
+
+        Yields:
+            OCR结果
+        """
+        # 高分辨率图像：缩放到目标文字高度并分块识别
+        plan = self.preprocessor.plan(image) if self.preprocessor is not None else None
+        if plan is not None:
+            count = 0
+            for ocr_result in self._iter_tiled(image, plan):
+                count += 1
+                yield ocr_result
+            if not count:
+                print("未检测到文字")
+            else:
+                print(f"✓ 识别到 {count} 个文本块（缩放 {plan.scale:.2f}，{len(plan.tiles)} 个分块）")
+            return
+
+        # 执行OCR
+        with self._ocr_lock:
             result = self.ocr.ocr(image, cls=True)
 
+        if not result or not result[0]:
+            print("未检测到文字")
+            return
+
+        ocr_results = self._parse_ocr_lines(result[0])
+        print(f"✓ 识别到 {len(ocr_results)} 个文本块")
+        yield from ocr_results
+
+    def _iter_tiled(self, image: np.ndarray, plan: OCRPlan) -> Iterator[OCRResult]:
+        """
+        按预处理计划识别：缩放后分块检测，合并文本框后逐框识别
+
+        Args:
+            image: 输入图像（原始分辨率）
+            plan: 预处理计划
+
+        Yields:
+            OCR结果（原图坐标）
+        """
+        if plan.scale < 1.0:
+            scaled = cv2.resize(image, plan.scaled_size, interpolation=cv2.INTER_AREA)
+        else:
+            scaled = image
+
+        # 1. 分块检测
+        tile_boxes = []
+        for tile_index, (x0, y0, x1, y1) in enumerate(plan.tiles):
+            with self._ocr_lock:
+                result = self.ocr.ocr(scaled[y0:y1, x0:x1], det=True, rec=False, cls=False)
             if not result or not result[0]:
-                print("未检测到文字")
-                return []
+                continue
+            for box in result[0]:
+                points = np.asarray(box, dtype=np.float32).reshape(4, 2) + np.float32([x0, y0])
+                tile_boxes.append((tile_index, points))
+
+        # 2. 合并分块边界上的文本框
+        boxes = merge_tile_boxes(tile_boxes)
+
+        # 3. 在缩放图上裁剪识别，坐标映射回原图
+        for box in boxes:
+            crop = crop_text_region(scaled, box)
+            with self._ocr_lock:
+                result = self.ocr.ocr(crop, det=False, rec=True, cls=self.use_angle_cls)
+            if not result or not result[0]:
+                continue
+
+            text_info = result[0][0] if isinstance(result[0], list) else result[0]
+            text, confidence = text_info[0], float(text_info[1])
+            if not text:
+                continue
+
+            bbox = to_original_coordinates(box, plan.scale)
+            points = np.array(bbox)
+            yield OCRResult(
+                text=text,
+                bbox=bbox,
+                confidence=confidence,
+                center=(float(np.mean(points[:, 0])), float(np.mean(points[:, 1])))
+            )
 
-            # 解析结果
-            ocr_results = []
-            for line in result[0]:
-                bbox = line[0]  # 边界框
-                text_info = line[1]  # (文本, 置信度)
+    def _parse_ocr_lines(self, lines) -> List[OCRResult]:
+        """
+        解析PaddleOCR单张图像的输出
 
-                text = text_info[0]
-                confidence = text_info[1]
+        Args:
+            lines: [(边界框, (文本, 置信度)), ...]
 
-                # 计算中心点
-                points = np.array(bbox)
-                center_x = float(np.mean(points[:, 0]))
-                center_y = float(np.mean(points[:, 1]))
+        Returns:
+            OCR结果列表
+        """
+        ocr_results = []
+        for line in lines:
+            bbox = line[0]  # 边界框
+            text_info = line[1]  # (文本, 置信度)
+
+            text = text_info[0]
+            confidence = text_info[1]
+
+            # 计算中心点
+            points = np.array(bbox)
+            center_x = float(np.mean(points[:, 0]))
+            center_y = float(np.mean(points[:, 1]))
+
+            ocr_results.append(OCRResult(
+                text=text,
+                bbox=bbox,
+                confidence=confidence,
+                center=(center_x, center_y)
+            ))
 
-                ocr_results.append(OCRResult(
-                    text=text,
-                    bbox=bbox,
-                    confidence=confidence,
-                    center=(center_x, center_y)
-                ))
+        return ocr_results
 
-            print(f"✓ 识别到 {len(ocr_results)} 个文本块")
-            return ocr_results
+    def extract_pages(self, pages: Iterable[np.ndarray], unwarp: bool = True) -> Iterator[PageOCRResult]:
+        """
+        在当前进程中逐页识别多页图像
 
-        except Exception as e:
-            print(f"OCR识别失败: {e}")
-            return []
+        Args:
+            pages: 页面图像（可以是生成器，逐页读取）
+            unwarp: 是否进行图像矫正
+
+        Yields:
+            每页的识别结果（按输入顺序）
+        """
+        for page_index, image in enumerate(pages):
+            start = time.perf_counter()
+            results = self.extract_text(image, unwarp=unwarp)
+            yield PageOCRResult(page_index, results, time.perf_counter() - start)
 
     def filter_english_words(self, ocr_results: List[OCRResult]) -> List[OCRResult]:
         """
         过滤出英文单词
 
+        每个单词使用按字符宽度从行框中估算的边界框和中心点，
+        同一行的不同单词不再共用整行的位置。
+
         Args:
             ocr_results: OCR结果列表
 
@@ -268,78 +1246,372 @@ class TextExtractor:
         english_words = []
 
         for result in ocr_results:
-            # 使用正则表达式提取英文单词
-            words = re.findall(r'\b[a-zA-Z]+\b', result.text)
-
-            for word in words:
+            # 提取英文单词，并从行框估算每个单词自己的边界框
+            for word, bbox, center in estimate_word_boxes(result.text, result.bbox):
                 # 过滤掉单个字母和常见词
                 if len(word) > 1 and not self._is_common_word(word):
                     # 创建新的OCR结果
                     english_words.append(OCRResult(
                         text=word,
-                        bbox=result.bbox,
+                        bbox=bbox,
                         confidence=result.confidence,
-                        center=result.center
+                        center=center
                     ))
 
         return english_words
 
     def _is_common_word(self, word: str) -> bool:
         """检查是否为常见词"""
-        common_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-            'of', 'for', 'with', 'by', 'from', 'as', 'is', 'was', 'are',
-            'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did'
-        }
-        return word.lower() in common_words
+        return word.lower() in COMMON_WORDS
+
+
+# ==================== 多页批量OCR ====================
+
+# 支持的多页文件扩展名
+MULTI_PAGE_EXTENSIONS = ('.pdf', '.tif', '.tiff')
+
+
+def iter_document_pages(path: str, pdf_dpi: int = 200) -> Iterator[np.ndarray]:
+    """
+    逐页读取图像或多页文档（PDF / TIFF）
+
+    Args:
+        path: 文件路径
+        pdf_dpi: PDF渲染分辨率
+
+    Yields:
+        每页的BGR图像
+
+    Raises:
+        ValueError: 文件无法读取，或读取PDF时缺少PyMuPDF
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.pdf':
+        if not PYMUPDF_AVAILABLE:
+            raise ValueError("读取PDF需要PyMuPDF，请运行: pip install pymupdf")
+        document = fitz.open(path)
+        try:
+            zoom = pdf_dpi / 72.0
+            for page in document:
+                pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(
+                    pixmap.height, pixmap.width, pixmap.n
+                )
+                code = cv2.COLOR_GRAY2BGR if pixmap.n == 1 else cv2.COLOR_RGB2BGR
+                yield cv2.cvtColor(image, code)
+        finally:
+            document.close()
+        return
+
+    if ext in ('.tif', '.tiff'):
+        success, images = cv2.imreadmulti(path, flags=cv2.IMREAD_COLOR)
+        if not success:
+            raise ValueError(f"无法读取图像 {path}")
+        for image in images:
+            yield image
+        return
+
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError(f"无法读取图像 {path}")
+    yield image
+
+
+# 每个工作进程持有自己的文本提取器
+_batch_extractor: Optional['TextExtractor'] = None
+
+
+def _init_ocr_worker(use_angle_cls: bool, lang: str, unwarp_backend: str, rec_batch_num: Optional[int]):
+    """
+    批量OCR工作进程初始化：创建本进程专属的TextExtractor
+
+    Args:
+        use_angle_cls: 是否使用方向分类器
+        lang: 语言
+        unwarp_backend: 图像矫正后端
+        rec_batch_num: 识别模型每批处理的文本框数量
+    """
+    global _batch_extractor
+    # 工作进程的提示信息写到stderr
+    sys.stdout = sys.stderr
+    _batch_extractor = TextExtractor(
+        use_angle_cls=use_angle_cls,
+        lang=lang,
+        unwarper=ImageUnwarp(backend=unwarp_backend),
+        rec_batch_num=rec_batch_num
+    )
+
+
+def _ocr_worker_ready() -> bool:
+    """工作进程是否已完成初始化（用于预热）"""
+    return _batch_extractor is not None and _batch_extractor.ocr is not None
+
+
+def _ocr_page(page_index: int, image: np.ndarray, unwarp: bool) -> PageOCRResult:
+    """在工作进程中识别一页"""
+    start = time.perf_counter()
+    results = _batch_extractor.extract_text(image, unwarp=unwarp)
+    return PageOCRResult(page_index, results, time.perf_counter() - start)
+
+
+class BatchTextExtractor:
+    """多页批量OCR - 多个工作进程并行识别，每页完成后立即返回"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        use_angle_cls: bool = True,
+        lang: str = 'en',
+        unwarp_backend: str = ImageUnwarp.BACKEND_LEARNED,
+        rec_batch_num: Optional[int] = 16
+    ):
+        """
+        初始化批量OCR（工作进程启动时各自加载一份PaddleOCR）
+
+        Args:
+            workers: 工作进程数（默认为CPU核数，最多4个）
+            use_angle_cls: 是否使用方向分类器
+            lang: 语言
+            unwarp_backend: 图像矫正后端
+            rec_batch_num: 识别模型每批处理的文本框数量
+        """
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        # PaddlePaddle在fork出的子进程中不安全，使用spawn启动工作进程
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_ocr_worker,
+            initargs=(use_angle_cls, lang, unwarp_backend, rec_batch_num)
+        )
+
+    def warm_up(self):
+        """启动全部工作进程并等待模型加载完成"""
+        futures = [self._executor.submit(_ocr_worker_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def extract_pages(self, pages: Iterable[np.ndarray], unwarp: bool = True) -> Iterator[PageOCRResult]:
+        """
+        并行识别多页图像
+
+        同时提交的页数有上限，输入可以是任意长度的生成器。
+
+        Args:
+            pages: 页面图像
+            unwarp: 是否进行图像矫正
+
+        Yields:
+            每页的识别结果（按完成顺序，用 page_index 对应输入）
+        """
+        max_pending = self.workers * 2
+        pending = set()
+        try:
+            for page_index, image in enumerate(pages):
+                pending.add(self._executor.submit(_ocr_page, page_index, image, unwarp))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # 调用方提前停止读取时，取消尚未开始的页面
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """关闭工作进程"""
+        self._executor.shutdown(wait=True)
+
+
+def pages_per_minute(pages: int, elapsed: float) -> float:
+    """计算吞吐量（页/分钟）"""
+    return round(pages * 60.0 / elapsed, 2) if elapsed > 0 else 0.0
+
+
+# 标注矩形: (x0, y0, x1, y1)
+Box = Tuple[float, float, float, float]
+
+
+class _BoxIndex:
+    """
+    已放置标注的空间索引
+
+    按固定高度的横带分桶，桶内按左边界排序。查询时只访问与矩形
+    纵向相交的横带，并用二分查找截取左边界落在
+    [x0 - 最大宽度, x1) 内的矩形（扫描线区间查询），
+    每次查询只检查附近的少量标注。
+    """
+
+    def __init__(self, band_height: float):
+        self.band_height = max(band_height, 1e-6)
+        self._keys: Dict[int, List[float]] = defaultdict(list)
+        self._boxes: Dict[int, List[Box]] = defaultdict(list)
+        self._max_width = 0.0
+        self.queries = 0
+
+    def _bands(self, y0: float, y1: float) -> range:
+        return range(int(y0 // self.band_height), int(y1 // self.band_height) + 1)
+
+    def add(self, box: Box):
+        """添加矩形"""
+        self._max_width = max(self._max_width, box[2] - box[0])
+        for band in self._bands(box[1], box[3]):
+            keys = self._keys[band]
+            index = bisect_right(keys, box[0])
+            keys.insert(index, box[0])
+            self._boxes[band].insert(index, box)
+
+    def query(self, box: Box, gap: float = 0.0) -> List[Box]:
+        """
+        查找与矩形（四周留出gap间距）相交的矩形
+
+        Args:
+            box: 查询矩形
+            gap: 间距
+
+        Returns:
+            相交的矩形
+        """
+        self.queries += 1
+        x0, y0, x1, y1 = box[0] - gap, box[1] - gap, box[2] + gap, box[3] + gap
+        hits = []
+        for band in self._bands(y0, y1):
+            keys = self._keys.get(band)
+            if not keys:
+                continue
+            boxes = self._boxes[band]
+            start = bisect_left(keys, x0 - self._max_width)
+            end = bisect_left(keys, x1)
+            for other in boxes[start:end]:
+                if other[2] > x0 and other[1] < y1 and other[3] > y0 and other not in hits:
+                    hits.append(other)
+        return hits
 
 
 class PositionCalculator:
     """位置计算器 - 计算书写位置"""
 
-    def __init__(self, line_spacing: float = 10.0, char_spacing: float = 2.0):
+    def __init__(
+        self,
+        line_spacing: float = 10.0,
+        char_spacing: float = 2.0,
+        char_height: float = 4.0,
+        max_iterations: int = 8,
+        max_vertical_steps: int = 3
+    ):
         """
         初始化位置计算器
 
         Args:
             line_spacing: 行间距（毫米）
-            char_spacing: 字符间距（毫米）
+            char_spacing: 字符间距（毫米），也是标注之间的最小间距
+            char_height: 标注字高（毫米），用于估算标注的书写宽度
+            max_iterations: 避让重叠时每个方向最多横向移动的次数
+            max_vertical_steps: 横向无法避开时最多向下移动的行数
         """
         self.line_spacing = line_spacing
         self.char_spacing = char_spacing
+        self.char_height = char_height
+        self.max_iterations = max_iterations
+        self.max_vertical_steps = max_vertical_steps
+        # 最近一次避让重叠的统计
+        self.last_overlap_stats: Dict[str, int] = {}
 
     def group_by_lines(self, word_positions: List[WordPosition]) -> Dict[int, List[WordPosition]]:
         """
         按行分组单词
 
+        先按文本框估计页面倾斜并校正，再以字高中位数为依据对中心点Y坐标
+        做一维间隔聚类（见 line_clustering），同时设置每个单词的 line_index。
+
         Args:
             word_positions: 单词位置列表
 
         Returns:
-            {行号: [单词位置列表]}
+            {行号: [单词位置列表]}，行号从上到下，行内单词从左到右
         """
-        lines = defaultdict(list)
-
         if not word_positions:
-            return lines
+            return {}
 
-        # 按Y坐标排序
-        sorted_words = sorted(word_positions, key=lambda w: w.center[1])
+        boxes = np.asarray([word_pos.bbox for word_pos in word_positions], dtype=np.float64).reshape(-1, 4, 2)
+        centers = np.asarray([word_pos.center for word_pos in word_positions], dtype=np.float64)
+        heights = boxes[:, :, 1].max(axis=1) - boxes[:, :, 1].min(axis=1)
 
-        # 分组（Y坐标相近的视为同一行）
-        current_line = 0
-        current_y = sorted_words[0].center[1]
+        labels = cluster_lines(
+            centers[:, 1],
+            heights=heights,
+            xs=centers[:, 0],
+            slope=estimate_skew(boxes)
+        )
 
-        for word_pos in sorted_words:
-            # 如果Y坐标差距大于阈值，认为是新的一行
-            if abs(word_pos.center[1] - current_y) > 20:  # 20像素阈值
-                current_line += 1
-                current_y = word_pos.center[1]
+        lines: Dict[int, List[WordPosition]] = {}
+        for index in np.lexsort((centers[:, 0], labels)).tolist():
+            line = int(labels[index])
+            word_positions[index].line_index = line
+            lines.setdefault(line, []).append(word_positions[index])
 
-            word_pos.line_index = current_line
-            lines[current_line].append(word_pos)
+        return lines
 
-        return dict(lines)
+    def group_paragraphs(self, ocr_results: List[OCRResult]) -> List[int]:
+        """
+        按段落分组文本块
+
+        先把纵向重合的文本块合并为行，行间距明显大于正文行距、
+        或首行缩进时开始新段落。
+
+        Args:
+            ocr_results: OCR文本块
+
+        Returns:
+            每个文本块的段落号（与输入顺序对应）
+        """
+        if not ocr_results:
+            return []
+
+        extents = []
+        for result in ocr_results:
+            ys = [point[1] for point in result.bbox]
+            xs = [point[0] for point in result.bbox]
+            extents.append((min(xs), min(ys), max(ys)))
+
+        # 合并为行: [上边, 下边, 左边, 文本块序号列表]
+        lines = []
+        for index in sorted(range(len(extents)), key=lambda i: extents[i][1]):
+            left, top, bottom = extents[index]
+            if lines:
+                line = lines[-1]
+                overlap = min(line[1], bottom) - max(line[0], top)
+                if overlap > min(line[1] - line[0], bottom - top) * 0.5:
+                    line[1] = max(line[1], bottom)
+                    line[2] = min(line[2], left)
+                    line[3].append(index)
+                    continue
+            lines.append([top, bottom, left, [index]])
+
+        heights = sorted(line[1] - line[0] for line in lines)
+        line_height = heights[len(heights) // 2]
+        gaps = sorted(lines[i + 1][0] - lines[i][1] for i in range(len(lines) - 1))
+        median_gap = gaps[len(gaps) // 2] if gaps else 0.0
+        gap_threshold = max(median_gap * 1.8, median_gap + line_height * 0.5)
+
+        paragraphs = [0] * len(ocr_results)
+        paragraph = 0
+        for i, line in enumerate(lines):
+            if i > 0:
+                previous = lines[i - 1]
+                gap = line[0] - previous[1]
+                indented = line[2] - previous[2] > line_height * 1.5
+                if gap > gap_threshold or indented:
+                    paragraph += 1
+            for index in line[3]:
+                paragraphs[index] = paragraph
+
+        return paragraphs
 
     def calculate_annotation_positions(
         self,
@@ -349,8 +1621,11 @@ class PositionCalculator:
         """
         计算标注位置（释义和音标）
 
+        标注顺序与输入的单词顺序一致：第i个单词的音标和释义
+        分别是第 2i 和 2i+1 条标注。
+
         Args:
-            word_positions: 单词位置列表
+            word_positions: 单词位置列表（会设置每个单词的 line_index）
             calibrator: 校准器
 
         Returns:
@@ -358,94 +1633,393 @@ class PositionCalculator:
         """
         annotations = []
 
-        # 按行分组
-        lines = self.group_by_lines(word_positions)
+        # 按行分组（设置行号）
+        self.group_by_lines(word_positions)
 
         # 为每个单词计算标注位置
-        for line_words in lines.values():
-            for i, word_pos in enumerate(line_words):
-                # 获取物理坐标
-                phys_x, phys_y = calibrator.image_to_physical(word_pos.center)
+        for word_pos in word_positions:
+            # 获取物理坐标
+            phys_x, phys_y = calibrator.image_to_physical(word_pos.center)
 
-                # 计算标注位置（在单词下方）
-                annotation_y = phys_y + self.line_spacing
+            # 计算标注位置（在单词下方）
+            annotation_y = phys_y + self.line_spacing
 
-                # 音标位置（在单词正下方）
-                phonetic_position = (phys_x, annotation_y)
+            # 音标位置（在单词正下方）
+            phonetic_position = (phys_x, annotation_y)
 
-                # 释义位置（在音标下方）
-                definition_position = (phys_x, annotation_y + self.line_spacing)
+            # 释义位置（在音标下方）
+            definition_position = (phys_x, annotation_y + self.line_spacing)
 
-                annotations.append(Annotation(
-                    text="",  # 稍后填充
-                    position=phonetic_position,
-                    is_phonetic=True
-                ))
+            annotations.append(Annotation(
+                text="",  # 稍后填充
+                position=phonetic_position,
+                is_phonetic=True
+            ))
 
-                annotations.append(Annotation(
-                    text="",  # 稍后填充
-                    position=definition_position,
-                    is_phonetic=False
-                ))
+            annotations.append(Annotation(
+                text="",  # 稍后填充
+                position=definition_position,
+                is_phonetic=False
+            ))
 
         return annotations
 
-    def avoid_overlap(self, annotations: List[Annotation]) -> List[Annotation]:
+    def avoid_overlap(
+        self,
+        annotations: List[Annotation],
+        bounds: Optional[Tuple[float, float]] = None,
+        free_space: Optional[Callable[[Box], bool]] = None
+    ) -> List[Annotation]:
         """
         避免标注重叠
 
+        按顺序逐个放置标注：根据文字估算书写宽度，与已放置的标注冲突时
+        先向左右两边移动到刚好不重合的位置（取位移较小的一边），
+        两边都放不下时向下移动一行再尝试，移动次数有上限。
+        仍无法避开的标注保留原位置。文字为空的标注（查词失败）不参与避让。
+
+        提供 free_space 时，标注还必须落在空白区域（不压住印刷文字），
+        此时纵向以半行为步长上下交替寻找行间空白；找不到时把纵向范围
+        扩大到三倍再找一次。仍找不到且原位置压住印刷文字的标注
+        标记为 on_print，并计入统计中的 on_print。
+
         Args:
-            annotations: 标注列表
+            annotations: 标注列表（需已填充文字）
+            bounds: 可书写区域的 (宽, 高)，标注不会被移出该区域（为None时不限制）
+            free_space: 判断标注矩形是否为空白区域的函数（见 occupancy.OccupancyMap）
 
         Returns:
-            调整后的标注列表
+            调整后的标注列表（与输入为同一批对象）
         """
-        # 简化实现：如果Y坐标太接近，向下移动
-        adjusted = annotations.copy()
+        stats = {'placed': 0, 'moved_horizontal': 0, 'moved_vertical': 0, 'unresolved': 0, 'on_print': 0}
+        index = _BoxIndex(self.char_height + self.char_spacing)
 
-        for i in range(len(adjusted)):
-            for j in range(i + 1, len(adjusted)):
-                ann1 = adjusted[i]
-                ann2 = adjusted[j]
+        for ann in annotations:
+            if not ann.text:
+                continue
+
+            ann.width = estimate_text_width(ann.text, self.char_height)
+            ann.height = self.char_height
+            origin = self._clamp(ann.position, ann.width, ann.height, bounds)
+
+            position = self._find_free_position(index, origin, ann.width, ann.height, bounds, free_space)
+            if position is None and free_space is not None:
+                # 行间空白不够时扩大纵向搜索范围
+                position = self._find_free_position(
+                    index, origin, ann.width, ann.height, bounds, free_space,
+                    max_steps=self.max_vertical_steps * 3
+                )
+            if position is None:
+                stats['unresolved'] += 1
+                position = origin
+                if free_space is not None and not free_space(self._box(origin, ann.width, ann.height)):
+                    ann.on_print = True
+                    stats['on_print'] += 1
+            elif position[1] != origin[1]:
+                stats['moved_vertical'] += 1
+            elif position[0] != origin[0]:
+                stats['moved_horizontal'] += 1
+
+            ann.position = position
+            index.add(self._box(position, ann.width, ann.height))
+            stats['placed'] += 1
+
+        stats['queries'] = index.queries
+        self.last_overlap_stats = stats
+        return annotations
 
-                # 检查Y坐标是否太接近
-                if abs(ann1.position[1] - ann2.position[1]) < self.line_spacing:
-                    # 移动下面的那个
-                    if ann1.position[1] < ann2.position[1]:
-                        new_y = ann1.position[1] + self.line_spacing
-                        ann2.position = (ann2.position[0], new_y)
-                    else:
-                        new_y = ann2.position[1] + self.line_spacing
-                        ann1.position = (ann1.position[0], new_y)
+    @staticmethod
+    def _box(position: Tuple[float, float], width: float, height: float) -> Box:
+        """以文字中心为锚点的标注矩形"""
+        x, y = position
+        return (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+
+    @staticmethod
+    def _clamp(
+        position: Tuple[float, float],
+        width: float,
+        height: float,
+        bounds: Optional[Tuple[float, float]]
+    ) -> Tuple[float, float]:
+        """把标注移回可书写区域内"""
+        if bounds is None:
+            return position
+        x = min(max(position[0], width / 2), max(width / 2, bounds[0] - width / 2))
+        y = min(max(position[1], height / 2), max(height / 2, bounds[1] - height / 2))
+        return (x, y)
+
+    def _find_free_position(
+        self,
+        index: _BoxIndex,
+        origin: Tuple[float, float],
+        width: float,
+        height: float,
+        bounds: Optional[Tuple[float, float]],
+        free_space: Optional[Callable[[Box], bool]] = None,
+        max_steps: Optional[int] = None
+    ) -> Optional[Tuple[float, float]]:
+        """先横向、再纵向寻找不重叠的位置（最多移动 max_steps 行，默认 max_vertical_steps），找不到时返回None"""
+        step = height + self.char_spacing
+        if max_steps is None:
+            max_steps = self.max_vertical_steps
+        if free_space is None:
+            # 逐行向下
+            offsets = [level * step for level in range(max_steps + 1)]
+        else:
+            # 半行步长，上下交替（同样的纵向范围内寻找行间空白）
+            offsets = [0.0]
+            for level in range(1, max_steps * 2 + 1):
+                offsets += [level * step / 2, -level * step / 2]
+
+        for offset in offsets:
+            y = origin[1] + offset
+            if bounds is not None and (y + height / 2 > bounds[1] or y - height / 2 < 0):
+                continue
+            position = self._find_horizontal(index, (origin[0], y), width, height, bounds, free_space)
+            if position is not None:
+                return position
+        return None
+
+    def _find_horizontal(
+        self,
+        index: _BoxIndex,
+        origin: Tuple[float, float],
+        width: float,
+        height: float,
+        bounds: Optional[Tuple[float, float]],
+        free_space: Optional[Callable[[Box], bool]] = None
+    ) -> Optional[Tuple[float, float]]:
+        """在同一高度向左右两边移动，返回位移最小的不重叠位置"""
+        gap = self.char_spacing
+
+        def blockers(position: Tuple[float, float]) -> List[Box]:
+            box = self._box(position, width, height)
+            hits = index.query(box, gap)
+            if not hits and free_space is not None and not free_space(box):
+                # 印刷文字没有现成的边界，把自身当作障碍，下一次移过一个标注宽度
+                return [box]
+            return hits
+
+        hits = blockers(origin)
+        if not hits:
+            return origin
+
+        x, y = origin
+        best = None
+        for direction in (1, -1):
+            candidate_hits = hits
+            for _ in range(self.max_iterations):
+                # 移到刚好越过所有冲突标注的位置
+                if direction > 0:
+                    cx = max(box[2] for box in candidate_hits) + gap + width / 2
+                else:
+                    cx = min(box[0] for box in candidate_hits) - gap - width / 2
+                if best is not None and abs(cx - x) >= abs(best[0] - x):
+                    break
+                if bounds is not None and (cx - width / 2 < 0 or cx + width / 2 > bounds[0]):
+                    break
+
+                candidate_hits = blockers((cx, y))
+                if not candidate_hits:
+                    best = (cx, y)
+                    break
+
+        return best
+
+
+# 标注书写时间估算：每个字符的笔尖行程（毫米）和每条标注的抬笔/空走开销（秒）
+PEN_MM_PER_CHAR = 12.0
+PEN_OVERHEAD_SECONDS = 1.0
+
+
+def estimate_pen_seconds(text: str, feed_rate: float = 3000.0) -> float:
+    """
+    估算书写一条标注所需的时间
+
+    Args:
+        text: 标注文字
+        feed_rate: 书写进给速度（毫米/分钟）
+
+    Returns:
+        秒数（空文字为0）
+    """
+    if not text:
+        return 0.0
+    return len(text) * PEN_MM_PER_CHAR / feed_rate * 60.0 + PEN_OVERHEAD_SECONDS
 
-        return adjusted
+
+@dataclass
+class DedupeReport:
+    """重复生词去重的统计"""
+    policy: str
+    occurrences: int = 0  # 生词出现次数
+    annotated: int = 0  # 实际标注的次数
+    lookups: int = 0  # 实际查词次数（每个不同单词一次）
+    pen_seconds: float = 0.0  # 标注的估计书写时间
+    pen_seconds_saved: float = 0.0  # 跳过的标注节省的估计书写时间
+
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        return {
+            'policy': self.policy,
+            'occurrences': self.occurrences,
+            'annotated': self.annotated,
+            'annotations_saved': self.occurrences - self.annotated,
+            'lookups': self.lookups,
+            'lookups_saved': self.occurrences - self.lookups,
+            'pen_seconds': round(self.pen_seconds, 1),
+            'pen_seconds_saved': round(self.pen_seconds_saved, 1),
+        }
+
+    def report(self):
+        """打印统计"""
+        data = self.to_dict()
+        print(f"\n✓ 去重（{self.policy}）: {self.occurrences} 处生词，标注 {self.annotated} 处"
+              f"（少写 {data['annotations_saved']} 处），查词 {self.lookups} 次"
+              f"（少查 {data['lookups_saved']} 次），预计书写 {data['pen_seconds']} 秒"
+              f"（节省 {data['pen_seconds_saved']} 秒）")
+
+
+class PipelineStats:
+    """处理流水线的统计：各阶段耗时与队列深度（线程安全）"""
+
+    def __init__(self):
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.max_queue_depth: Dict[str, int] = defaultdict(int)
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """统计一段代码的耗时（累加到对应阶段）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        """累加阶段耗时"""
+        with self._lock:
+            self.stage_seconds[name] += seconds
+
+    def observe_depth(self, name: str, depth: int):
+        """记录队列深度（保留最大值）"""
+        with self._lock:
+            if depth > self.max_queue_depth[name]:
+                self.max_queue_depth[name] = depth
+
+    def finish(self):
+        """记录总耗时"""
+        self.total_seconds = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        with self._lock:
+            return {
+                'total_seconds': round(self.total_seconds, 4),
+                'stage_seconds': {k: round(v, 4) for k, v in self.stage_seconds.items()},
+                'max_queue_depth': dict(self.max_queue_depth),
+            }
+
+    def report(self):
+        """打印统计"""
+        stats = self.to_dict()
+        stages = '，'.join(f"{k} {v:.2f}秒" for k, v in stats['stage_seconds'].items())
+        depths = '，'.join(f"{k} {v}" for k, v in stats['max_queue_depth'].items())
+        print(f"\n✓ 流水线总耗时 {stats['total_seconds']:.2f} 秒（{stages}）")
+        if depths:
+            print(f"  最大队列深度: {depths}")
 
 
 class AutoLookup:
     """自动查单词器 - 整合所有功能"""
 
+    # 重复生词的标注策略
+    DEDUPE_EVERY = 'every'  # 每次出现都标注
+    DEDUPE_FIRST = 'first'  # 每页只标注第一次出现
+    DEDUPE_PARAGRAPH = 'paragraph'  # 每个段落标注一次
+    DEDUPE_POLICIES = (DEDUPE_EVERY, DEDUPE_FIRST, DEDUPE_PARAGRAPH)
+
     def __init__(
         self,
         known_words_db: str = "known_words.db",
         work_area_width: float = 217.0,
-        work_area_height: float = 299.0
+        work_area_height: float = 299.0,
+        profile_id: Optional[str] = None,
+        known_words_pool: Optional[KnownWordsPool] = None,
+        text_extractor: Optional[TextExtractor] = None,
+        word_lookup: Optional[WordLookup] = None,
+        writer: Optional[WriterMachine] = None,
+        unwarper: Optional[ImageUnwarp] = None,
+        ocr_cache: Optional[OCRCache] = None,
+        lookup_workers: int = 4,
+        dedupe_policy: str = DEDUPE_EVERY,
+        skip_rank: Optional[int] = None,
+        frequency_table: Optional[WordFrequencyTable] = None,
+        avoid_printed_text: bool = True
     ):
         """
         初始化自动查单词器
 
+        传入共享引擎（见 engine_registry）时直接复用，不再重新加载模型。
+
         Args:
-            known_words_db: 已知单词数据库路径
+            known_words_db: 已知单词数据库路径（未指定学生时使用）
             work_area_width: 工作区宽度（毫米）
             work_area_height: 工作区高度（毫米）
+            profile_id: 学生ID（指定后使用该学生的词库）
+            known_words_pool: 学生词库池（指定学生时使用，默认新建）
+            text_extractor: 共享的文本提取器（默认新建）
+            word_lookup: 共享的单词查询器（默认新建）
+            writer: 共享的写字机控制器（默认新建）
+            unwarper: 共享的图像矫正器（用于新建的文本提取器）
+            ocr_cache: OCR结果缓存（用于新建的文本提取器；同一张图片再次处理时
+                       只重做生词过滤、查词和Gcode生成）
+            lookup_workers: 并发查词的线程数
+            dedupe_policy: 重复生词的标注策略（every / first / paragraph），
+                           无论哪种策略，同一单词都只查询一次
+            skip_rank: 简单词跳过阈值，词频排名前N的单词不查询、不标注
+                       （None时使用学生词库中保存的设置，0表示不跳过）
+            frequency_table: 共享的词频排名表（默认使用进程内共享的表）
+            avoid_printed_text: 是否根据页面占用图把标注放在行间空白处（不压住印刷文字）
+
+        Raises:
+            ValueError: 未知的标注策略
         """
-        self.known_words_db = KnownWordsDatabase(known_words_db)
-        self.text_extractor = TextExtractor()
-        self.word_lookup = WordLookup(use_semantic_search=True)
+        if dedupe_policy not in self.DEDUPE_POLICIES:
+            raise ValueError(f"未知的标注策略: {dedupe_policy}（可选: {', '.join(self.DEDUPE_POLICIES)}）")
+
+        if profile_id is not None or known_words_pool is not None:
+            pool = known_words_pool or KnownWordsPool(default_db_path=known_words_db)
+            self.known_words_db = pool.get(profile_id)
+        else:
+            self.known_words_db = KnownWordsDatabase(known_words_db)
+        self.profile_id = profile_id
+        self.text_extractor = text_extractor or TextExtractor(unwarper=unwarper, cache=ocr_cache)
+        self.word_lookup = word_lookup or WordLookup(use_semantic_search=True)
         self.position_calculator = PositionCalculator()
-        self.writer = WriterMachine(work_area_width=work_area_width, work_area_height=work_area_height)
+        self.work_area_width = work_area_width
+        self.work_area_height = work_area_height
+        # 可书写区域（只有加载了校准数据、坐标为物理坐标时才限制标注范围）
+        self._page_bounds: Optional[Tuple[float, float]] = None
+        self.writer = writer or WriterMachine(work_area_width=work_area_width, work_area_height=work_area_height)
 
+        # 校准器保存每次处理的校准数据，不共享（只做坐标变换，不需要图像矫正）
         self.calibrator = Calibrator()
 
+        self.lookup_workers = max(1, lookup_workers)
+        self.dedupe_policy = dedupe_policy
+        self.skip_rank = skip_rank
+        self.frequency_table = frequency_table
+        self.avoid_printed_text = avoid_printed_text
+        # 最近一次处理的流水线统计和去重统计
+        self.last_pipeline_stats: Optional[PipelineStats] = None
+        self.last_dedupe_report: Optional[DedupeReport] = None
+        # 最近一次处理中按词频跳过的简单词数量
+        self.last_skipped_easy = 0
+
     def process_exam_image(
         self,
         image_path: str,
@@ -468,10 +2042,12 @@ class AutoLookup:
         # 1. 加载校准数据
         if calibration_path:
             self.calibrator.load_calibration(calibration_path)
+            self._page_bounds = (self.work_area_width, self.work_area_height)
         else:
             print("警告: 未提供校准数据，将使用图像坐标")
             # 创建默认变换矩阵（1:1映射）
             self.calibrator.transformation_matrix = np.eye(3)
+            self._page_bounds = None
 
         # 2. 读取图像
         image = cv2.imread(image_path)
@@ -479,66 +2055,163 @@ class AutoLookup:
             print(f"错误: 无法读取图像 {image_path}")
             return False
 
-        # 3. OCR识别
+        stats = PipelineStats()
+        self.last_pipeline_stats = stats
+        executor = ThreadPoolExecutor(max_workers=self.lookup_workers, thread_name_prefix='lookup')
+        try:
+            success = self._run_pipeline(image, executor, stats, save_gcode_path, save_annotated_image)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            stats.finish()
+
+        stats.report()
+        return success
+
+    def _run_pipeline(
+        self,
+        image: np.ndarray,
+        executor: ThreadPoolExecutor,
+        stats: PipelineStats,
+        save_gcode_path: Optional[str],
+        save_annotated_image: Optional[str]
+    ) -> bool:
+        """
+        流水线处理已读取的试卷图像
+
+        OCR逐个产出文本块，随即过滤英文单词并判断是否为生词，
+        生词立即提交到查词线程池；OCR结束后按原顺序取回查词结果，
+        边等待后续查词边绘制已完成的标注。输出与逐步处理完全一致。
+
+        Args:
+            image: 试卷图像
+            executor: 查词线程池
+            stats: 流水线统计
+            save_gcode_path: Gcode保存路径
+            save_annotated_image: 标注图像保存路径
+
+        Returns:
+            是否成功
+        """
+        # 3-6. OCR识别 → 过滤英文单词 → 查找生词 → 提交查词（每个不同单词只查一次）
         print("\n正在识别文字...")
-        ocr_results = self.text_extractor.extract_text(image)
+        ocr_blocks: List[OCRResult] = []
+        english_count = 0
+        # 生词出现位置: (单词位置, 词元, 所在文本块序号)
+        unknown_words: List[Tuple[WordPosition, str, int]] = []
+        lookups = {}
+        pending = [0]
+        pending_lock = threading.Lock()
+
+        def lookup_done(_):
+            with pending_lock:
+                pending[0] -= 1
+
+        # 每个不同的单词只计算一次词元
+        page_lemmas: Dict[str, str] = {}
+        frequency_table, skip_rank = self._resolve_skip_rank()
+        skipped_easy = 0
+        self.last_skipped_easy = 0
+        # 只矫正一次：OCR坐标、页面占用图和标注图像都基于矫正后的页面
+        try:
+            with stats.stage('unwarp'):
+                image = self.text_extractor.unwarp(image)
+        except Exception as e:
+            print(f"图像矫正失败: {e}")
+            return False
+        ocr_stream = self.text_extractor.iter_text(image, unwarp=False)
+        try:
+            while True:
+                with stats.stage('ocr'):
+                    ocr_result = next(ocr_stream, None)
+                if ocr_result is None:
+                    break
+                block_index = len(ocr_blocks)
+                ocr_blocks.append(ocr_result)
+
+                with stats.stage('filter'):
+                    english_ocr = self.text_extractor.filter_english_words([ocr_result])
+                english_count += len(english_ocr)
+
+                with stats.stage('known_check'):
+                    for word_ocr in english_ocr:
+                        word_pos = WordPosition(
+                            word=word_ocr.text,
+                            bbox=word_ocr.bbox,
+                            center=word_ocr.center,
+                            line_index=0  # 稍后计算
+                        )
+                        token = word_pos.word.lower()
+                        lemma = page_lemmas.get(token)
+                        if lemma is None:
+                            lemma = page_lemmas[token] = lemmatize(token)
+                        # 简单词在已知单词判断和查词之前跳过
+                        if skip_rank and frequency_table.is_easy(token, skip_rank, lemma):
+                            skipped_easy += 1
+                            continue
+                        if self.known_words_db.is_known(token, lemma):
+                            continue
+
+                        unknown_words.append((word_pos, lemma, block_index))
+                        # 查词按单词本身去重（词元只用于按策略合并重复出现，
+                        # 例如 evening 的词元规则可能得到 even，不能共用查词结果）
+                        if token in lookups:
+                            continue
+
+                        with pending_lock:
+                            pending[0] += 1
+                            depth = pending[0]
+                        future = executor.submit(self._timed_lookup, word_pos.word, stats)
+                        future.add_done_callback(lookup_done)
+                        lookups[token] = future
+                        stats.observe_depth('lookup', depth)
+        except Exception as e:
+            print(f"OCR识别失败: {e}")
+            ocr_blocks = []
 
-        if not ocr_results:
+        if not ocr_blocks:
             print("未识别到文字")
             return False
 
-        # 4. 过滤英文单词
-        print("\n正在过滤英文单词...")
-        english_ocr = self.text_extractor.filter_english_words(ocr_results)
-
-        if not english_ocr:
+        if not english_count:
             print("未找到英文单词")
             return False
 
-        print(f"✓ 找到 {len(english_ocr)} 个英文单词")
-
-        # 5. 转换为WordPosition
-        word_positions = []
-        for ocr_result in english_ocr:
-            word_positions.append(WordPosition(
-                word=ocr_result.text,
-                bbox=ocr_result.bbox,
-                center=ocr_result.center,
-                line_index=0  # 稍后计算
-            ))
-
-        # 6. 查找不会的单词
-        print("\n正在查找生词...")
-        unknown_words = []
-        for word_pos in word_positions:
-            if not self.known_words_db.is_known(word_pos.word):
-                unknown_words.append(word_pos)
+        print(f"✓ 找到 {english_count} 个英文单词")
+        self.last_skipped_easy = skipped_easy
+        if skipped_easy:
+            print(f"✓ 跳过 {skipped_easy} 个简单词（词频排名前 {skip_rank}）")
 
         if not unknown_words:
             print("✓ 所有单词都已掌握！")
             return True
 
-        print(f"✓ 找到 {len(unknown_words)} 个生词")
+        print(f"✓ 找到 {len(unknown_words)} 个生词（{len(lookups)} 个不同单词）")
+
+        # 按策略选出需要标注的生词
+        selected = self._select_occurrences(unknown_words, ocr_blocks)
 
-        # 7. 查询单词释义和音标
+        # 7. 查询单词释义和音标（查词已在后台进行）
         print("\n正在查询单词释义...")
-        annotations = []
 
         # 计算标注位置
-        raw_annotations = self.position_calculator.calculate_annotation_positions(
-            unknown_words,
-            self.calibrator
-        )
+        selected_positions = [word_pos for word_pos, _, _ in selected]
+        with stats.stage('layout'):
+            adjusted_annotations = self.position_calculator.calculate_annotation_positions(
+                selected_positions,
+                self.calibrator
+            )
+            # 页面占用图（在查词进行时构建）
+            occupancy = OccupancyMap(image) if self.avoid_printed_text else None
 
-        # 避免重叠
-        adjusted_annotations = self.position_calculator.avoid_overlap(raw_annotations)
+        # 按原顺序取回查词结果并绘制（后续单词仍在查询）
+        futures = [lookups[word_pos.word.lower()] for word_pos in selected_positions]
+        for i, (word_pos, future) in enumerate(zip(selected_positions, futures)):
+            with stats.stage('lookup_wait'):
+                result = future.result()
+            stats.observe_depth('render', sum(1 for f in futures[i:] if f.done()))
 
-        # 为每个生词查询释义
-        for i, word_pos in enumerate(unknown_words):
             print(f"\n查询: {word_pos.word}")
 
-            result = self.word_lookup.lookup(word_pos.word)
-
             if result.success:
                 # 获取第一个释义
                 definition = result.definitions[0] if result.definitions else ""
@@ -556,22 +2229,155 @@ class AutoLookup:
 
                 # 在图像上绘制
                 if save_annotated_image:
-                    self._draw_annotation(image, word_pos, phonetic, definition)
+                    with stats.stage('render'):
+                        self._draw_annotation(image, word_pos, phonetic, definition)
             else:
                 print(f"  查询失败: {result.message}")
 
+        # 避免重叠（需要标注文字才能估算书写宽度，所以在查词全部完成后进行）
+        with stats.stage('layout'):
+            self.position_calculator.avoid_overlap(
+                adjusted_annotations,
+                bounds=self._page_bounds,
+                free_space=self._free_space_check(occupancy) if occupancy is not None else None
+            )
+        overlap = self.position_calculator.last_overlap_stats
+        if overlap.get('moved_horizontal') or overlap.get('moved_vertical') or overlap.get('unresolved'):
+            print(f"\n✓ 避让重叠: 横向移动 {overlap['moved_horizontal']} 条，向下移动 {overlap['moved_vertical']} 条，"
+                  f"无法避开 {overlap['unresolved']} 条")
+        if overlap.get('on_print'):
+            conflicts = [ann.text for ann in adjusted_annotations if ann.on_print]
+            print(f"警告: {len(conflicts)} 条标注找不到空白位置，会写在印刷文字上: {', '.join(conflicts)}")
+
+        self.last_dedupe_report = self._dedupe_report(unknown_words, selected, lookups)
+        self.last_dedupe_report.report()
+
         # 保存标注图像
         if save_annotated_image:
-            cv2.imwrite(save_annotated_image, image)
+            with stats.stage('render'):
+                cv2.imwrite(save_annotated_image, image)
             print(f"\n✓ 标注图像已保存到: {save_annotated_image}")
 
         # 8. 生成书写Gcode
         if save_gcode_path:
             print("\n正在生成书写Gcode...")
-            self._generate_writing_gcode(adjusted_annotations, save_gcode_path)
+            with stats.stage('gcode'):
+                self._generate_writing_gcode(adjusted_annotations, save_gcode_path)
 
         return True
 
+    def _select_occurrences(
+        self,
+        unknown_words: List[Tuple[WordPosition, str, int]],
+        ocr_blocks: List[OCRResult]
+    ) -> List[Tuple[WordPosition, str, int]]:
+        """
+        按标注策略选出需要标注的生词出现位置
+
+        Args:
+            unknown_words: [(单词位置, 词元, 文本块序号)]，按识别顺序
+            ocr_blocks: 全部OCR文本块
+
+        Returns:
+            需要标注的出现位置（保持原顺序）
+        """
+        if self.dedupe_policy == self.DEDUPE_EVERY:
+            return list(unknown_words)
+
+        paragraphs = None
+        if self.dedupe_policy == self.DEDUPE_PARAGRAPH:
+            paragraphs = self.position_calculator.group_paragraphs(ocr_blocks)
+
+        seen = set()
+        selected = []
+        for occurrence in unknown_words:
+            _, lemma, block_index = occurrence
+            key = (lemma, paragraphs[block_index] if paragraphs is not None else 0)
+            if key not in seen:
+                seen.add(key)
+                selected.append(occurrence)
+        return selected
+
+    def _dedupe_report(
+        self,
+        unknown_words: List[Tuple[WordPosition, str, int]],
+        selected: List[Tuple[WordPosition, str, int]],
+        lookups: Dict
+    ) -> DedupeReport:
+        """统计去重节省的标注、查词次数和书写时间"""
+        feed_rate = getattr(getattr(self.writer, 'gcode_generator', None), 'feed_rate', 3000.0)
+
+        pen_by_word = {}
+        for token, future in lookups.items():
+            result = future.result()
+            if result.success:
+                definition = result.definitions[0] if result.definitions else ""
+                pen_by_word[token] = (estimate_pen_seconds(result.phonetic, feed_rate)
+                                      + estimate_pen_seconds(definition, feed_rate))
+            else:
+                pen_by_word[token] = 0.0
+
+        pen_total = sum(pen_by_word[word_pos.word.lower()] for word_pos, _, _ in unknown_words)
+        pen_selected = sum(pen_by_word[word_pos.word.lower()] for word_pos, _, _ in selected)
+
+        return DedupeReport(
+            policy=self.dedupe_policy,
+            occurrences=len(unknown_words),
+            annotated=len(selected),
+            lookups=len(lookups),
+            pen_seconds=pen_selected,
+            pen_seconds_saved=pen_total - pen_selected
+        )
+
+    def _free_space_check(self, occupancy: OccupancyMap) -> Callable[[Box], bool]:
+        """
+        生成判断标注矩形（物理坐标）是否落在页面空白处的函数
+
+        Args:
+            occupancy: 页面占用图（图像坐标）
+
+        Returns:
+            free_space(矩形) -> 是否空白
+        """
+        # 物理坐标 → 图像坐标的仿射逆变换（兼容2x3和3x3矩阵）
+        matrix = np.asarray(self.calibrator.transformation_matrix, dtype=np.float64)
+        inverse = np.linalg.inv(np.vstack([matrix[:2], [0.0, 0.0, 1.0]]))
+        (a, b, c), (d, e, f) = inverse[:2].tolist()
+
+        def free_space(box: Box) -> bool:
+            x0, y0, x1, y1 = box
+            xs = (a * x0 + b * y0, a * x1 + b * y0, a * x0 + b * y1, a * x1 + b * y1)
+            ys = (d * x0 + e * y0, d * x1 + e * y0, d * x0 + e * y1, d * x1 + e * y1)
+            return occupancy.is_free((min(xs) + c, min(ys) + f, max(xs) + c, max(ys) + f))
+
+        return free_space
+
+    def _resolve_skip_rank(self) -> Tuple[Optional[WordFrequencyTable], int]:
+        """
+        确定本次处理使用的词频排名表和跳过阈值
+
+        Returns:
+            (词频排名表, 跳过阈值)，不跳过时阈值为0
+        """
+        skip_rank = self.skip_rank
+        if skip_rank is None:
+            skip_rank = self.known_words_db.get_skip_rank()
+        if skip_rank <= 0:
+            return None, 0
+
+        if self.frequency_table is None:
+            try:
+                self.frequency_table = get_frequency_table()
+            except OSError as e:
+                print(f"警告: 无法加载词频排名表，不跳过简单词: {e}")
+                return None, 0
+        return self.frequency_table, skip_rank
+
+    def _timed_lookup(self, word: str, stats: PipelineStats) -> LookupResult:
+        """在查词线程中查询单词并统计耗时"""
+        with stats.stage('lookup'):
+            return self.word_lookup.lookup(word)
+
     def _draw_annotation(
         self,
         image: np.ndarray,
@@ -639,16 +2445,19 @@ class AutoLookup:
 
         print(f"✓ Gcode已保存到: {save_path}")
 
-    def add_known_words(self, words: List[str]):
+    def add_known_words(self, words: List[str]) -> Dict[str, int]:
         """
         批量添加已知单词
 
         Args:
             words: 单词列表
+
+        Returns:
+            {'added': 新增数量, 'skipped': 跳过数量}
         """
-        for word in words:
-            self.known_words_db.add_word(word)
-        print(f"✓ 已添加 {len(words)} 个已知单词")
+        result = self.known_words_db.add_words(words)
+        print(f"✓ 已添加 {result['added']} 个已知单词（跳过 {result['skipped']} 个）")
+        return result
 
 
 def main():
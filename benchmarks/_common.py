@@ -0,0 +1,175 @@
+"""
+基准测试公共工具
+
+提供离线夹具数据库构建、延迟统计以及结果对比（回归门禁）等功能，
+供 benchmarks 目录下的各个基准脚本复用。
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 让基准脚本可以直接导入项目根目录下的模块
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+FIXTURE_SQL = FIXTURE_DIR / 'word_details.sql'
+
+
+def build_fixture_db(db_path: str, sql_path: Optional[str] = None) -> str:
+    """
+    由SQL夹具构建离线词典数据库
+
+    Args:
+        db_path: 生成的数据库路径
+        sql_path: SQL夹具路径（默认使用 fixtures/word_details.sql）
+
+    Returns:
+        数据库路径
+    """
+    sql_path = sql_path or str(FIXTURE_SQL)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    with open(sql_path, 'r', encoding='utf-8') as f:
+        script = f.read()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(script)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return db_path
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        sorted_values: 已排序的数值列表
+        pct: 百分位（0-100）
+
+    Returns:
+        百分位数值
+    """
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = rank - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def summarize_latencies(latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """
+    汇总延迟数据
+
+    Args:
+        latencies: 每次调用的耗时（秒）
+        elapsed: 总耗时（秒），默认使用延迟之和
+
+    Returns:
+        包含吞吐量和 p50/p95/p99 延迟（毫秒）的字典
+    """
+    values = sorted(latencies)
+    total = elapsed if elapsed is not None else sum(values)
+
+    return {
+        'count': len(values),
+        'throughput_per_sec': round(len(values) / total, 2) if total > 0 else 0.0,
+        'mean_ms': round(sum(values) / len(values) * 1000, 4) if values else 0.0,
+        'p50_ms': round(percentile(values, 50) * 1000, 4),
+        'p95_ms': round(percentile(values, 95) * 1000, 4),
+        'p99_ms': round(percentile(values, 99) * 1000, 4),
+        'max_ms': round(values[-1] * 1000, 4) if values else 0.0,
+    }
+
+
+def environment_info() -> Dict[str, str]:
+    """获取运行环境信息（写入结果文件，便于对比）"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save_results(results: Dict, output_path: str):
+    """
+    保存基准结果为JSON
+
+    Args:
+        results: 结果字典
+        output_path: 输出路径
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✓ 基准结果已保存到: {output_path}")
+
+
+def load_results(path: str) -> Dict:
+    """加载之前保存的基准结果"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    max_regression: float = 0.2,
+    latency_keys: Tuple[str, ...] = ('p50_ms', 'p95_ms', 'p99_ms'),
+    throughput_keys: Tuple[str, ...] = ('throughput_per_sec',)
+) -> List[str]:
+    """
+    与基线结果对比，找出超过阈值的回归
+
+    延迟类指标越大越差，吞吐量类指标越小越差。
+
+    Args:
+        current: 本次结果 {场景: {指标: 值}}
+        baseline: 基线结果 {场景: {指标: 值}}
+        max_regression: 允许的最大回归比例（0.2 表示 20%）
+        latency_keys: 延迟类指标名
+        throughput_keys: 吞吐量类指标名
+
+    Returns:
+        回归描述列表（为空表示通过）
+    """
+    regressions = []
+
+    for scenario, metrics in current.items():
+        base = baseline.get(scenario)
+        if not base or metrics.get('skipped') or base.get('skipped'):
+            continue
+
+        for key in latency_keys:
+            old, new = base.get(key), metrics.get(key)
+            if old and new is not None and new > old * (1 + max_regression):
+                regressions.append(
+                    f"{scenario} {key}: {old:.3f} -> {new:.3f} (+{(new / old - 1) * 100:.1f}%)"
+                )
+
+        for key in throughput_keys:
+            old, new = base.get(key), metrics.get(key)
+            if old and new is not None and new < old * (1 - max_regression):
+                regressions.append(
+                    f"{scenario} {key}: {old:.2f} -> {new:.2f} (-{(1 - new / old) * 100:.1f}%)"
+                )
+
+    return regressions
@@ -0,0 +1,186 @@
+"""
+标注避让基准
+
+在合成试卷上生成生词标注（每个生词一条音标、一条释义，每行固定数量的生词，
+标注较多时页面按行数加长，相当于把多页拼成一张长页），比较两种避让方式的
+耗时和效果：
+
+1. legacy   原来的两两比较实现（只看Y坐标，O(n²)）
+2. resolver PositionCalculator.avoid_overlap（空间索引，先横向后纵向）
+
+效果按标注的估计书写宽度统计：仍然重叠的标注对数、移出页面的标注数
+以及平均位移。
+
+    python benchmarks/bench_annotation_layout.py
+    python benchmarks/bench_annotation_layout.py --sizes 500 1000 2000 --runs 3
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from _common import environment_info, save_results
+
+from auto_lookup import Annotation, PositionCalculator, estimate_text_width
+
+# 页面宽度和行距（毫米）
+PAGE_WIDTH = 210.0
+LINE_PITCH = 30.0
+
+_PHONETICS = ['/əˈbændən/', '/ɪˈvæljueɪt/', '/ˈkɒnsɪkwəns/', '/rɪˈzɪljəns/', '/ˈθʌrə/']
+_DEFINITIONS = ['放弃', '评估；估价', '结果；后果', '恢复力；弹性', '彻底的', '不可避免的']
+
+
+def make_annotations(count: int, words_per_line: int = 6, seed: int = 0) -> Tuple[List[Annotation], float]:
+    """
+    生成合成标注：生词按行排布，每个生词一条音标和一条释义
+
+    Args:
+        count: 标注数量（取偶数）
+        words_per_line: 每行的生词数
+        seed: 随机种子
+
+    Returns:
+        (标注列表, 页面高度)。标注已填充文字，位置与 calculate_annotation_positions 的规则一致
+    """
+    rng = random.Random(seed)
+    words = max(1, count // 2)
+
+    annotations = []
+    for i in range(words):
+        line, slot = divmod(i, words_per_line)
+        # 生词随机分布在行内，相邻生词的标注可能互相重叠
+        x = rng.uniform(0.1, 0.9) * PAGE_WIDTH if slot else rng.uniform(0.05, 0.2) * PAGE_WIDTH
+        y = 10 + line * LINE_PITCH
+        annotations.append(Annotation(rng.choice(_PHONETICS), (x, y + 10.0), True))
+        annotations.append(Annotation(rng.choice(_DEFINITIONS), (x, y + 20.0), False))
+
+    lines = -(-words // words_per_line)
+    return annotations, 10 + lines * LINE_PITCH
+
+
+def legacy_avoid_overlap(annotations: List[Annotation], line_spacing: float = 10.0) -> List[Annotation]:
+    """原来的实现：两两比较Y坐标，太接近时把下面的标注下移"""
+    adjusted = annotations.copy()
+    for i in range(len(adjusted)):
+        for j in range(i + 1, len(adjusted)):
+            ann1 = adjusted[i]
+            ann2 = adjusted[j]
+            if abs(ann1.position[1] - ann2.position[1]) < line_spacing:
+                if ann1.position[1] < ann2.position[1]:
+                    ann2.position = (ann2.position[0], ann1.position[1] + line_spacing)
+                else:
+                    ann1.position = (ann1.position[0], ann2.position[1] + line_spacing)
+    return adjusted
+
+
+def measure_quality(
+    original: List[Annotation],
+    adjusted: List[Annotation],
+    char_height: float,
+    page_height: float
+) -> Dict[str, float]:
+    """统计仍然重叠的标注对、移出页面的标注和平均位移"""
+    boxes: List[Tuple[float, float, float, float]] = []
+    off_page = 0
+    displacement = 0.0
+    for before, after in zip(original, adjusted):
+        width = estimate_text_width(after.text, char_height)
+        x, y = after.position
+        box = (x - width / 2, y - char_height / 2, x + width / 2, y + char_height / 2)
+        boxes.append(box)
+        if box[0] < 0 or box[1] < 0 or box[2] > PAGE_WIDTH or box[3] > page_height:
+            off_page += 1
+        displacement += ((x - before.position[0]) ** 2 + (y - before.position[1]) ** 2) ** 0.5
+
+    # 按左边界扫描统计重叠对
+    overlaps = 0
+    active: List[Tuple[float, float, float, float]] = []
+    for box in sorted(boxes):
+        active = [other for other in active if other[2] > box[0]]
+        overlaps += sum(1 for other in active if other[1] < box[3] and other[3] > box[1])
+        active.append(box)
+
+    return {
+        'overlapping_pairs': overlaps,
+        'off_page': off_page,
+        'mean_displacement_mm': round(displacement / len(adjusted), 3) if adjusted else 0.0,
+    }
+
+
+def run_case(
+    resolve: Callable[[List[Annotation]], List[Annotation]],
+    annotations: List[Annotation],
+    runs: int,
+    char_height: float,
+    page_height: float
+) -> Dict:
+    """多次运行一种避让方式，取最快的一次"""
+    best = None
+    adjusted = annotations
+    for _ in range(runs):
+        working = copy.deepcopy(annotations)
+        start = time.perf_counter()
+        adjusted = resolve(working)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    result = {'seconds': round(best, 6)}
+    result.update(measure_quality(annotations, adjusted, char_height, page_height))
+    return result
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='标注避让基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000],
+                        help='标注数量（默认 100 500 1000 2000）')
+    parser.add_argument('--runs', type=int, default=3, help='每个场景的运行次数（取最快，默认3）')
+    parser.add_argument('--words-per-line', type=int, default=6, help='每行的生词数（默认6）')
+    parser.add_argument('--skip-legacy-above', type=int, default=5000,
+                        help='标注数超过该值时跳过原实现（默认5000）')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'annotation_layout_latest.json'),
+                        help='结果JSON输出路径')
+    args = parser.parse_args()
+
+    calculator = PositionCalculator()
+    char_height = calculator.char_height
+    results: Dict[str, Dict] = {}
+
+    for size in args.sizes:
+        annotations, page_height = make_annotations(size, args.words_per_line)
+        bounds = (PAGE_WIDTH, page_height)
+        case: Dict[str, Dict] = {}
+        if size <= args.skip_legacy_above:
+            case['legacy'] = run_case(legacy_avoid_overlap, annotations, args.runs, char_height, page_height)
+        case['resolver'] = run_case(
+            lambda anns: calculator.avoid_overlap(anns, bounds=bounds),
+            annotations, args.runs, char_height, page_height
+        )
+        case['resolver'].update({k: v for k, v in calculator.last_overlap_stats.items() if k != 'placed'})
+        results[str(len(annotations))] = case
+
+    print()
+    print(f"{'标注数':<8}{'方式':<10}{'耗时(ms)':>12}{'重叠对':>10}{'出界':>8}{'平均位移(mm)':>16}")
+    for size, case in results.items():
+        for name, m in case.items():
+            print(f"{size:<8}{name:<10}{m['seconds'] * 1000:>12.2f}{m['overlapping_pairs']:>10}"
+                  f"{m['off_page']:>8}{m['mean_displacement_mm']:>16.2f}")
+
+    save_results({
+        'benchmark': 'annotation_layout',
+        'environment': environment_info(),
+        'config': {'sizes': args.sizes, 'runs': args.runs, 'words_per_line': args.words_per_line,
+                   'page_width': PAGE_WIDTH, 'line_pitch': LINE_PITCH},
+        'results': results,
+    }, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+校准器启动时间基准
+
+每次测量都在新的子进程中进行（包含模块导入），比较不同矫正后端下
+Calibrator() 的冷启动耗时，并检查构建后是否导入了 paddle：
+
+1. none          默认后端，只做坐标变换
+2. traditional   传统轮廓矫正
+3. learned       模型后端（延迟加载，构建时不导入paddle）
+4. learned_eager 模型后端并立即加载模型（等价于改动前的行为）
+
+    python benchmarks/bench_calibrator_startup.py
+    python benchmarks/bench_calibrator_startup.py --runs 10
+
+none/traditional/learned 任一场景导入了 paddle 时以非零状态码退出。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from _common import PROJECT_ROOT, environment_info, save_results, summarize_latencies
+
+# 子进程中执行的测量脚本：输出 {导入耗时, 构建耗时, 是否导入了paddle}
+_CHILD_SCRIPT = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from calibration import Calibrator
+imported = time.perf_counter()
+calibrator = Calibrator(unwarp_backend={backend!r})
+if {eager!r}:
+    calibrator.unwarper.warm_up()
+done = time.perf_counter()
+print(json.dumps({{
+    'import_seconds': imported - start,
+    'init_seconds': done - imported,
+    'total_seconds': done - start,
+    'paddle_imported': any(name == 'paddle' or name.startswith(('paddle.', 'paddleocr'))
+                           for name in sys.modules),
+}}))
+'''
+
+SCENARIOS = {
+    'none': ('none', False),
+    'traditional': ('traditional', False),
+    'learned': ('learned', False),
+    'learned_eager': ('learned', True),
+}
+
+
+def run_once(backend: str, eager: bool) -> Dict:
+    """在新的子进程中构建一次校准器"""
+    script = _CHILD_SCRIPT.format(root=str(PROJECT_ROOT), backend=backend, eager=eager)
+    proc = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else '子进程失败')
+    # 模块导入时可能打印提示信息，结果在最后一行
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='校准器启动时间基准')
+    parser.add_argument('--runs', type=int, default=5, help='每个场景的运行次数（默认5）')
+    parser.add_argument('--skip-eager', action='store_true', help='跳过立即加载模型的场景')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'calibrator_startup_latest.json'),
+                        help='结果JSON输出路径')
+    args = parser.parse_args()
+
+    runs = max(1, args.runs)
+    results: Dict[str, Dict] = {}
+    failures: List[str] = []
+
+    for name, (backend, eager) in SCENARIOS.items():
+        if eager and args.skip_eager:
+            continue
+
+        try:
+            samples = [run_once(backend, eager) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"警告: 场景 {name} 运行失败: {e}")
+            results[name] = {'skipped': True, 'error': str(e)}
+            continue
+
+        summary = summarize_latencies([s['total_seconds'] for s in samples])
+        summary['init_mean_ms'] = round(sum(s['init_seconds'] for s in samples) / runs * 1000, 4)
+        summary['paddle_imported'] = any(s['paddle_imported'] for s in samples)
+        results[name] = summary
+
+        if summary['paddle_imported'] and not eager:
+            failures.append(name)
+
+    print()
+    print(f"{'场景':<16}{'p50(ms)':>12}{'p95(ms)':>12}{'构建(ms)':>12}{'导入paddle':>12}")
+    for name, m in results.items():
+        if m.get('skipped'):
+            print(f"{name:<16}{'跳过':>12}")
+            continue
+        print(f"{name:<16}{m['p50_ms']:>12.1f}{m['p95_ms']:>12.1f}"
+              f"{m['init_mean_ms']:>12.1f}{'是' if m['paddle_imported'] else '否':>12}")
+
+    save_results({
+        'benchmark': 'calibrator_startup',
+        'environment': environment_info(),
+        'config': {'runs': runs},
+        'results': results,
+    }, args.output)
+
+    if failures:
+        print(f"\n错误: 以下场景在构建校准器时导入了paddle: {', '.join(failures)}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+词条缓存内存基准
+
+用 tracemalloc 分别测量两种缓存方式下每个词条占用的内存：
+1. 直接缓存 WordEntry（dataclass + 列表）
+2. 缓存 CompactWordEntry（__slots__ + 驻留字符串元组，WordLookup 实际使用的方式）
+
+    python benchmarks/bench_entry_memory.py                      # 使用离线夹具
+    python benchmarks/bench_entry_memory.py --db databases/word_details.db --limit 50000
+
+夹具词典较小，可用 --copies 复制出更多词条；复制时会给每个字符串加上
+不同的后缀，避免字符串驻留在重复数据上得到虚高的节省。
+"""
+
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import replace
+from typing import Callable, Dict, List, Tuple
+
+from _common import build_fixture_db, environment_info, save_results
+
+from word_lookup import CompactWordEntry, FastMDXParser, WordEntry
+
+
+def _load_documents(db_path: str, limit: int = 0) -> List[Tuple[str, str]]:
+    """读取词典中的 (词条, HTML) 列表"""
+    conn = sqlite3.connect(db_path)
+    try:
+        sql = 'SELECT entry, paraphrase FROM mdx'
+        if limit > 0:
+            sql += f' LIMIT {int(limit)}'
+        return [(row[0], row[1]) for row in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
+def _with_suffix(entry: WordEntry, suffix: str) -> WordEntry:
+    """给条目中的所有字符串加上后缀（生成互不相同的副本）"""
+    return replace(
+        entry,
+        headword=entry.headword + suffix,
+        phonetics=[p + suffix for p in entry.phonetics],
+        definitions=[d + suffix for d in entry.definitions],
+        chinese_definitions=[c + suffix for c in entry.chinese_definitions],
+        examples=[e + suffix for e in entry.examples],
+        base_form=entry.base_form + suffix if entry.base_form else entry.base_form,
+        pos=entry.pos
+    )
+
+
+def _parsed_groups(documents: List[Tuple[str, str]], copies: int) -> Dict[str, List[WordEntry]]:
+    """解析全部文档，返回 {缓存键: 条目列表}"""
+    groups: Dict[str, List[WordEntry]] = {}
+    for i in range(copies):
+        suffix = f'~{i}' if i else ''
+        for word, html in documents:
+            entries = FastMDXParser().parse(html)
+            if suffix:
+                entries = [_with_suffix(entry, suffix) for entry in entries]
+            groups.setdefault(word + suffix, []).extend(entries)
+    return groups
+
+
+def measure(build: Callable[[], Dict]) -> Tuple[int, Dict]:
+    """
+    测量构建缓存时新分配且仍存活的内存
+
+    Returns:
+        (字节数, 构建出的缓存)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        cache = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, cache
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='词条缓存内存基准')
+    parser.add_argument('--db', help='词典数据库路径（默认使用离线夹具）')
+    parser.add_argument('--limit', type=int, default=0, help='最多读取的条目数（0表示全部）')
+    parser.add_argument('--copies', type=int, default=200, help='词条复制份数（默认200）')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'entry_memory_latest.json'),
+                        help='结果JSON输出路径')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = build_fixture_db(os.path.join(tmp_dir.name, 'word_details.db'))
+        print(f"✓ 已构建离线夹具词典: {db_path}")
+
+    try:
+        documents = _load_documents(db_path, args.limit)
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    copies = max(1, args.copies)
+    print(f"✓ 读取 {len(documents)} 篇文档，复制 {copies} 份")
+
+    # 每种方式都从新解析的数据构建，保证字符串不在两份缓存之间共享
+    dataclass_bytes, dataclass_cache = measure(lambda: _parsed_groups(documents, copies))
+    entry_count = sum(len(entries) for entries in dataclass_cache.values())
+    del dataclass_cache
+
+    def build_compact() -> Dict[str, Tuple[CompactWordEntry, ...]]:
+        groups = _parsed_groups(documents, copies)
+        cache = {word: tuple(CompactWordEntry.from_entry(e) for e in entries)
+                 for word, entries in groups.items()}
+        del groups
+        return cache
+
+    compact_bytes, compact_cache = measure(build_compact)
+    del compact_cache
+
+    results = {
+        'dataclass': {
+            'entries': entry_count,
+            'bytes': dataclass_bytes,
+            'bytes_per_entry': round(dataclass_bytes / entry_count, 1) if entry_count else 0.0,
+        },
+        'compact': {
+            'entries': entry_count,
+            'bytes': compact_bytes,
+            'bytes_per_entry': round(compact_bytes / entry_count, 1) if entry_count else 0.0,
+        },
+    }
+    saving = 1 - compact_bytes / dataclass_bytes if dataclass_bytes else 0.0
+
+    print()
+    print(f"{'存储方式':<14}{'条目数':>10}{'总内存(KB)':>14}{'字节/条目':>12}")
+    for label, m in results.items():
+        print(f"{label:<14}{m['entries']:>10}{m['bytes'] / 1024:>14.1f}{m['bytes_per_entry']:>12.1f}")
+    print(f"\n紧凑存储节省: {saving * 100:.1f}%")
+
+    save_results({
+        'benchmark': 'entry_memory',
+        'environment': environment_info(),
+        'config': {'db': args.db or 'fixture', 'limit': args.limit, 'copies': copies},
+        'results': results,
+        'saving': round(saving, 4),
+    }, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
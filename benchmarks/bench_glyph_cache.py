@@ -0,0 +1,111 @@
+"""
+字形缓存基准
+
+比较两种书写方式生成Gcode的耗时：
+
+1. render  原来的流程：整段文字渲染成图像 → 骨架化 → 提取笔画
+2. cached  WriterMachine 用字形缓存按前进宽度拼接笔画
+
+另外统计字形缓存的预热耗时、从磁盘重新加载的耗时，以及拼接时
+每个字符的平均耗时（微秒）和命中率。字形缓存写在临时目录中，
+不影响项目的 glyph_cache/。
+
+    python benchmarks/bench_glyph_cache.py
+    python benchmarks/bench_glyph_cache.py --texts "abandon" "/əˈbændən/ v. 放弃" --runs 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from _common import environment_info, save_results
+
+from writer import GlyphCache, WriterMachine
+
+_DEFAULT_TEXTS = [
+    'abandon',
+    '/əˈbændən/',
+    'The quick brown fox jumps over the lazy dog',
+]
+
+
+def time_write(writer: WriterMachine, text: str, runs: int) -> float:
+    """多次书写同一段文字，取最快的一次（秒）"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        writer.write_text(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='字形缓存基准')
+    parser.add_argument('--texts', nargs='+', default=_DEFAULT_TEXTS, help='要书写的文字')
+    parser.add_argument('--runs', type=int, default=5, help='每段文字的运行次数（取最快，默认5）')
+    parser.add_argument('--chars', type=int, default=20000, help='测量每字符耗时时拼接的字符数（默认20000）')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'glyph_cache_latest.json'),
+                        help='结果JSON输出路径')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = GlyphCache(cache_dir=cache_dir)
+        cached_writer = WriterMachine(glyph_cache=cache)
+        render_writer = WriterMachine(use_glyph_cache=False)
+
+        start = time.perf_counter()
+        built = cached_writer.warm_up_glyphs()
+        warm_up_seconds = time.perf_counter() - start
+
+        results: Dict[str, Dict] = {}
+        for text in args.texts:
+            results[text] = {
+                'render_ms': round(time_write(render_writer, text, args.runs) * 1000, 3),
+                'cached_ms': round(time_write(cached_writer, text, args.runs) * 1000, 3),
+            }
+
+        # 拼接长文本，测量每个缓存字符的耗时
+        sample = ' '.join(args.texts)
+        long_text = (sample * (args.chars // len(sample) + 1))[:args.chars]
+        start = time.perf_counter()
+        cached_writer.compose_text(long_text)
+        per_char_us = (time.perf_counter() - start) / len(long_text) * 1e6
+
+        # 新进程第一次书写前从磁盘加载缓存
+        reloaded = GlyphCache(cache_dir=cache_dir)
+        font_path = cached_writer.renderer.english_font_path
+        start = time.perf_counter()
+        reloaded.metrics(font_path, WriterMachine.FONT_SIZE)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        stats = cache.stats()
+
+    print()
+    print(f"预热: {built} 个字形，{warm_up_seconds * 1000:.1f} ms；从磁盘加载: {load_ms:.2f} ms")
+    print(f"拼接: {per_char_us:.2f} µs/字符，命中率 {stats['hit_rate']:.2%}")
+    print()
+    print(f"{'文字':<46}{'render(ms)':>12}{'cached(ms)':>12}{'加速':>8}")
+    for text, m in results.items():
+        speedup = m['render_ms'] / m['cached_ms'] if m['cached_ms'] else 0.0
+        print(f"{text[:44]:<46}{m['render_ms']:>12.2f}{m['cached_ms']:>12.2f}{speedup:>7.1f}x")
+
+    save_results({
+        'benchmark': 'glyph_cache',
+        'environment': environment_info(),
+        'config': {'texts': args.texts, 'runs': args.runs, 'chars': args.chars},
+        'warm_up': {'glyphs': built, 'seconds': round(warm_up_seconds, 6), 'load_ms': round(load_ms, 3)},
+        'compose_us_per_char': round(per_char_us, 3),
+        'cache_stats': stats,
+        'results': results,
+    }, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+单词查询基准测试
+
+对 WordLookup.lookup 在一个贴近真实使用的语料上进行压测，覆盖：
+1. 高频词
+2. 屈折变化形式（走 get_word_base_form 的链接/规则还原路径）
+3. 带语境句子的多义词
+4. 查不到的词
+
+每类语料分别在冷缓存/热缓存、语义匹配开/关的组合下运行，
+输出吞吐量与 p50/p95/p99 延迟，并写入JSON结果文件。
+指定 --baseline 时与之前的结果对比，超过阈值的回归会以非零状态码退出。
+
+默认使用 fixtures/word_details.sql 构建的小型词典，完全离线运行：
+    python benchmarks/bench_lookup.py
+    python benchmarks/bench_lookup.py --baseline benchmarks/results/lookup_baseline.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+# 语义模型只允许使用本地已下载的权重，保证基准完全离线
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+from _common import (
+    build_fixture_db,
+    compare_results,
+    environment_info,
+    load_results,
+    save_results,
+    summarize_latencies,
+)
+
+from word_lookup import WordLookup, SENTENCE_TRANSFORMER_AVAILABLE
+
+
+# 语料：(单词, 语境)
+CORPUS: Dict[str, List[Tuple[str, str]]] = {
+    # 高频词，词典中直接存在
+    'high_frequency': [
+        (w, '') for w in [
+            'time', 'people', 'year', 'good', 'new', 'work', 'play', 'make',
+            'take', 'go', 'see', 'think', 'know', 'big', 'large', 'city',
+        ]
+    ],
+    # 屈折变化形式：前半部分在词典中是链接/交叉引用，后半部分需要规则还原
+    'inflected': [
+        (w, '') for w in [
+            'ran', 'went', 'children', 'mice', 'better', 'decided', 'studies',
+            'made', 'taken', 'seen', 'thought', 'knew', 'happier', 'boxes',
+            'deciding', 'decides', 'carried', 'carrying', 'stopped', 'stopping',
+            'playing', 'works', 'larger', 'approaches',
+        ]
+    ],
+    # 带语境的多义词
+    'context': [
+        ('bank', 'I need to deposit my salary at the bank before it closes.'),
+        ('bank', 'We sat on the grassy bank of the river and watched the boats.'),
+        ('run', 'She runs a small family business that sells handmade soap.'),
+        ('run', 'He had to run very fast to catch the last train home.'),
+        ('light', 'Please switch off the light in the kitchen.'),
+        ('bat', 'The bat flew out of the dark cave at night.'),
+        ('bat', 'He picked up the bat and hit the ball over the fence.'),
+        ('spring', 'The cherry trees blossom every spring in the park.'),
+        ('spring', 'A broken spring was sticking out of the old sofa.'),
+        ('crane', 'The crane lifted the container onto the ship.'),
+        ('mouse', 'Move the mouse to the icon and click twice.'),
+        ('mouse', 'The cat chased a mouse across the kitchen floor.'),
+    ],
+    # 查不到的词（同样会走完整的词形还原流程）
+    'miss': [
+        (w, '') for w in [
+            'xyzzy', 'qwertyuiop', 'blorfed', 'zzyzx', 'frobnicating',
+            'glarbs', 'snorkeler', 'wugs', 'plinkest', 'quuxes',
+        ]
+    ],
+}
+
+
+def _reset_caches(lookup: WordLookup):
+    """清空查词器内的各类缓存，模拟冷启动"""
+    lookup.embedding_cache.clear()
+    lookup.clear_cache()
+
+
+def _create_lookup(db_path: str, semantic: bool) -> WordLookup:
+    """创建查词器（基准过程中不向磁盘写入向量缓存）"""
+    lookup = WordLookup(use_semantic_search=semantic, db_path=db_path)
+    lookup._save_cache = lambda: None
+    return lookup
+
+
+def _time_pass(lookup: WordLookup, items: List[Tuple[str, str]]) -> Tuple[List[float], float]:
+    """
+    对一组语料执行一次查询
+
+    Returns:
+        (每次调用耗时列表, 总耗时)
+    """
+    latencies = []
+    start = time.perf_counter()
+    for word, context in items:
+        t0 = time.perf_counter()
+        lookup.lookup(word, context)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+def run_scenario(lookup: WordLookup, cache: str, rounds: int) -> Dict[str, Dict[str, float]]:
+    """
+    运行一个（缓存状态, 语义开关）组合
+
+    Args:
+        lookup: 查词器
+        cache: 'cold' 或 'warm'
+        rounds: 轮数
+
+    Returns:
+        {语料类别: 统计结果}
+    """
+    results = {}
+    all_latencies: List[float] = []
+    all_elapsed = 0.0
+
+    for category, items in CORPUS.items():
+        latencies: List[float] = []
+        elapsed = 0.0
+
+        if cache == 'warm':
+            # 预热一遍，不计时
+            _time_pass(lookup, items)
+
+        for _ in range(rounds):
+            if cache == 'cold':
+                _reset_caches(lookup)
+            lat, el = _time_pass(lookup, items)
+            latencies.extend(lat)
+            elapsed += el
+
+        results[category] = summarize_latencies(latencies, elapsed)
+        all_latencies.extend(latencies)
+        all_elapsed += elapsed
+
+    results['all'] = summarize_latencies(all_latencies, all_elapsed)
+    return results
+
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    """打印结果表格"""
+    header = f"{'场景':<36}{'次数':>6}{'吞吐(次/秒)':>14}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+    print(header)
+    print('-' * len(header))
+    for scenario, m in results.items():
+        if m.get('skipped'):
+            print(f"{scenario:<36}{'跳过: ' + m.get('reason', ''):>20}")
+            continue
+        print(f"{scenario:<36}{m['count']:>6}{m['throughput_per_sec']:>14.1f}"
+              f"{m['p50_ms']:>10.3f}{m['p95_ms']:>10.3f}{m['p99_ms']:>10.3f}")
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='WordLookup.lookup 基准测试')
+    parser.add_argument('--db', help='词典数据库路径（默认使用离线夹具）')
+    parser.add_argument('--rounds', type=int, default=5, help='每个场景的计时轮数')
+    parser.add_argument('--semantic', choices=['off', 'on', 'both'], default='both',
+                        help='语义匹配开关')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'lookup_latest.json'),
+                        help='结果JSON输出路径')
+    parser.add_argument('--baseline', help='用于对比的基线结果JSON')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='允许的最大回归比例（默认0.2，即20%%）')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = build_fixture_db(os.path.join(tmp_dir.name, 'word_details.db'))
+        print(f"✓ 已构建离线夹具词典: {db_path}")
+
+    semantic_modes = {'off': [False], 'on': [True], 'both': [False, True]}[args.semantic]
+    results: Dict[str, Dict[str, float]] = {}
+
+    try:
+        for semantic in semantic_modes:
+            mode = 'semantic_on' if semantic else 'semantic_off'
+
+            if semantic and not SENTENCE_TRANSFORMER_AVAILABLE:
+                for cache in ('cold', 'warm'):
+                    results[f"{mode}/{cache}/all"] = {
+                        'skipped': True, 'reason': 'sentence-transformers未安装'
+                    }
+                continue
+
+            lookup = _create_lookup(db_path, semantic)
+            if semantic and not lookup.use_semantic_search:
+                for cache in ('cold', 'warm'):
+                    results[f"{mode}/{cache}/all"] = {
+                        'skipped': True, 'reason': '本地没有可用的语义模型'
+                    }
+                continue
+
+            for cache in ('cold', 'warm'):
+                print(f"\n正在运行: {mode} / {cache} ...")
+                scenario = run_scenario(lookup, cache, args.rounds)
+                for category, metrics in scenario.items():
+                    results[f"{mode}/{cache}/{category}"] = metrics
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    print()
+    print_table(results)
+
+    save_results({
+        'benchmark': 'word_lookup',
+        'environment': environment_info(),
+        'config': {
+            'db': args.db or 'fixture',
+            'rounds': args.rounds,
+            'semantic': args.semantic,
+        },
+        'results': results,
+    }, args.output)
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        regressions = compare_results(results, baseline.get('results', {}), args.max_regression)
+        if regressions:
+            print(f"\n✗ 检测到 {len(regressions)} 项性能回归（阈值 {args.max_regression * 100:.0f}%）:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✓ 未发现超过 {args.max_regression * 100:.0f}% 的性能回归")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
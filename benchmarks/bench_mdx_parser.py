@@ -0,0 +1,180 @@
+"""
+MDX解析器基准测试与差分校验
+
+遍历词典数据库中的全部条目，分别用 MDXParser（基于HTMLParser）
+和 FastMDXParser（基于正则分词）解析，逐条对比得到的 WordEntry 列表，
+并输出两者的解析速度（条目/秒）。任何不一致都会以非零状态码退出。
+
+    python benchmarks/bench_mdx_parser.py                       # 使用离线夹具
+    python benchmarks/bench_mdx_parser.py --db databases/word_details.db
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from _common import build_fixture_db, environment_info, save_results
+
+from word_lookup import MDXParser, FastMDXParser
+
+
+# 夹具之外的刁钻输入：实体、自闭合、注释、大写标签、单引号、不规范标签等
+EDGE_CASES: List[str] = [
+    '<div class="entry"><h1 class="headword">caf&eacute;</h1>'
+    '<span class="def">a small &amp; cheap restaurant</span><chn>咖啡馆</chn></div>',
+    '<DIV CLASS="entry"><H1 Class=\'headword\'>Test</H1><SPAN class=def>a test</SPAN></DIV>',
+    '<div class="entry"><h1 class="headword">x</h1><!-- comment --><span class="def">y</span></div>',
+    '<div class="entry"><h1 class="headword">x</h1><br/><span class="def">y<br />z</span></div>',
+    '<div class="entry"><h1 class="headword">x</h1><span class="def">a &lt; b</span> tail &amp',
+    '<div class="entry"><h1 class="headword">x</h1><script>var a = "<span>";</script></div>',
+    '<div class="entry"><h1 class="headword">x</h1><span class="def">1 < 2</span></div>',
+    '<div class="entry"><h1 class="headword">x</h1></span foo><span class="def">y</span></div>',
+    '<div class="entry"><h1 class="headword" class="other">x</h1></div>',
+    '<div class="entry"><h1 class = "headword">x</h1><span class="pos">noun</span></div>',
+    '@@@LINK=run',
+    'plain text without any tags',
+    '',
+]
+
+
+def _load_entries(db_path: str, limit: int = 0) -> List[Tuple[str, str]]:
+    """读取词典中的 (词条, HTML) 列表"""
+    conn = sqlite3.connect(db_path)
+    try:
+        sql = 'SELECT entry, paraphrase FROM mdx'
+        if limit > 0:
+            sql += f' LIMIT {int(limit)}'
+        return [(row[0], row[1]) for row in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
+def _parse_all(parser_class, documents: List[str]) -> Tuple[List, float]:
+    """
+    解析全部文档
+
+    Returns:
+        (每篇文档的解析结果, 总耗时)
+    """
+    results = []
+    start = time.perf_counter()
+    for html in documents:
+        results.append(parser_class().parse(html))
+    return results, time.perf_counter() - start
+
+
+def check_parity(names: List[str], documents: List[str],
+                 expected: List, actual: List, max_report: int = 10) -> int:
+    """
+    对比两个解析器的结果
+
+    Returns:
+        不一致的文档数
+    """
+    mismatches = 0
+    for name, html, old, new in zip(names, documents, expected, actual):
+        if old == new:
+            continue
+        mismatches += 1
+        if mismatches <= max_report:
+            print(f"✗ 解析结果不一致: {name!r}")
+            print(f"  HTML: {html[:200]!r}")
+            print(f"  MDXParser:     {old}")
+            print(f"  FastMDXParser: {new}")
+    return mismatches
+
+
+def count_fallbacks(documents: List[str]) -> int:
+    """统计需要回退到 HTMLParser 的文档数"""
+    fallbacks = 0
+    for html in documents:
+        parser = FastMDXParser()
+        if (html.startswith('@@@LINK=') or '<!' in html or '<?' in html
+                or not parser._feed_fast(html)):
+            fallbacks += 1
+    return fallbacks
+
+
+def main() -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description='MDX解析器基准测试与差分校验')
+    parser.add_argument('--db', help='词典数据库路径（默认使用离线夹具）')
+    parser.add_argument('--limit', type=int, default=0, help='最多读取的条目数（0表示全部）')
+    parser.add_argument('--rounds', type=int, default=3, help='计时轮数（取最快一轮）')
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'mdx_parser_latest.json'),
+                        help='结果JSON输出路径')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = build_fixture_db(os.path.join(tmp_dir.name, 'word_details.db'))
+        print(f"✓ 已构建离线夹具词典: {db_path}")
+
+    try:
+        rows = _load_entries(db_path, args.limit)
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    names = [name for name, _ in rows]
+    documents = [html for _, html in rows]
+    if not args.db:
+        names += [f'edge_case_{i}' for i in range(len(EDGE_CASES))]
+        documents += EDGE_CASES
+    print(f"✓ 共 {len(documents)} 篇文档")
+
+    # 差分校验
+    expected, _ = _parse_all(MDXParser, documents)
+    actual, _ = _parse_all(FastMDXParser, documents)
+    mismatches = check_parity(names, documents, expected, actual)
+    fallbacks = count_fallbacks(documents)
+    total_entries = sum(len(entries) for entries in expected)
+
+    # 计时（取最快一轮，减少噪声）
+    results: Dict[str, Dict[str, float]] = {}
+    for label, parser_class in (('html_parser', MDXParser), ('fast_parser', FastMDXParser)):
+        best = min(_parse_all(parser_class, documents)[1] for _ in range(max(1, args.rounds)))
+        results[label] = {
+            'documents': len(documents),
+            'entries': total_entries,
+            'seconds': round(best, 4),
+            'documents_per_sec': round(len(documents) / best, 1) if best > 0 else 0.0,
+            'entries_per_sec': round(total_entries / best, 1) if best > 0 else 0.0,
+        }
+
+    speedup = results['html_parser']['seconds'] / results['fast_parser']['seconds'] \
+        if results['fast_parser']['seconds'] > 0 else 0.0
+
+    print()
+    print(f"{'解析器':<16}{'文档数':>8}{'条目数':>8}{'耗时(s)':>10}{'条目/秒':>14}")
+    for label, m in results.items():
+        print(f"{label:<16}{m['documents']:>8}{m['entries']:>8}{m['seconds']:>10.4f}"
+              f"{m['entries_per_sec']:>14.1f}")
+    print(f"\n加速比: {speedup:.2f}x，回退文档: {fallbacks}/{len(documents)}")
+
+    save_results({
+        'benchmark': 'mdx_parser',
+        'environment': environment_info(),
+        'config': {'db': args.db or 'fixture', 'limit': args.limit, 'rounds': args.rounds},
+        'results': results,
+        'speedup': round(speedup, 3),
+        'fallbacks': fallbacks,
+        'mismatches': mismatches,
+    }, args.output)
+
+    if mismatches:
+        print(f"\n✗ {mismatches} 篇文档的解析结果不一致")
+        return 1
+
+    print("\n✓ 两个解析器的结果完全一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+-- 单词查询基准测试用的小型离线词典（与 databases/word_details.db 的 mdx 表结构一致）
+-- 由 benchmarks/_common.py 在运行时导入到临时 SQLite 数据库
+
+CREATE TABLE IF NOT EXISTS mdx (
+    entry TEXT NOT NULL,
+    paraphrase TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mdx_entry ON mdx (entry);
+
+INSERT INTO mdx (entry, paraphrase) VALUES ('run', '<div class="entry"><h1 class="headword">run</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/rʌn/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to move using your legs, going faster than when you walk</span><chn>跑；奔跑</chn><ul class="examples"><li><span class="x">She ran to catch the bus.</span></li><li><span class="x">I had to run to get here on time.</span></li></ul></li><li class="sense"><span class="def">to be in charge of a business, etc.</span><chn>经营；管理</chn><ul class="examples"><li><span class="x">He runs a small hotel in the mountains.</span></li></ul></li><li class="sense"><span class="def">to make a computer program work</span><chn>运行（程序）</chn><ul class="examples"><li><span class="x">The new software runs on any laptop.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('bank', '<div class="entry"><h1 class="headword">bank</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/bæŋk/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">an organization that provides various financial services</span><chn>银行</chn><ul class="examples"><li><span class="x">I need to go to the bank to deposit this money.</span></li></ul></li><li class="sense"><span class="def">the side of a river, canal, etc. and the land near it</span><chn>河岸；岸边</chn><ul class="examples"><li><span class="x">We had a picnic on the bank of the river.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('light', '<div class="entry"><h1 class="headword">light</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/laɪt/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">the energy from the sun, a lamp, etc. that makes it possible to see things</span><chn>光；光线</chn><ul class="examples"><li><span class="x">The light was too dim to read by.</span></li></ul></li><li class="sense"><span class="def">a device that produces light</span><chn>灯</chn><ul class="examples"><li><span class="x">Turn the lights off when you leave the room.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('bat', '<div class="entry"><h1 class="headword">bat</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/bæt/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a piece of wood with a handle, used for hitting the ball in sports</span><chn>球棒；球拍</chn><ul class="examples"><li><span class="x">He swung the bat and hit the ball.</span></li></ul></li><li class="sense"><span class="def">an animal like a mouse with wings, that flies and feeds at night</span><chn>蝙蝠</chn><ul class="examples"><li><span class="x">Bats sleep upside down in caves during the day.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('decide', '<div class="entry"><h1 class="headword">decide</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/dɪˈsaɪd/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to think carefully about the different possibilities and choose one</span><chn>决定；拿主意</chn><ul class="examples"><li><span class="x">We decided to stay at home this weekend.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('study', '<div class="entry"><h1 class="headword">study</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/ˈstʌdi/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to spend time learning about a subject</span><chn>学习；攻读</chn><ul class="examples"><li><span class="x">She studies medicine at Harvard.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('happy', '<div class="entry"><h1 class="headword">happy</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/ˈhæpi/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">feeling or showing pleasure</span><chn>快乐的；幸福的</chn><ul class="examples"><li><span class="x">You look happy today.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('make', '<div class="entry"><h1 class="headword">make</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/meɪk/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to create or prepare something</span><chn>制造；做</chn><ul class="examples"><li><span class="x">She makes her own clothes.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('take', '<div class="entry"><h1 class="headword">take</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/teɪk/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to carry or move something from one place to another</span><chn>拿；带走</chn><ul class="examples"><li><span class="x">Take an umbrella with you.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('go', '<div class="entry"><h1 class="headword">go</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/ɡəʊ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to move or travel from one place to another</span><chn>去；走</chn><ul class="examples"><li><span class="x">I went to Paris last summer.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('see', '<div class="entry"><h1 class="headword">see</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/siː/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to become aware of somebody/something by using your eyes</span><chn>看见；看到</chn><ul class="examples"><li><span class="x">I saw him in the street yesterday.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('think', '<div class="entry"><h1 class="headword">think</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/θɪŋk/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to have a particular idea or opinion about something</span><chn>认为；以为</chn><ul class="examples"><li><span class="x">I think it is going to rain.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('know', '<div class="entry"><h1 class="headword">know</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/nəʊ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to have information in your mind as a result of experience</span><chn>知道；了解</chn><ul class="examples"><li><span class="x">I knew the answer immediately.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('time', '<div class="entry"><h1 class="headword">time</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/taɪm/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">what is measured in minutes, hours, days, etc.</span><chn>时间</chn><ul class="examples"><li><span class="x">Time passes quickly when you are busy.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('people', '<div class="entry"><h1 class="headword">people</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/ˈpiːpl/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">persons; men, women or children</span><chn>人；人们</chn><ul class="examples"><li><span class="x">Many people came to the concert.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('year', '<div class="entry"><h1 class="headword">year</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/jɪə(r)/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">the period from 1 January to 31 December</span><chn>年</chn><ul class="examples"><li><span class="x">She was born in the year 2000.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('good', '<div class="entry"><h1 class="headword">good</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/ɡʊd/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">of high quality or an acceptable standard</span><chn>好的；优质的</chn><ul class="examples"><li><span class="x">This is a good book.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('new', '<div class="entry"><h1 class="headword">new</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/njuː/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">not existing before; recently made</span><chn>新的</chn><ul class="examples"><li><span class="x">Have you seen their new house?</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('work', '<div class="entry"><h1 class="headword">work</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/wɜːk/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to do something that involves physical or mental effort</span><chn>工作；劳动</chn><ul class="examples"><li><span class="x">He works in a bank.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('play', '<div class="entry"><h1 class="headword">play</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/pleɪ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to do things for pleasure, as children do</span><chn>玩；玩耍</chn><ul class="examples"><li><span class="x">The children were playing in the park.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('carry', '<div class="entry"><h1 class="headword">carry</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/ˈkæri/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to support the weight of somebody/something and take them from place to place</span><chn>拿；提；搬</chn><ul class="examples"><li><span class="x">She carried her baby in her arms.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('stop', '<div class="entry"><h1 class="headword">stop</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/stɒp/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to no longer move; to make somebody/something no longer move</span><chn>停止；停下</chn><ul class="examples"><li><span class="x">The car stopped at the traffic lights.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('big', '<div class="entry"><h1 class="headword">big</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/bɪɡ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">large in size, degree, amount, etc.</span><chn>大的</chn><ul class="examples"><li><span class="x">They live in a big house.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('large', '<div class="entry"><h1 class="headword">large</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/lɑːdʒ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">big in size or quantity</span><chn>大的；大量的</chn><ul class="examples"><li><span class="x">A large number of people attended.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('box', '<div class="entry"><h1 class="headword">box</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/bɒks/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a container made of wood, cardboard, metal, etc.</span><chn>盒子；箱子</chn><ul class="examples"><li><span class="x">She packed her books into boxes.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('city', '<div class="entry"><h1 class="headword">city</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/ˈsɪti/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a large and important town</span><chn>城市</chn><ul class="examples"><li><span class="x">Tokyo is a very big city.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('environment', '<div class="entry"><h1 class="headword">environment</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/ɪnˈvaɪrənmənt/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">the natural world in which people, animals and plants live</span><chn>自然环境</chn><ul class="examples"><li><span class="x">We must protect the environment.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('significant', '<div class="entry"><h1 class="headword">significant</h1><span class="pos">adjective</span><span class="phonetics"><span class="phon">/sɪɡˈnɪfɪkənt/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">large or important enough to have an effect or to be noticed</span><chn>显著的；重要的</chn><ul class="examples"><li><span class="x">There was a significant increase in sales.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('analyse', '<div class="entry"><h1 class="headword">analyse</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/ˈænəlaɪz/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to examine the nature or structure of something</span><chn>分析</chn><ul class="examples"><li><span class="x">The data was analysed by computer.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('approach', '<div class="entry"><h1 class="headword">approach</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/əˈprəʊtʃ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a way of dealing with somebody/something</span><chn>方法；途径</chn><ul class="examples"><li><span class="x">We need a new approach to the problem.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('evidence', '<div class="entry"><h1 class="headword">evidence</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/ˈevɪdəns/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">the facts, signs or objects that make you believe that something is true</span><chn>证据；证明</chn><ul class="examples"><li><span class="x">There is no evidence that the drug is harmful.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('crane', '<div class="entry"><h1 class="headword">crane</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/kreɪn/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a tall machine with a long arm, used to lift and move heavy objects</span><chn>起重机；吊车</chn><ul class="examples"><li><span class="x">A crane lifted the steel beams onto the roof.</span></li></ul></li><li class="sense"><span class="def">a large bird with long legs and a long neck</span><chn>鹤</chn><ul class="examples"><li><span class="x">A crane stood motionless in the shallow water.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('spring', '<div class="entry"><h1 class="headword">spring</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/sprɪŋ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">the season of the year between winter and summer</span><chn>春天；春季</chn><ul class="examples"><li><span class="x">Flowers bloom in spring.</span></li></ul></li><li class="sense"><span class="def">a twisted piece of metal that can be pushed or pulled but returns to its shape</span><chn>弹簧</chn><ul class="examples"><li><span class="x">The spring in the old mattress had broken.</span></li></ul></li><li class="sense"><span class="def">a place where water comes naturally to the surface from under the ground</span><chn>泉；泉水</chn><ul class="examples"><li><span class="x">They drank from a mountain spring.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('mouse', '<div class="entry"><h1 class="headword">mouse</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/maʊs/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a small animal that is covered in fur and has a long thin tail</span><chn>老鼠</chn><ul class="examples"><li><span class="x">The cat caught a mouse.</span></li></ul></li><li class="sense"><span class="def">a small device that is moved by hand to control a computer cursor</span><chn>鼠标</chn><ul class="examples"><li><span class="x">Click the left mouse button twice.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('child', '<div class="entry"><h1 class="headword">child</h1><span class="pos">noun</span><span class="phonetics"><span class="phon">/tʃaɪld/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">a young human who is not yet an adult</span><chn>儿童；小孩</chn><ul class="examples"><li><span class="x">The children are playing outside.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('buy', '<div class="entry"><h1 class="headword">buy</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/baɪ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to obtain something by paying money for it</span><chn>买；购买</chn><ul class="examples"><li><span class="x">I bought a new coat yesterday.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('teach', '<div class="entry"><h1 class="headword">teach</h1><span class="pos">verb</span><span class="phonetics"><span class="phon">/tiːtʃ/</span></span><ol class="senses_multiple"><li class="sense"><span class="def">to give lessons to students in a school, college, etc.</span><chn>教；讲授</chn><ul class="examples"><li><span class="x">She taught English for ten years.</span></li></ul></li></ol></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('ran', '@@@LINK=run');
+INSERT INTO mdx (entry, paraphrase) VALUES ('went', '@@@LINK=go');
+INSERT INTO mdx (entry, paraphrase) VALUES ('children', '@@@LINK=child');
+INSERT INTO mdx (entry, paraphrase) VALUES ('mice', '@@@LINK=mouse');
+INSERT INTO mdx (entry, paraphrase) VALUES ('better', '@@@LINK=good');
+INSERT INTO mdx (entry, paraphrase) VALUES ('decided', '<div class="entry"><h1 class="headword">decided</h1><span class="xrefs">see <a class="Ref" href="entry://decide"><span class="xh">decide</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('studies', '<div class="entry"><h1 class="headword">studies</h1><span class="xrefs">see <a class="Ref" href="entry://study"><span class="xh">study</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('made', '<div class="entry"><h1 class="headword">made</h1><span class="xrefs">see <a class="Ref" href="entry://make"><span class="xh">make</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('taken', '<div class="entry"><h1 class="headword">taken</h1><span class="xrefs">see <a class="Ref" href="entry://take"><span class="xh">take</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('seen', '<div class="entry"><h1 class="headword">seen</h1><span class="xrefs">see <a class="Ref" href="entry://see"><span class="xh">see</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('thought', '<div class="entry"><h1 class="headword">thought</h1><span class="xrefs">see <a class="Ref" href="entry://think"><span class="xh">think</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('knew', '<div class="entry"><h1 class="headword">knew</h1><span class="xrefs">see <a class="Ref" href="entry://know"><span class="xh">know</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('happier', '<div class="entry"><h1 class="headword">happier</h1><span class="xrefs">see <a class="Ref" href="entry://happy"><span class="xh">happy</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('boxes', '<div class="entry"><h1 class="headword">boxes</h1><span class="xrefs">see <a class="Ref" href="entry://box"><span class="xh">box</span></a></span></div>');
+INSERT INTO mdx (entry, paraphrase) VALUES ('cities', '<div class="entry"><h1 class="headword">cities</h1><span class="xrefs">see <a class="Ref" href="entry://city"><span class="xh">city</span></a></span></div>');
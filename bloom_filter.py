@@ -0,0 +1,163 @@
+"""
+布隆过滤器模块 - 用于超大已知单词表的成员预过滤
+
+快照文件格式（小端）：
+    magic        4字节   b'KWBF'
+    format       uint32  文件格式版本（当前为1）
+    num_bits     uint64  位数组长度
+    num_hashes   uint32  哈希函数个数
+    count        uint64  插入的键数量
+    version      uint64  构建时数据源的版本号
+    bits         ...     位数组
+
+快照以只读方式内存映射，多个进程打开同一个文件时共享操作系统的页缓存。
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+from typing import Iterable, Optional, Tuple
+
+_MAGIC = b'KWBF'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sIQIQQ')
+
+
+def optimal_parameters(count: int, false_positive_rate: float) -> Tuple[int, int]:
+    """
+    根据元素数量和误判率计算位数和哈希函数个数
+
+    Args:
+        count: 预计元素数量
+        false_positive_rate: 目标误判率（0-1之间）
+
+    Returns:
+        (位数, 哈希函数个数)
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError(f"误判率必须在0和1之间: {false_positive_rate}")
+
+    count = max(count, 1)
+    num_bits = int(math.ceil(-count * math.log(false_positive_rate) / (math.log(2) ** 2)))
+    num_bits = max(64, (num_bits + 7) // 8 * 8)
+    num_hashes = max(1, int(round(num_bits / count * math.log(2))))
+    return num_bits, num_hashes
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    """计算两个64位哈希值（用于双重哈希生成k个位置）"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = struct.unpack('<QQ', digest)
+    return h1, h2 | 1
+
+
+class BloomFilter:
+    """只读的内存映射布隆过滤器"""
+
+    def __init__(self, path: str):
+        """
+        打开布隆过滤器快照
+
+        Args:
+            path: 快照文件路径
+
+        Raises:
+            ValueError: 文件格式不正确
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"布隆过滤器文件已损坏: {path}")
+
+        magic, fmt, num_bits, num_hashes, count, version = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or fmt != _FORMAT_VERSION or len(self._mmap) < _HEADER.size + num_bits // 8:
+            self.close()
+            raise ValueError(f"布隆过滤器文件格式不正确: {path}")
+
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self.version = version
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _hash_pair(key)
+        data = self._mmap
+        offset = _HEADER.size
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            bit = (h1 + i * h2) % num_bits
+            if not data[offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def close(self):
+        """关闭内存映射"""
+        self._mmap.close()
+
+    @staticmethod
+    def build(path: str, keys: Iterable[str], count: int,
+              false_positive_rate: float = 0.01, version: int = 0) -> int:
+        """
+        构建布隆过滤器快照并原子替换到目标路径
+
+        Args:
+            path: 快照文件路径
+            keys: 要插入的键
+            count: 键的数量（用于计算参数，可以是上限）
+            false_positive_rate: 目标误判率
+            version: 数据源版本号（写入文件头）
+
+        Returns:
+            实际插入的键数量
+        """
+        num_bits, num_hashes = optimal_parameters(count, false_positive_rate)
+        bits = bytearray(num_bits // 8)
+
+        inserted = 0
+        for key in keys:
+            h1, h2 = _hash_pair(key)
+            for i in range(num_hashes):
+                bit = (h1 + i * h2) % num_bits
+                bits[bit >> 3] |= 1 << (bit & 7)
+            inserted += 1
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.bloom-', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, num_bits, num_hashes, inserted, version))
+                f.write(bits)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+        return inserted
+
+
+def open_bloom_filter(path: str) -> Optional[BloomFilter]:
+    """
+    打开布隆过滤器快照
+
+    Args:
+        path: 快照文件路径
+
+    Returns:
+        BloomFilter，文件不存在或损坏时返回None
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return BloomFilter(path)
+    except (ValueError, OSError) as e:
+        print(f"警告: 无法加载布隆过滤器 {path}: {e}")
+        return None
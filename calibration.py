@@ -13,6 +13,7 @@ import numpy as np
 from pathlib import Path
 from typing import Optional, Tuple, List
 import pickle
+import threading
 
 
 class ArUcoMarkerGenerator:
@@ -119,21 +120,68 @@ class ArUcoMarkerGenerator:
 
 
 class ImageUnwarp:
-    """图像矫正 - 使用PaddleOCR文本图像矫正模块"""
+    """
+    图像矫正 - 支持多种矫正后端
 
-    def __init__(self):
-        """初始化图像矫正器"""
-        try:
-            from paddleocr import PPStructure
-            print("正在初始化PaddleOCR...")
-            self.ocr_engine = PPStructure(show_log=False)
-            self.available = True
-            print("✓ PaddleOCR初始化成功")
-        except Exception as e:
-            print(f"警告: PaddleOCR初始化失败: {e}")
-            print("将使用传统矫正方法")
-            self.ocr_engine = None
-            self.available = False
+    后端：
+        none         不矫正，直接返回原图
+        traditional  传统方法（最大轮廓 + 透视变换），只依赖OpenCV
+        learned      PaddleOCR PPStructure 模型，首次矫正时才导入并加载，
+                     加载或推理失败时回退到传统方法
+    """
+
+    BACKEND_NONE = 'none'
+    BACKEND_TRADITIONAL = 'traditional'
+    BACKEND_LEARNED = 'learned'
+    BACKENDS = (BACKEND_NONE, BACKEND_TRADITIONAL, BACKEND_LEARNED)
+
+    def __init__(self, backend: str = BACKEND_LEARNED):
+        """
+        初始化图像矫正器（不加载模型）
+
+        Args:
+            backend: 矫正后端（none / traditional / learned）
+
+        Raises:
+            ValueError: 未知的后端
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"未知的矫正后端: {backend}（可选: {', '.join(self.BACKENDS)}）")
+
+        self.backend = backend
+        self.ocr_engine = None
+        self._engine_failed = False
+        self._load_lock = threading.Lock()
+        # PPStructure不是线程安全的，共享实例时串行调用
+        self._engine_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """模型后端是否已加载"""
+        return self.ocr_engine is not None
+
+    def warm_up(self):
+        """预先加载模型后端（仅 learned 后端有效）"""
+        if self.backend == self.BACKEND_LEARNED:
+            self._get_engine()
+
+    def _get_engine(self):
+        """获取PPStructure引擎（首次调用时加载，失败后不再重试）"""
+        if self.ocr_engine is not None or self._engine_failed:
+            return self.ocr_engine
+
+        with self._load_lock:
+            if self.ocr_engine is None and not self._engine_failed:
+                try:
+                    from paddleocr import PPStructure
+                    print("正在初始化PaddleOCR...")
+                    self.ocr_engine = PPStructure(show_log=False)
+                    print("✓ PaddleOCR初始化成功")
+                except Exception as e:
+                    print(f"警告: PaddleOCR初始化失败: {e}")
+                    print("将使用传统矫正方法")
+                    self._engine_failed = True
+        return self.ocr_engine
 
     def unwarp_image(self, image: np.ndarray) -> np.ndarray:
         """
@@ -145,13 +193,21 @@ class ImageUnwarp:
         Returns:
             矫正后的图像
         """
-        if not self.available or self.ocr_engine is None:
+        if self.backend == self.BACKEND_NONE:
+            return image
+
+        if self.backend == self.BACKEND_TRADITIONAL:
+            return self._unwarp_traditional(image)
+
+        engine = self._get_engine()
+        if engine is None:
             # 使用传统方法
             return self._unwarp_traditional(image)
 
         try:
             # 使用PaddleOCR进行矫正
-            result = self.ocr_engine(image)
+            with self._engine_lock:
+                result = engine(image)
 
             # 如果检测到文本区域，尝试矫正
             if result and len(result) > 0:
@@ -258,13 +314,17 @@ class ImageUnwarp:
 class Calibrator:
     """校准器 - 使用ArUco标记进行校准"""
 
-    def __init__(self, marker_size: float = 30.0, dict_name: str = 'DICT_6X6_250'):
+    def __init__(self, marker_size: float = 30.0, dict_name: str = 'DICT_6X6_250',
+                 unwarper: Optional[ImageUnwarp] = None,
+                 unwarp_backend: str = ImageUnwarp.BACKEND_NONE):
         """
         初始化校准器
 
         Args:
             marker_size: ArUco标记的物理尺寸（毫米）
             dict_name: ArUco字典名称
+            unwarper: 共享的图像矫正器（指定后忽略 unwarp_backend）
+            unwarp_backend: 新建矫正器时使用的后端（默认不矫正，校准不依赖PaddleOCR）
         """
         self.marker_size = marker_size
         self.dict_name = dict_name
@@ -285,7 +345,7 @@ class Calibrator:
             self.detector = None
 
         # 初始化图像矫正器
-        self.unwarper = ImageUnwarp()
+        self.unwarper = unwarper if unwarper is not None else ImageUnwarp(backend=unwarp_backend)
 
         # 校准数据
         self.camera_matrix = None
@@ -0,0 +1,174 @@
+"""
+引擎注册表模块 - 在进程内共享已加载的模型引擎
+
+OCR、图像矫正、查词和写字机等引擎初始化耗时较长（加载模型权重、字体等），
+每个请求重新创建会让单次请求耗时达到数十秒。注册表为每个引擎保存一个工厂函数，
+首次使用时（或服务启动时在后台预热）构建一次，之后所有请求共享同一个实例。
+
+    registry = EngineRegistry()
+    registry.register('ocr', lambda: TextExtractor())
+    registry.warm_up()                 # 后台预热（可选）
+    extractor = registry.get('ocr')    # 未就绪时在当前线程构建，并发调用只构建一次
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 引擎状态
+STATE_NOT_LOADED = 'not_loaded'
+STATE_LOADING = 'loading'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+
+class _EngineSlot:
+    """单个引擎的工厂、实例和加载状态"""
+
+    __slots__ = ('factory', 'instance', 'state', 'error', 'load_seconds', 'lock')
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.instance = None
+        self.state = STATE_NOT_LOADED
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class EngineRegistry:
+    """进程级引擎注册表（线程安全，每个引擎只构建一次）"""
+
+    def __init__(self):
+        self._slots: Dict[str, _EngineSlot] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """
+        注册引擎工厂
+
+        Args:
+            name: 引擎名称
+            factory: 无参工厂函数，返回引擎实例（可以通过 get() 获取其他引擎）
+        """
+        with self._lock:
+            self._slots[name] = _EngineSlot(factory)
+
+    def names(self):
+        """已注册的引擎名称"""
+        with self._lock:
+            return list(self._slots)
+
+    def _slot(self, name: str) -> _EngineSlot:
+        with self._lock:
+            slot = self._slots.get(name)
+        if slot is None:
+            raise KeyError(f"未注册的引擎: {name}")
+        return slot
+
+    def get(self, name: str) -> Any:
+        """
+        获取引擎实例（未构建时在当前线程构建）
+
+        同一引擎的并发调用只会构建一次，其余调用等待构建完成。
+        构建失败时抛出异常，下次调用会重新尝试。
+
+        Args:
+            name: 引擎名称
+
+        Returns:
+            引擎实例
+
+        Raises:
+            KeyError: 引擎未注册
+            RuntimeError: 引擎构建失败
+        """
+        slot = self._slot(name)
+        if slot.state == STATE_READY:
+            return slot.instance
+
+        with slot.lock:
+            if slot.state == STATE_READY:
+                return slot.instance
+
+            slot.state = STATE_LOADING
+            slot.error = None
+            start = time.perf_counter()
+            try:
+                instance = slot.factory()
+            except Exception as e:
+                slot.state = STATE_FAILED
+                slot.error = str(e)
+                slot.load_seconds = time.perf_counter() - start
+                print(f"警告: 引擎 {name} 初始化失败: {e}")
+                raise RuntimeError(f"引擎 {name} 初始化失败: {e}") from e
+
+            slot.instance = instance
+            slot.load_seconds = time.perf_counter() - start
+            slot.state = STATE_READY
+            print(f"✓ 引擎 {name} 已就绪（{slot.load_seconds:.1f}秒）")
+            return instance
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """
+        检查引擎是否就绪
+
+        Args:
+            name: 引擎名称（为None时检查全部引擎）
+
+        Returns:
+            是否就绪
+        """
+        if name is not None:
+            return self._slot(name).state == STATE_READY
+        with self._lock:
+            slots = list(self._slots.values())
+        return all(slot.state == STATE_READY for slot in slots)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取全部引擎的状态
+
+        Returns:
+            {引擎名称: {'state', 'load_seconds', 'error'}}
+        """
+        with self._lock:
+            items = list(self._slots.items())
+        return {
+            name: {
+                'state': slot.state,
+                'load_seconds': round(slot.load_seconds, 3) if slot.load_seconds is not None else None,
+                'error': slot.error,
+            }
+            for name, slot in items
+        }
+
+    def warm_up(self, names: Optional[Iterable[str]] = None,
+                background: bool = True) -> Optional[threading.Thread]:
+        """
+        预热引擎（按顺序构建，单个引擎失败不影响其他引擎）
+
+        Args:
+            names: 要预热的引擎（默认全部，按注册顺序）
+            background: 是否在后台线程中预热
+
+        Returns:
+            后台线程（background为False时返回None）
+        """
+        targets = list(names) if names is not None else self.names()
+
+        def run():
+            for name in targets:
+                try:
+                    self.get(name)
+                except Exception:
+                    # 错误已记录在状态中，首次使用时会重试
+                    pass
+
+        if not background:
+            run()
+            return None
+
+        thread = threading.Thread(target=run, name='engine-warmup', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,91 @@
+"""
+文本行聚类模块 - 把单词（或横线）按纵向位置分成行
+
+对所有中心点的Y坐标做一次排序，相邻两个Y坐标的间隔超过阈值处即为
+行与行的分界（一维间隔聚类），全部用numpy数组运算完成，几千个单词
+也只需一次排序。阈值默认取字高中位数的一半：同一行内单词中心的高度差
+远小于字高，而相邻两行的间隔至少是一个字高。
+
+倾斜的试卷先用文本框上边的斜率中位数把Y坐标校正为水平，
+再进行聚类，避免一行文字从左到右逐渐偏移后被拆成多行。
+
+自动查单词（PositionCalculator.group_by_lines）和自动抄写
+（LineDetector.merge_lines）共用这里的实现。
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# 行分界阈值 = 字高中位数 × 该比例
+DEFAULT_GAP_FACTOR = 0.5
+# 斜率估计的上限（约11度），超过时视为估计错误
+MAX_SKEW = 0.2
+
+
+def estimate_skew(boxes: np.ndarray) -> float:
+    """
+    估计页面倾斜（文本框上边斜率的中位数）
+
+    Args:
+        boxes: 文本框数组 (N, 4, 2)，角点顺序为左上、右上、右下、左下
+
+    Returns:
+        斜率 dy/dx（无法估计时为0）
+    """
+    boxes = np.asarray(boxes, dtype=np.float64)
+    if boxes.size == 0:
+        return 0.0
+    dx = boxes[:, 1, 0] - boxes[:, 0, 0]
+    dy = boxes[:, 1, 1] - boxes[:, 0, 1]
+    valid = np.abs(dx) > 1e-6
+    if not valid.any():
+        return 0.0
+    slope = float(np.median(dy[valid] / dx[valid]))
+    return slope if abs(slope) <= MAX_SKEW else 0.0
+
+
+def cluster_lines(
+    ys: np.ndarray,
+    heights: Optional[np.ndarray] = None,
+    threshold: Optional[float] = None,
+    xs: Optional[np.ndarray] = None,
+    slope: float = 0.0,
+    gap_factor: float = DEFAULT_GAP_FACTOR
+) -> np.ndarray:
+    """
+    按纵向位置把点聚类成行
+
+    Args:
+        ys: 中心点Y坐标 (N,)
+        heights: 每个文本框的高度 (N,)，用于计算阈值
+        threshold: 行分界阈值（指定时忽略 heights）
+        xs: 中心点X坐标 (N,)，校正倾斜时需要
+        slope: 页面倾斜斜率 dy/dx（见 estimate_skew）
+        gap_factor: 阈值相对字高中位数的比例
+
+    Returns:
+        每个点的行号 (N,)，行号按从上到下的顺序从0开始
+
+    Raises:
+        ValueError: 既没有指定阈值也没有提供字高
+    """
+    ys = np.asarray(ys, dtype=np.float64)
+    if ys.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if threshold is None:
+        if heights is None:
+            raise ValueError("需要指定行分界阈值或提供字高")
+        heights = np.asarray(heights, dtype=np.float64)
+        threshold = float(np.median(heights)) * gap_factor
+
+    # 校正倾斜：把每个点沿倾斜方向投影到 x=0 处
+    if slope and xs is not None:
+        ys = ys - slope * np.asarray(xs, dtype=np.float64)
+
+    order = np.argsort(ys, kind='stable')
+    breaks = np.diff(ys[order]) > threshold
+    labels = np.empty(ys.size, dtype=np.int64)
+    labels[order] = np.concatenate(([0], np.cumsum(breaks)))
+    return labels
@@ -12,10 +12,8 @@ import sys
 import argparse
 from pathlib import Path
 
-from calibration import Calibrator, ArUcoMarkerGenerator
+from calibration import Calibrator, ArUcoMarkerGenerator, ImageUnwarp
 from writer import WriterMachine, MachineController
-from auto_lookup import AutoLookup
-from auto_copy import AutoCopy
 
 
 def print_banner():
@@ -47,7 +45,7 @@ def calibrate(args):
     """校准"""
     print("校准写字机...")
 
-    calibrator = Calibrator(marker_size=args.marker_size)
+    calibrator = Calibrator(marker_size=args.marker_size, unwarp_backend=args.unwarp)
 
     # 定义标记位置（需要用户提供）
     print("\n请提供标记的物理位置（毫米）：")
@@ -104,7 +102,7 @@ def write_text(args):
     """书写文字"""
     print("书写文字...")
 
-    writer = WriterMachine()
+    writer = WriterMachine(use_glyph_cache=not args.no_glyph_cache)
 
     gcode = writer.write_text(
         text=args.text,
@@ -133,7 +131,13 @@ def auto_lookup(args):
     """自动查单词"""
     print("自动查单词...")
 
-    auto_lookup = AutoLookup()
+    # 按需导入（依赖PaddleOCR，校准等子命令不需要加载）
+    from auto_lookup import AutoLookup
+    from ocr_cache import OCRCache
+
+    ocr_cache = OCRCache(args.ocr_cache) if args.ocr_cache else None
+    auto_lookup = AutoLookup(profile_id=args.profile, ocr_cache=ocr_cache, dedupe_policy=args.dedupe,
+                             skip_rank=args.skip_rank)
 
     # 添加已知单词
     if args.known_words:
@@ -155,10 +159,98 @@ def auto_lookup(args):
     return success
 
 
+def skip_rank(args):
+    """查看/设置学生的简单词跳过阈值"""
+    from auto_lookup import KnownWordsPool
+
+    db = KnownWordsPool().get(args.profile)
+    if args.rank is not None:
+        db.set_skip_rank(args.rank)
+        print(f"✓ 已设置跳过阈值: {args.rank}")
+    else:
+        print(f"当前跳过阈值: {db.get_skip_rank()}（0表示不跳过）")
+    db.close()
+
+
+def backfill_lemmas(args):
+    """回填已知单词的词元"""
+    from auto_lookup import KnownWordsDatabase
+
+    db = KnownWordsDatabase(args.db)
+    count = db.backfill_lemmas(force=args.force)
+    db.close()
+    print(f"✓ 已更新 {count} 个已知单词的词元")
+
+
+def rebuild_bloom(args):
+    """重建已知单词的布隆过滤器快照"""
+    from auto_lookup import KnownWordsDatabase
+
+    # 以布隆过滤器模式打开，避免先把整张表加载到内存集合中
+    db = KnownWordsDatabase(args.db, use_bloom=True, bloom_fpr=args.fpr)
+    count = db.rebuild_bloom(false_positive_rate=args.fpr)
+    db.close()
+    print(f"✓ 布隆过滤器已重建: {db.bloom_path}（{count} 个键，误判率 {args.fpr}）")
+
+
+def batch_ocr(args):
+    """多页批量OCR"""
+    import json
+    import time
+    from auto_lookup import BatchTextExtractor, TextExtractor, iter_document_pages, pages_per_minute
+
+    print(f"批量OCR: {len(args.inputs)} 个文件，{args.workers} 个工作进程")
+
+    page_sources = []
+
+    def iter_pages():
+        for path in args.inputs:
+            for number, image in enumerate(iter_document_pages(path), 1):
+                page_sources.append((path, number))
+                yield image
+
+    if args.workers > 1:
+        extractor = BatchTextExtractor(workers=args.workers, unwarp_backend=args.unwarp)
+    else:
+        extractor = TextExtractor(unwarper=ImageUnwarp(backend=args.unwarp))
+
+    start = time.perf_counter()
+    count = 0
+    try:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for page in extractor.extract_pages(iter_pages()):
+                count += 1
+                source, number = page_sources[page.page_index]
+                f.write(json.dumps({
+                    'page_index': page.page_index,
+                    'source': source,
+                    'source_page': number,
+                    'seconds': round(page.seconds, 3),
+                    'results': [
+                        {'text': r.text, 'bbox': [[float(x), float(y)] for x, y in r.bbox],
+                         'confidence': float(r.confidence), 'center': list(r.center)}
+                        for r in page.results
+                    ]
+                }, ensure_ascii=False) + '\n')
+                f.flush()
+                elapsed = time.perf_counter() - start
+                print(f"✓ 第 {count} 页完成（{source} 第 {number} 页，{len(page.results)} 个文本块，"
+                      f"{pages_per_minute(count, elapsed)} 页/分钟）")
+    finally:
+        if isinstance(extractor, BatchTextExtractor):
+            extractor.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ 批量OCR完成: {count} 页，用时 {elapsed:.1f} 秒（{pages_per_minute(count, elapsed)} 页/分钟）")
+    print(f"✓ 结果已保存到: {args.output}")
+
+
 def auto_copy(args):
     """自动抄写"""
     print("自动抄写...")
 
+    from auto_copy import AutoCopy
+
     auto_copy = AutoCopy()
 
     success = auto_copy.copy_text(
@@ -267,6 +359,8 @@ def main():
     cal_parser.add_argument('-s', '--marker-size', type=float, default=30.0, help='标记物理尺寸（毫米）')
     cal_parser.add_argument('-p', '--marker-positions', nargs='+', help='标记位置（ID,X,Y）')
     cal_parser.add_argument('-o', '--output', default='calibration.pkl', help='校准数据输出路径')
+    cal_parser.add_argument('--unwarp', choices=ImageUnwarp.BACKENDS, default=ImageUnwarp.BACKEND_NONE,
+                            help='校准前的图像矫正方式（默认不矫正）')
 
     # 写字命令
     write_parser = subparsers.add_parser('write', help='书写文字')
@@ -274,6 +368,8 @@ def main():
     write_parser.add_argument('-o', '--output', default='output.gcode', help='Gcode输出路径')
     write_parser.add_argument('--preview', default='preview.png', help='预览图像路径')
     write_parser.add_argument('--handright', action='store_true', help='使用Handright渲染手写体')
+    write_parser.add_argument('--no-glyph-cache', action='store_true',
+                              help='不使用字形缓存（整段渲染后骨架化）')
     write_parser.add_argument('--port', help='串口（直接发送到机器）')
     write_parser.add_argument('--baudrate', type=int, default=115200, help='波特率')
 
@@ -284,6 +380,36 @@ def main():
     lookup_parser.add_argument('-k', '--known-words', help='已知单词（逗号分隔）')
     lookup_parser.add_argument('-o', '--output', default='annotations.gcode', help='Gcode输出路径')
     lookup_parser.add_argument('--preview', default='annotated.jpg', help='标注图像路径')
+    lookup_parser.add_argument('--profile', help='学生ID（使用该学生的已知单词词库）')
+    lookup_parser.add_argument('--dedupe', choices=('every', 'first', 'paragraph'), default='every',
+                               help='重复生词的标注策略：每次出现/每页第一次/每段一次（默认every）')
+    lookup_parser.add_argument('--ocr-cache', metavar='DIR',
+                               help='OCR结果缓存目录（同一张图片再次处理时跳过OCR）')
+    lookup_parser.add_argument('--skip-rank', type=int, metavar='N',
+                               help='跳过词频排名前N的简单词（默认使用学生词库中的设置，0表示不跳过）')
+
+    # 简单词跳过阈值命令
+    rank_parser = subparsers.add_parser('skip-rank', help='查看/设置学生的简单词跳过阈值')
+    rank_parser.add_argument('rank', type=int, nargs='?', help='新的阈值N（省略时只显示当前设置）')
+    rank_parser.add_argument('--profile', help='学生ID（默认学生使用 known_words.db）')
+
+    # 回填词元命令
+    lemma_parser = subparsers.add_parser('backfill-lemmas', help='为已知单词数据库回填词元')
+    lemma_parser.add_argument('--db', default='known_words.db', help='已知单词数据库路径')
+    lemma_parser.add_argument('--force', action='store_true', help='重新计算所有单词的词元')
+
+    # 重建布隆过滤器命令
+    bloom_parser = subparsers.add_parser('rebuild-bloom', help='重建已知单词的布隆过滤器快照')
+    bloom_parser.add_argument('--db', default='known_words.db', help='已知单词数据库路径')
+    bloom_parser.add_argument('--fpr', type=float, default=0.01, help='目标误判率（默认0.01）')
+
+    # 批量OCR命令
+    ocr_parser = subparsers.add_parser('batch-ocr', help='多页批量OCR（图片、多页PDF/TIFF）')
+    ocr_parser.add_argument('inputs', nargs='+', help='图片或多页文档路径')
+    ocr_parser.add_argument('-o', '--output', default='ocr_results.jsonl', help='结果JSONL输出路径')
+    ocr_parser.add_argument('-w', '--workers', type=int, default=1, help='工作进程数（默认1）')
+    ocr_parser.add_argument('--unwarp', choices=ImageUnwarp.BACKENDS, default=ImageUnwarp.BACKEND_LEARNED,
+                            help='图像矫正方式（默认learned）')
 
     # 自动抄写命令
     copy_parser = subparsers.add_parser('auto-copy', help='自动抄写')
@@ -313,6 +439,18 @@ def main():
     elif args.command == 'auto-lookup':
         auto_lookup(args)
 
+    elif args.command == 'skip-rank':
+        skip_rank(args)
+
+    elif args.command == 'backfill-lemmas':
+        backfill_lemmas(args)
+
+    elif args.command == 'rebuild-bloom':
+        rebuild_bloom(args)
+
+    elif args.command == 'batch-ocr':
+        batch_ocr(args)
+
     elif args.command == 'auto-copy':
         auto_copy(args)
 
@@ -0,0 +1,188 @@
+"""
+OCR结果缓存模块 - 按图像内容寻址的磁盘缓存
+
+同一张试卷照片常常被反复处理（例如标记了几个已会单词后重新查词），
+OCR是其中最耗时的步骤。缓存键由解码后图像的像素内容（形状、类型和数据）
+以及OCR参数共同计算，所以重新保存或改名的同一张图片也能命中，
+而参数不同（语言、矫正方式等）时不会误用结果。
+
+缓存目录结构：
+    <cache_dir>/<键前两位>/<键>.json
+
+总大小超过上限时，按最近访问时间淘汰最旧的条目。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# 淘汰时清理到上限的比例，避免每次写入都触发淘汰
+_EVICT_TARGET_RATIO = 0.9
+
+
+class OCRCache:
+    """按图像内容寻址的OCR结果磁盘缓存（线程安全，多进程可共享目录）"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str = "ocr_cache", max_bytes: int = 256 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def make_key(self, image: np.ndarray, params: Dict[str, Any]) -> str:
+        """
+        计算缓存键
+
+        Args:
+            image: 解码后的图像
+            params: 影响OCR结果的参数
+
+        Returns:
+            十六进制缓存键
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        header = {
+            'format': self.FORMAT_VERSION,
+            'shape': list(image.shape),
+            'dtype': str(image.dtype),
+            'params': params,
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的结果，未命中时返回None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # 更新访问时间，用于按最近使用淘汰
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: List[Dict[str, Any]]):
+        """
+        写入缓存（原子替换），超过大小上限时淘汰旧条目
+
+        Args:
+            key: 缓存键
+            value: 可序列化为JSON的结果
+        """
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(prefix='.ocr-', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """遍历缓存文件，返回 [(路径, 大小, 访问时间)]"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """按最近访问时间淘汰，直到总大小降到上限的90%（调用方持有锁）"""
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * _EVICT_TARGET_RATIO
+
+        removed = 0
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        self._total_bytes = total
+        if removed:
+            print(f"✓ OCR缓存已淘汰 {removed} 个条目（当前 {total / 1024 / 1024:.1f}MB）")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            {'hits', 'misses', 'hit_rate', 'bytes', 'max_bytes'}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            for path, _, _ in self._scan():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
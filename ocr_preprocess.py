@@ -0,0 +1,289 @@
+"""
+OCR预处理模块 - 按文字大小自适应缩放，并对大图分块检测
+
+手机或打印机摄像头拍摄的试卷通常有1200万像素以上，而试卷文字在远低于
+该分辨率时就足够清晰。直接把原图交给PaddleOCR时，检测模型会把整张图
+缩小到 960 像素边长，小字因此丢失细节，而预处理、识别裁剪等步骤仍按
+原图像素数计算。
+
+本模块的处理流程：
+1. 在缩略图上估计文字高度（连通域高度的中位数）
+2. 把图像缩放到目标文字高度（只缩小不放大）
+3. 缩放后仍超过检测尺寸的图像切成带重叠的分块，逐块检测
+4. 合并分块边界上被切开或重复检测的文本框
+5. 在缩放图上裁剪文本框进行识别，最后把坐标映射回原图
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# 分块: (x0, y0, x1, y1)，缩放后图像坐标
+Tile = Tuple[int, int, int, int]
+
+
+@dataclass
+class OCRPlan:
+    """单张图像的预处理计划"""
+    scale: float  # 缩放比例（缩放后 / 原图）
+    scaled_size: Tuple[int, int]  # 缩放后的 (宽, 高)
+    tiles: List[Tile] = field(default_factory=list)
+    text_height: Optional[float] = None  # 原图中估计的文字高度（像素）
+
+
+class OCRPreprocessor:
+    """自适应缩放与分块规划"""
+
+    def __init__(
+        self,
+        target_text_height: float = 16.0,
+        min_pixels: int = 4_000_000,
+        tile_size: int = 960,
+        min_scale: float = 0.2,
+        thumbnail_size: int = 1600
+    ):
+        """
+        初始化预处理器
+
+        Args:
+            target_text_height: 缩放后的目标文字高度（像素）
+            min_pixels: 像素数不超过该值的图像不做预处理
+            tile_size: 分块边长（不超过PaddleOCR的检测尺寸，避免再次缩小）
+            min_scale: 最小缩放比例
+            thumbnail_size: 估计文字高度时使用的缩略图边长
+        """
+        self.target_text_height = target_text_height
+        self.min_pixels = min_pixels
+        self.tile_size = tile_size
+        self.min_scale = min_scale
+        self.thumbnail_size = thumbnail_size
+
+    def estimate_text_height(self, image: np.ndarray) -> Optional[float]:
+        """
+        估计图像中的文字高度
+
+        在缩略图上二值化，取字符大小的连通域高度中位数。
+
+        Args:
+            image: 输入图像
+
+        Returns:
+            原图中的文字高度（像素），无法估计时返回None
+        """
+        height, width = image.shape[:2]
+        thumb_scale = min(1.0, self.thumbnail_size / max(height, width))
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        if thumb_scale < 1.0:
+            gray = cv2.resize(gray, None, fx=thumb_scale, fy=thumb_scale, interpolation=cv2.INTER_AREA)
+
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        if count <= 1:
+            return None
+
+        # 跳过背景，只保留字符大小的连通域（排除噪点、横线和大块图形）
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        mask = (
+            (heights >= 3)
+            & (heights <= binary.shape[0] / 10)
+            & (widths <= heights * 5)
+            & (areas >= 6)
+        )
+        if int(mask.sum()) < 20:
+            return None
+
+        return float(np.median(heights[mask])) / thumb_scale
+
+    def plan(self, image: np.ndarray) -> Optional[OCRPlan]:
+        """
+        生成预处理计划
+
+        Args:
+            image: 输入图像
+
+        Returns:
+            预处理计划，图像较小（直接识别即可）时返回None
+        """
+        height, width = image.shape[:2]
+        if height * width <= self.min_pixels:
+            return None
+
+        text_height = self.estimate_text_height(image)
+        scale = 1.0
+        if text_height:
+            scale = min(1.0, max(self.min_scale, self.target_text_height / text_height))
+
+        scaled_width = max(1, int(round(width * scale)))
+        scaled_height = max(1, int(round(height * scale)))
+
+        # 重叠区域至少容纳两行文字，保证每行都完整落在某个分块中
+        scaled_text = (text_height or self.target_text_height) * scale
+        overlap = int(max(48, scaled_text * 4))
+
+        return OCRPlan(
+            scale=scale,
+            scaled_size=(scaled_width, scaled_height),
+            tiles=plan_tiles(scaled_width, scaled_height, self.tile_size, overlap),
+            text_height=text_height
+        )
+
+
+def _axis_starts(length: int, tile: int, overlap: int) -> List[int]:
+    """计算一个方向上各分块的起点（最后一块贴齐末端）"""
+    if length <= tile:
+        return [0]
+    step = max(1, tile - overlap)
+    starts = list(range(0, length - tile, step))
+    starts.append(length - tile)
+    return starts
+
+
+def plan_tiles(width: int, height: int, tile_size: int, overlap: int) -> List[Tile]:
+    """
+    把图像切成带重叠的分块
+
+    Args:
+        width: 图像宽度
+        height: 图像高度
+        tile_size: 分块边长
+        overlap: 相邻分块的重叠像素
+
+    Returns:
+        分块列表 [(x0, y0, x1, y1)]
+    """
+    overlap = min(overlap, tile_size // 2)
+    tiles = []
+    for y0 in _axis_starts(height, tile_size, overlap):
+        for x0 in _axis_starts(width, tile_size, overlap):
+            tiles.append((x0, y0, min(width, x0 + tile_size), min(height, y0 + tile_size)))
+    return tiles
+
+
+def _box_extent(box: np.ndarray) -> Tuple[float, float, float, float]:
+    """四边形的外接矩形 (x0, y0, x1, y1)"""
+    return float(box[:, 0].min()), float(box[:, 1].min()), float(box[:, 0].max()), float(box[:, 1].max())
+
+
+def _same_text_line(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> bool:
+    """两个文本框是否为同一行文字的片段（纵向大部分重合且横向相交）"""
+    overlap_y = min(a[3], b[3]) - max(a[1], b[1])
+    min_height = min(a[3] - a[1], b[3] - b[1])
+    if min_height <= 0 or overlap_y < min_height * 0.5:
+        return False
+    return min(a[2], b[2]) >= max(a[0], b[0])
+
+
+def merge_tile_boxes(tile_boxes: Sequence[Tuple[int, Sequence]]) -> List[np.ndarray]:
+    """
+    合并各分块检测出的文本框
+
+    同一行文字在分块边界处会被切成两段，或在重叠区域内被检测两次。
+    来自不同分块、属于同一行且相交的文本框合并为外接矩形；
+    同一分块内的文本框保持PaddleOCR的划分。
+
+    Args:
+        tile_boxes: [(分块序号, 文本框)]，文本框为缩放图坐标下的4个角点
+
+    Returns:
+        合并后的文本框（4x2 float32 数组）
+    """
+    boxes = [np.asarray(box, dtype=np.float32).reshape(4, 2) for _, box in tile_boxes]
+    tiles = [tile for tile, _ in tile_boxes]
+    extents = [_box_extent(box) for box in boxes]
+
+    # 并查集
+    parent = list(range(len(boxes)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 按左边界排序扫描，只比较横向可能相交的文本框
+    order = sorted(range(len(boxes)), key=lambda i: extents[i][0])
+    active: List[int] = []
+    for i in order:
+        x0 = extents[i][0]
+        active = [j for j in active if extents[j][2] >= x0]
+        for j in active:
+            if tiles[i] != tiles[j] and _same_text_line(extents[i], extents[j]):
+                parent[find(i)] = find(j)
+        active.append(i)
+
+    groups = {}
+    for i in range(len(boxes)):
+        groups.setdefault(find(i), []).append(i)
+
+    merged = []
+    for members in groups.values():
+        if len(members) == 1:
+            merged.append(boxes[members[0]])
+            continue
+        x0 = min(extents[i][0] for i in members)
+        y0 = min(extents[i][1] for i in members)
+        x1 = max(extents[i][2] for i in members)
+        y1 = max(extents[i][3] for i in members)
+        merged.append(np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float32))
+
+    return sort_boxes(merged)
+
+
+def sort_boxes(boxes: List[np.ndarray]) -> List[np.ndarray]:
+    """按阅读顺序排序文本框（从上到下，同一行从左到右，与PaddleOCR一致）"""
+    ordered = sorted(boxes, key=lambda b: (float(b[0][1]), float(b[0][0])))
+    for i in range(len(ordered) - 1):
+        for j in range(i, -1, -1):
+            if (abs(float(ordered[j + 1][0][1]) - float(ordered[j][0][1])) < 10
+                    and float(ordered[j + 1][0][0]) < float(ordered[j][0][0])):
+                ordered[j], ordered[j + 1] = ordered[j + 1], ordered[j]
+            else:
+                break
+    return ordered
+
+
+def crop_text_region(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """
+    透视裁剪文本框区域（竖排文字旋转为横排）
+
+    Args:
+        image: 图像
+        box: 4个角点（左上、右上、右下、左下）
+
+    Returns:
+        裁剪出的文本图像
+    """
+    points = box.astype(np.float32)
+    crop_width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    crop_height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    crop_width = max(crop_width, 1)
+    crop_height = max(crop_height, 1)
+
+    target = np.float32([[0, 0], [crop_width, 0], [crop_width, crop_height], [0, crop_height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(
+        image, matrix, (crop_width, crop_height),
+        borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC
+    )
+    if crop_height / crop_width >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+def to_original_coordinates(box: np.ndarray, scale: float) -> List[List[float]]:
+    """
+    把缩放图坐标下的文本框映射回原图坐标
+
+    Args:
+        box: 4个角点
+        scale: 缩放比例（缩放后 / 原图）
+
+    Returns:
+        原图坐标下的4个角点
+    """
+    return [[float(x) / scale, float(y) / scale] for x, y in box]
@@ -1,6 +1,32 @@
 // API基础URL
 const API_BASE = '';
 
+// 当前学生ID（为空时使用默认词库）
+let currentProfile = localStorage.getItem('profileId') || '';
+
+// 为已知单词相关接口的URL附加学生ID
+function withProfile(url) {
+    if (!currentProfile) {
+        return url;
+    }
+    const separator = url.includes('?') ? '&' : '?';
+    return `${url}${separator}profile=${encodeURIComponent(currentProfile)}`;
+}
+
+// 切换学生
+function changeProfile() {
+    currentProfile = document.getElementById('profile-id').value.trim();
+    localStorage.setItem('profileId', currentProfile);
+
+    // 已知单词列表属于上一个学生，需要重新加载
+    knownWordsState.version = null;
+    if (document.getElementById('tab-known-words').classList.contains('active')) {
+        syncKnownWords();
+    }
+
+    showNotification(`已切换到学生: ${currentProfile || 'default'}`, 'success');
+}
+
 // 显示/隐藏标签页
 function showTab(tabName, event) {
     // 隐藏所有标签内容
@@ -20,6 +46,11 @@ function showTab(tabName, event) {
     if (event && event.target) {
         event.target.classList.add('active');
     }
+
+    // 已知单词列表：首次进入时加载第一页，之后只同步增量变化
+    if (tabName === 'known-words') {
+        syncKnownWords();
+    }
 }
 
 // 显示/隐藏加载提示
@@ -223,9 +254,10 @@ async function autoLookup() {
     const formData = new FormData();
     formData.append('image', imageInput.files[0]);
     formData.append('known_words', knownWords);
+    formData.append('dedupe', document.getElementById('lookup-dedupe').value);
 
     try {
-        const response = await fetch(`${API_BASE}/api/auto-lookup`, {
+        const response = await fetch(withProfile(`${API_BASE}/api/auto-lookup`), {
             method: 'POST',
             body: formData
         });
@@ -242,6 +274,16 @@ async function autoLookup() {
             const downloadBtn = document.getElementById('lookup-download');
             downloadBtn.href = data.gcode_url;
 
+            // 显示去重统计
+            const summary = document.getElementById('lookup-dedupe-summary');
+            if (data.dedupe) {
+                const d = data.dedupe;
+                summary.textContent = `共 ${d.occurrences} 处生词，标注 ${d.annotated} 处` +
+                    `（少写 ${d.annotations_saved} 处，预计节省 ${d.pen_seconds_saved} 秒书写时间）`;
+            } else {
+                summary.textContent = '';
+            }
+
             // 显示结果
             document.getElementById('lookup-result').style.display = 'block';
 
@@ -581,7 +623,7 @@ async function addSelectedWords() {
     });
 
     try {
-        const response = await fetch(`${API_BASE}/api/add-known-words`, {
+        const response = await fetch(withProfile(`${API_BASE}/api/add-known-words`), {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -676,15 +718,80 @@ function resetImport() {
 document.addEventListener('DOMContentLoaded', function() {
     console.log('智能写字机Web界面已加载');
 
+    // 恢复上次选择的学生
+    document.getElementById('profile-id').value = currentProfile;
+
     // 检测后端功能可用性
     checkBackendFeatures();
 });
 
+// 将整本单词书上传到服务器导入（文件直接作为请求体发送，不在浏览器中解析）
+async function importWordBook() {
+    const fileInput = document.getElementById('word-book-file');
+    const file = fileInput.files[0];
+
+    if (!file) {
+        showNotification('请选择单词书文件', 'error');
+        return;
+    }
+
+    const progressDiv = document.getElementById('word-book-progress');
+    progressDiv.style.display = 'block';
+    progressDiv.textContent = '正在上传...';
+
+    try {
+        const response = await fetch(
+            withProfile(`${API_BASE}/api/import-words/upload?filename=${encodeURIComponent(file.name)}`),
+            {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/octet-stream'
+                },
+                body: file
+            }
+        );
+
+        const data = await response.json();
+
+        if (!data.success) {
+            progressDiv.textContent = '';
+            showNotification(data.error || '上传失败', 'error');
+            return;
+        }
+
+        pollImportTask(data.task_id, progressDiv);
+    } catch (error) {
+        progressDiv.textContent = '';
+        showNotification('网络错误：' + error.message, 'error');
+    }
+}
+
+// 轮询导入任务进度
+async function pollImportTask(taskId, progressDiv) {
+    try {
+        const response = await fetch(`${API_BASE}/api/task-status/${taskId}`);
+        const status = await response.json();
+
+        if (status.status === 'running') {
+            progressDiv.textContent = `正在导入... 已处理 ${status.processed} 个单词（新增 ${status.added} 个）`;
+            setTimeout(() => pollImportTask(taskId, progressDiv), 1000);
+        } else if (status.status === 'completed') {
+            progressDiv.textContent = status.message;
+            showNotification(status.message, 'success');
+        } else {
+            progressDiv.textContent = '';
+            showNotification('导入失败：' + (status.error || '未知错误'), 'error');
+        }
+    } catch (error) {
+        showNotification('网络错误：' + error.message, 'error');
+    }
+}
+
 // 检测后端功能
 async function checkBackendFeatures() {
     try {
         // 尝试调用一个简单的API来检测后端是否可用
-        const response = await fetch(`${API_BASE}/api/get-known-words`, {
+        const response = await fetch(`${API_BASE}/api/known-words?limit=1`, {
             method: 'GET',
             timeout: 2000
         });
@@ -865,7 +972,7 @@ async function submitCardResults() {
     const wordsToAdd = unknownWordsInCard.map(item => item.word);
 
     try {
-        const response = await fetch(`${API_BASE}/api/add-known-words`, {
+        const response = await fetch(withProfile(`${API_BASE}/api/add-known-words`), {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -902,6 +1009,209 @@ async function submitCardResults() {
     }
 }
 
+// ==================== 已知单词（虚拟列表） ====================
+
+const KNOWN_WORDS_ROW_HEIGHT = 44;   // 与 .virtual-list .word-item 的高度一致
+const KNOWN_WORDS_PAGE_SIZE = 200;
+const KNOWN_WORDS_OVERSCAN = 10;     // 可见区域上下额外渲染的行数
+
+let knownWordsState = {
+    items: [],          // 已加载的单词（按添加时间倒序）
+    total: 0,           // 符合条件的单词总数
+    nextCursor: null,   // 下一页游标
+    prefix: '',
+    version: null,      // 已同步到的数据版本号
+    loading: false,
+    generation: 0       // 搜索条件变化时递增，丢弃过期的响应
+};
+let knownWordsSearchTimer = null;
+
+// 加载已知单词（reset=true 时从第一页开始）
+async function loadKnownWords(reset = false) {
+    const state = knownWordsState;
+
+    if (reset) {
+        state.generation += 1;
+        state.items = [];
+        state.total = 0;
+        state.nextCursor = null;
+        state.version = null;
+        state.loading = false;
+        document.getElementById('known-words-list').scrollTop = 0;
+    } else if (state.loading || !state.nextCursor) {
+        return;
+    }
+
+    const generation = state.generation;
+    state.loading = true;
+
+    const params = new URLSearchParams({
+        prefix: state.prefix,
+        limit: KNOWN_WORDS_PAGE_SIZE
+    });
+    if (state.nextCursor) {
+        params.set('cursor', state.nextCursor);
+    }
+
+    try {
+        const response = await fetch(withProfile(`${API_BASE}/api/known-words?${params}`));
+        const data = await response.json();
+
+        if (generation !== state.generation) {
+            return;
+        }
+
+        if (data.success) {
+            state.items.push(...data.words);
+            state.nextCursor = data.next_cursor;
+            if (data.total !== undefined) {
+                state.total = data.total;
+                state.version = data.version;
+            }
+        } else {
+            state.nextCursor = null;
+            showNotification(data.error || '加载已知单词失败', 'error');
+        }
+    } catch (error) {
+        state.nextCursor = null;
+        showNotification('网络错误：' + error.message, 'error');
+    } finally {
+        if (generation === state.generation) {
+            state.loading = false;
+            renderKnownWords();
+        }
+    }
+}
+
+// 只渲染可见区域内的行，滚动到未加载的位置时拉取下一页
+function renderKnownWords() {
+    const state = knownWordsState;
+    const container = document.getElementById('known-words-list');
+    const spacer = document.getElementById('known-words-spacer');
+
+    document.getElementById('known-words-count').textContent = `共 ${state.total} 个`;
+    spacer.style.height = `${state.total * KNOWN_WORDS_ROW_HEIGHT}px`;
+
+    const first = Math.max(0, Math.floor(container.scrollTop / KNOWN_WORDS_ROW_HEIGHT) - KNOWN_WORDS_OVERSCAN);
+    const last = Math.min(
+        state.total,
+        Math.ceil((container.scrollTop + container.clientHeight) / KNOWN_WORDS_ROW_HEIGHT) + KNOWN_WORDS_OVERSCAN
+    );
+
+    if (last > state.items.length && state.nextCursor && !state.loading) {
+        loadKnownWords();
+    }
+
+    const rows = [];
+    for (let i = first; i < Math.min(last, state.items.length); i++) {
+        const item = state.items[i];
+        rows.push(`
+            <div class="word-item" style="top: ${i * KNOWN_WORDS_ROW_HEIGHT}px">
+                <div class="word-item-content">
+                    <span class="word-item-word">${escapeHtml(item.word)}</span>
+                </div>
+                <span class="word-item-time">${escapeHtml(item.add_time || '')}</span>
+                <button class="btn btn-small btn-secondary" onclick="removeKnownWord(${i})">移除</button>
+            </div>
+        `);
+    }
+    spacer.innerHTML = rows.join('');
+}
+
+// 同步增量变化（没有加载过时加载第一页）
+async function syncKnownWords() {
+    const state = knownWordsState;
+
+    if (state.version === null) {
+        return loadKnownWords(true);
+    }
+
+    const generation = state.generation;
+    const params = new URLSearchParams({
+        since: state.version,
+        prefix: state.prefix
+    });
+
+    try {
+        const response = await fetch(withProfile(`${API_BASE}/api/known-words/changes?${params}`));
+        const data = await response.json();
+
+        if (generation !== state.generation) {
+            return;
+        }
+
+        if (!data.success || data.reset) {
+            return loadKnownWords(true);
+        }
+
+        applyKnownWordsChanges(data);
+    } catch (error) {
+        showNotification('网络错误：' + error.message, 'error');
+    }
+}
+
+// 应用增量变化：删除已移除的单词，新添加的单词放到最前面
+function applyKnownWordsChanges(data) {
+    const state = knownWordsState;
+    const prefix = state.prefix.toLowerCase();
+    const matches = word => !prefix || word.startsWith(prefix);
+
+    const removed = new Set(data.removed.filter(matches));
+    const added = data.added.filter(item => matches(item.word));
+    const addedWords = new Set(added.map(item => item.word));
+
+    state.items = state.items.filter(item => !removed.has(item.word) && !addedWords.has(item.word));
+    state.items.unshift(...added.reverse());
+    state.total = data.total;
+    state.version = data.version;
+
+    renderKnownWords();
+}
+
+// 搜索（防抖）
+function searchKnownWords() {
+    clearTimeout(knownWordsSearchTimer);
+    knownWordsSearchTimer = setTimeout(() => {
+        knownWordsState.prefix = document.getElementById('known-words-search').value.trim();
+        loadKnownWords(true);
+    }, 300);
+}
+
+// 移除已知单词
+async function removeKnownWord(index) {
+    const state = knownWordsState;
+    const item = state.items[index];
+    if (!item) {
+        return;
+    }
+
+    try {
+        const response = await fetch(withProfile(`${API_BASE}/api/remove-known-word`), {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ word: item.word })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            await syncKnownWords();
+        } else {
+            showNotification(data.error || '移除失败', 'error');
+        }
+    } catch (error) {
+        showNotification('网络错误：' + error.message, 'error');
+    }
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
 // ==================== 摄像头功能 ====================
 
 // 存储摄像头流
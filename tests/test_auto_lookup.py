@@ -0,0 +1,109 @@
+"""
+自动查单词流水线测试
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+import auto_lookup
+import occupancy
+from auto_lookup import Annotation, AutoLookup, OCRResult, PositionCalculator, TextExtractor
+from word_lookup import LookupResult
+
+
+class FakeExtractor(TextExtractor):
+    """按固定文本行返回OCR结果"""
+
+    def __init__(self, lines, unwarper=None):
+        self.lines = lines
+        self.unwarper = unwarper
+        self.calls = []
+
+    def iter_text(self, image, unwarp=True):
+        self.calls.append((image.shape, unwarp))
+        for i, text in enumerate(self.lines):
+            y = 40 + i * 40
+            bbox = [[20, y], [600, y], [600, y + 20], [20, y + 20]]
+            yield OCRResult(text, bbox, 0.9, (310.0, y + 10.0))
+
+
+class FakeLookup:
+    """返回以单词本身构造的音标和释义"""
+
+    def __init__(self):
+        self.queries = []
+
+    def lookup(self, word, context=None):
+        self.queries.append(word)
+        return LookupResult(success=True, word=word, phonetic=f"/{word}/", definitions=[f"def of {word}"])
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = str(tmp_path / "page.png")
+    cv2.imwrite(path, np.full((400, 700, 3), 255, np.uint8))
+    return path
+
+
+def test_words_sharing_a_lemma_get_their_own_lookup(tmp_path, page, monkeypatch):
+    # 让两个不同的单词得到同一个词元（模拟词元规则把 evening 归到 even）
+    monkeypatch.setattr(auto_lookup, 'lemmatize', lambda word: 'glimmer' if word.startswith('glimmer') else word)
+
+    word_lookup = FakeLookup()
+    lookup = AutoLookup(
+        known_words_db=str(tmp_path / "known_words.db"),
+        text_extractor=FakeExtractor(['glimmer', 'glimmering']),
+        word_lookup=word_lookup,
+        writer=object(),
+        skip_rank=0,
+        avoid_printed_text=False
+    )
+    gcode_path = str(tmp_path / "out.gcode")
+    assert lookup.process_exam_image(page, save_gcode_path=gcode_path)
+    lookup.known_words_db.close()
+
+    assert sorted(word_lookup.queries) == ['glimmer', 'glimmering']
+    with open(gcode_path, encoding='utf-8') as f:
+        gcode = f.read()
+    assert 'Writing: def of glimmer at' in gcode
+    assert 'Writing: def of glimmering at' in gcode
+
+
+class CropUnwarper:
+    """把页面裁掉一圈边缘（模拟透视矫正后尺寸变化）"""
+
+    def unwarp_image(self, image):
+        return image[20:-20, 20:-20].copy()
+
+
+def test_page_is_unwarped_once_before_ocr(tmp_path, page, monkeypatch):
+    occupancy_shapes = []
+    monkeypatch.setattr(
+        auto_lookup, 'OccupancyMap',
+        lambda image: occupancy_shapes.append(image.shape) or occupancy.OccupancyMap(image)
+    )
+    extractor = FakeExtractor(['glimmer'], unwarper=CropUnwarper())
+    lookup = AutoLookup(
+        known_words_db=str(tmp_path / "known_words.db"),
+        text_extractor=extractor,
+        word_lookup=FakeLookup(),
+        writer=object(),
+        skip_rank=0
+    )
+    assert lookup.process_exam_image(page)
+    lookup.known_words_db.close()
+
+    assert extractor.calls == [((360, 660, 3), False)]
+    assert occupancy_shapes == [(360, 660, 3)]
+
+
+def test_unresolved_annotation_on_print_is_reported():
+    calculator = PositionCalculator()
+    annotation = Annotation('glimmer', (50.0, 50.0), False)
+    calculator.avoid_overlap([annotation], bounds=(100.0, 100.0), free_space=lambda box: False)
+
+    assert annotation.position == (50.0, 50.0)
+    assert annotation.on_print
+    assert calculator.last_overlap_stats['unresolved'] == 1
+    assert calculator.last_overlap_stats['on_print'] == 1
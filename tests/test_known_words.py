@@ -0,0 +1,43 @@
+"""
+已知单词数据库测试
+"""
+
+import pytest
+
+from auto_lookup import KnownWordsDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = KnownWordsDatabase(str(tmp_path / "known_words.db"))
+    yield database
+    database.close()
+
+
+def test_add_words_counts_new_words(db):
+    assert db.add_words(['apple', 'banana', 'cherry']) == {'added': 3, 'skipped': 0}
+
+
+def test_add_words_counts_existing_and_duplicate_words(db):
+    db.add_words(['apple'])
+    result = db.add_words(['apple', 'Banana', 'banana', ' cherry ', ''])
+    assert result == {'added': 2, 'skipped': 2}
+    assert db.count_words() == 3
+
+
+def test_rebuild_bloom_keeps_in_memory_sets_without_bloom(db):
+    db.add_words(['apple'])
+    db.rebuild_bloom()
+    assert db.is_known('apple')
+    assert not db.is_known('banana')
+
+
+def test_rebuild_bloom_with_bloom(tmp_path):
+    database = KnownWordsDatabase(str(tmp_path / "known_words.db"), use_bloom=True)
+    try:
+        database.add_words(['apple'])
+        database.rebuild_bloom()
+        assert database.is_known('apple')
+        assert not database.is_known('banana')
+    finally:
+        database.close()
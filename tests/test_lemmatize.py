@@ -0,0 +1,101 @@
+"""
+词形还原测试
+"""
+
+import pytest
+
+import word_lookup
+from auto_lookup import KnownWordsDatabase
+from word_lookup import lemmatize
+
+# 看起来像变化形式、实际是独立单词的词
+_STANDALONE = ['evening', 'news', 'morning', 'during']
+
+
+@pytest.fixture
+def rules_only(monkeypatch):
+    """强制使用后缀规则（与是否安装WordNet无关）"""
+    monkeypatch.setattr(word_lookup, '_get_shared_lemmatizer', lambda: None)
+
+
+@pytest.mark.parametrize('word', _STANDALONE)
+def test_standalone_words_are_not_merged(word):
+    assert lemmatize(word) == word
+
+
+@pytest.mark.parametrize('word', _STANDALONE + ['hundred', 'sacred'])
+def test_rule_lemma_keeps_words_without_lexicon_base(rules_only, word):
+    assert lemmatize(word) == word
+
+
+@pytest.fixture
+def wordnet_only():
+    """要求WordNet可用（未安装NLTK或缺少WordNet数据时跳过）"""
+    pytest.importorskip('nltk')
+    if word_lookup._get_shared_lemmatizer() is None:
+        pytest.skip('WordNet数据不可用')
+
+
+_INFLECTIONS = [
+    ('decided', 'decide'),
+    ('deciding', 'decide'),
+    ('decides', 'decide'),
+    ('stopped', 'stop'),
+    ('abandoned', 'abandon'),
+    ('playing', 'play'),
+    ('studies', 'study'),
+    ('boxes', 'box'),
+    ('apples', 'apple'),
+    ('went', 'go'),
+]
+
+
+@pytest.mark.parametrize('word, lemma', _INFLECTIONS + [
+    ('interested', 'interest'),
+    ('building', 'build'),
+])
+def test_wordnet_lemma_prefers_verb_base(wordnet_only, word, lemma):
+    assert lemmatize(word) == lemma
+
+
+@pytest.mark.parametrize('word, lemma', _INFLECTIONS + [
+    ('hoped', 'hope'),
+    ('hopped', 'hop'),
+])
+def test_rule_lemma_returns_dictionary_form(rules_only, word, lemma):
+    assert lemmatize(word) == lemma
+
+
+def test_rule_lemma_matches_rare_known_base(rules_only, tmp_path):
+    db = KnownWordsDatabase(str(tmp_path / "known_words.db"))
+    try:
+        db.add_words(['perplex'])
+        assert db.is_known('perplexed')
+        assert db.is_known('perplexing')
+        assert not db.is_known('perplexity')
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize('use_bloom', [False, True])
+def test_inflections_of_known_word_are_known(tmp_path, use_bloom):
+    db = KnownWordsDatabase(str(tmp_path / "known_words.db"), use_bloom=use_bloom)
+    try:
+        db.add_words(['decide'])
+        assert db.is_known('decided')
+        assert db.is_known('deciding')
+        assert db.is_known('decides')
+    finally:
+        db.close()
+
+
+def test_known_base_word_does_not_hide_standalone_word(tmp_path):
+    db = KnownWordsDatabase(str(tmp_path / "known_words.db"))
+    try:
+        db.add_words(['even', 'new', 'morn', 'apple'])
+        assert not db.is_known('evening')
+        assert not db.is_known('news')
+        assert not db.is_known('morning')
+        assert db.is_known('apples')
+    finally:
+        db.close()
@@ -0,0 +1,36 @@
+"""
+写字模块测试
+"""
+
+import re
+
+import pytest
+
+from writer import GlyphCache, WriterMachine
+
+_COORD = re.compile(r'^G[01] X(-?[\d.]+) Y(-?[\d.]+)', re.M)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    return WriterMachine(glyph_cache=GlyphCache(cache_dir=str(tmp_path)))
+
+
+@pytest.mark.parametrize('text', [
+    'abandon',
+    'the quick brown fox jumps over the lazy dog and more words here',
+])
+def test_cached_gcode_stays_in_work_area(writer, text):
+    gcode = writer.write_text(text)
+    coords = [(float(x), float(y)) for x, y in _COORD.findall(gcode)]
+    assert coords
+    for x, y in coords:
+        assert 0 <= x <= writer.work_area_width
+        assert 0 <= y <= writer.work_area_height
+
+
+def test_compose_text_fits_canvas(writer):
+    paths = writer.compose_text('x' * 200)
+    for path in paths:
+        assert path[:, 0].min() >= 0 and path[:, 0].max() <= writer.CANVAS_WIDTH
+        assert path[:, 1].min() >= 0 and path[:, 1].max() <= writer.CANVAS_HEIGHT
@@ -132,6 +132,164 @@ def validate_json_file(file_path):
         return False, f"解析JSON时发生未知错误: {e}", None
 
 
+# 流式读取时每次读取的字符数
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def detect_encoding(file_path, sample_size=64 * 1024):
+    """
+    检测文件编码（与 validate_json_file 一致：优先UTF-8，失败时使用GBK）
+
+    Args:
+        file_path: 文件路径
+        sample_size: 用于检测的字节数
+
+    Returns:
+        编码名称
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    try:
+        # 采样可能截断多字节字符，只要求末尾之前的内容能够解码
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:
+            return 'gbk'
+    return 'utf-8'
+
+
+def detect_format(file_path, encoding=None):
+    """
+    检测单词文件格式（只读取文件开头，不加载整个文件）
+
+    Args:
+        file_path: 文件路径
+        encoding: 文件编码（默认自动检测）
+
+    Returns:
+        'array'（JSON数组）、'jsonl'（JSON Lines）、'object'（单个JSON对象）或 None（无法识别）
+    """
+    encoding = encoding or detect_encoding(file_path)
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        for line in f:
+            line = line.lstrip('\ufeff').strip()
+
+            # 跳过空行和注释
+            if not line or line.startswith('//') or line.startswith('#'):
+                continue
+
+            if line.startswith('['):
+                return 'array'
+            if not line.startswith('{'):
+                return None
+
+            # 第一行本身就是完整的对象，按 JSON Lines 处理（单行对象同样适用）
+            try:
+                json.loads(line)
+                return 'jsonl'
+            except json.JSONDecodeError:
+                return 'object'
+
+    return None
+
+
+def _iter_json_array(f):
+    """从文件对象中逐个解析JSON数组的元素"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # 跳过空白和分隔符
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,\ufeff':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                eof = True
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        if pos >= len(buffer):
+            return
+
+        if not started:
+            if buffer[pos] != '[':
+                raise ValueError("不是JSON数组")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == ']':
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 元素被截断，继续读取
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                raise
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        yield obj
+        pos = end
+
+
+def iter_word_records(file_path, stats=None):
+    """
+    流式读取单词文件中的单词对象（只返回包含headWord的对象）
+
+    Args:
+        file_path: 文件路径
+        stats: 可选的统计字典，会更新 'format'、'errors'（解析失败的行数）
+
+    Yields:
+        单词对象字典
+    """
+    if stats is None:
+        stats = {}
+    encoding = detect_encoding(file_path)
+    file_format = detect_format(file_path, encoding)
+    stats['format'] = file_format
+    stats.setdefault('errors', 0)
+
+    if file_format is None:
+        raise ValueError("无法识别的文件格式（需要JSON数组、JSON对象或JSON Lines）")
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        if file_format == 'jsonl':
+            for line in f:
+                line = line.lstrip('\ufeff').strip()
+                if not line or line.startswith('//') or line.startswith('#'):
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    stats['errors'] += 1
+                    continue
+                if isinstance(obj, dict) and 'headWord' in obj:
+                    yield obj
+
+        elif file_format == 'array':
+            for obj in _iter_json_array(f):
+                if isinstance(obj, dict) and 'headWord' in obj:
+                    yield obj
+
+        else:
+            obj = json.loads(f.read().lstrip('\ufeff'))
+            if isinstance(obj, dict) and 'headWord' in obj:
+                yield obj
+
+
 def fix_json_file(input_path, output_path=None):
     """
     尝试修复JSON文件
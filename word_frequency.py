@@ -0,0 +1,104 @@
+"""
+词频排名模块 - 按英语词频跳过简单词
+
+词频表随项目提供（databases/word_frequency.txt），每行一个单词，
+按常见程度排序，行号即排名（1为最常见）。进程内只加载一次，
+之后每次查询只是一次字典查找。
+
+每个学生可以设置一个跳过阈值N：排名在前N位的单词视为简单词，
+在已知单词判断和查词之前直接跳过，既减少每页的处理量，
+也避免写字机去标注过于简单的单词。
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+DEFAULT_FREQUENCY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      'databases', 'word_frequency.txt')
+
+
+class WordFrequencyTable:
+    """英语词频排名表"""
+
+    def __init__(self, path: str = DEFAULT_FREQUENCY_PATH):
+        """
+        加载词频排名表
+
+        Args:
+            path: 排名表路径（每行一个单词，#开头的行为注释）
+
+        Raises:
+            OSError: 文件无法读取
+        """
+        self.path = path
+        ranks: Dict[str, int] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                word = line.strip().lower()
+                if not word or word.startswith('#'):
+                    continue
+                # 重复出现时保留较高的排名
+                ranks.setdefault(word, len(ranks) + 1)
+        self._ranks = ranks
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def rank(self, word: str, lemma: Optional[str] = None) -> Optional[int]:
+        """
+        查询单词的词频排名
+
+        同时给出词元时取两者中较高的排名，
+        这样 decided 与 decide 一样被视为常见词。
+
+        Args:
+            word: 单词（小写）
+            lemma: 单词的词元（可选）
+
+        Returns:
+            排名（1为最常见），不在表中时返回None
+        """
+        rank = self._ranks.get(word)
+        if lemma is not None and lemma != word:
+            lemma_rank = self._ranks.get(lemma)
+            if lemma_rank is not None and (rank is None or lemma_rank < rank):
+                rank = lemma_rank
+        return rank
+
+    def is_easy(self, word: str, max_rank: int, lemma: Optional[str] = None) -> bool:
+        """
+        判断单词是否为简单词（排名在前 max_rank 位）
+
+        Args:
+            word: 单词（小写）
+            max_rank: 跳过阈值（0表示不跳过）
+            lemma: 单词的词元（可选）
+
+        Returns:
+            是否为简单词
+        """
+        if max_rank <= 0:
+            return False
+        rank = self.rank(word, lemma)
+        return rank is not None and rank <= max_rank
+
+
+_default_table: Optional[WordFrequencyTable] = None
+_default_lock = threading.Lock()
+
+
+def get_frequency_table() -> WordFrequencyTable:
+    """
+    获取进程内共享的词频排名表（首次调用时加载）
+
+    Returns:
+        WordFrequencyTable
+    """
+    global _default_table
+    if _default_table is None:
+        with _default_lock:
+            if _default_table is None:
+                _default_table = WordFrequencyTable()
+                print(f"✓ 已加载词频排名表（{len(_default_table)} 个单词）")
+    return _default_table
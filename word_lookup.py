@@ -1,10 +1,18 @@
 import sqlite3
 import os
 import re
+import sys
+import json
+import time
+import argparse
+import threading
+from html import unescape
 from html.parser import HTMLParser
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Set, TextIO
 from dataclasses import dataclass, field
-from collections import Counter
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout
 import math
 import hashlib
 import pickle
@@ -16,7 +24,7 @@ try:
     NLTK_AVAILABLE = True
 except ImportError:
     NLTK_AVAILABLE = False
-    print("警告: nltk未安装，词形还原功能将不可用。请运行 'pip install nltk' 来启用此功能。")
+    print("警告: nltk未安装，词形还原功能将不可用。请运行 'pip install nltk' 来启用此功能。", file=sys.stderr)
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -24,8 +32,8 @@ try:
     SENTENCE_TRANSFORMER_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMER_AVAILABLE = False
-    print("提示: sentence-transformers未安装，将使用基础匹配算法。")
-    print("要启用智能语义匹配，请运行: pip install sentence-transformers torch")
+    print("提示: sentence-transformers未安装，将使用基础匹配算法。", file=sys.stderr)
+    print("要启用智能语义匹配，请运行: pip install sentence-transformers torch", file=sys.stderr)
 
 
 @dataclass
@@ -40,6 +48,60 @@ class WordEntry:
     pos: Optional[str] = None  # Part of Speech (词性)
 
 
+def _intern_all(values: List[str]) -> Tuple[str, ...]:
+    """将字符串列表转换为驻留字符串元组"""
+    return tuple(sys.intern(value) for value in values)
+
+
+class CompactWordEntry:
+    """
+    紧凑的单词条目（用于缓存）
+
+    使用 __slots__ 和驻留字符串元组存储，避免为每个缓存条目保留
+    dataclass 实例字典和多个可变列表。通过 to_entry() 还原为 WordEntry。
+    """
+
+    __slots__ = ('headword', 'phonetics', 'definitions', 'chinese_definitions',
+                 'examples', 'base_form', 'pos')
+
+    def __init__(self, headword: str, phonetics: Tuple[str, ...] = (),
+                 definitions: Tuple[str, ...] = (), chinese_definitions: Tuple[str, ...] = (),
+                 examples: Tuple[str, ...] = (), base_form: Optional[str] = None,
+                 pos: Optional[str] = None):
+        self.headword = headword
+        self.phonetics = phonetics
+        self.definitions = definitions
+        self.chinese_definitions = chinese_definitions
+        self.examples = examples
+        self.base_form = base_form
+        self.pos = pos
+
+    @classmethod
+    def from_entry(cls, entry: WordEntry) -> 'CompactWordEntry':
+        """由 WordEntry 构建紧凑条目"""
+        return cls(
+            headword=sys.intern(entry.headword),
+            phonetics=_intern_all(entry.phonetics),
+            definitions=_intern_all(entry.definitions),
+            chinese_definitions=_intern_all(entry.chinese_definitions),
+            examples=_intern_all(entry.examples),
+            base_form=sys.intern(entry.base_form) if entry.base_form else entry.base_form,
+            pos=sys.intern(entry.pos) if entry.pos else entry.pos
+        )
+
+    def to_entry(self) -> WordEntry:
+        """还原为 WordEntry（每次返回新的列表，调用方可以自由修改）"""
+        return WordEntry(
+            headword=self.headword,
+            phonetics=list(self.phonetics),
+            definitions=list(self.definitions),
+            chinese_definitions=list(self.chinese_definitions),
+            examples=list(self.examples),
+            base_form=self.base_form,
+            pos=self.pos
+        )
+
+
 @dataclass
 class LookupResult:
     """查词结果数据类"""
@@ -139,9 +201,12 @@ class MDXParser(HTMLParser):
         self.just_finished_def = False
 
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._start_element(tag, dict(attrs).get('class', ''))
+
+    def _start_element(self, tag: str, css_class: Optional[str]):
+        """处理开始标签（只依赖标签名和class属性）"""
         self.current_tag = tag
-        attrs_dict = dict(attrs)
-        self.current_class = attrs_dict.get('class', '')
+        self.current_class = css_class
 
         if tag == 'div' and 'entry' in self.current_class:
             self._save_current_entry()
@@ -186,7 +251,7 @@ class MDXParser(HTMLParser):
             self.in_base_form = True
             self.capture_text = True
 
-        elif tag == 'a' and 'Ref' in attrs_dict.get('class', ''):
+        elif tag == 'a' and 'Ref' in self.current_class:
             self.capture_text = False
 
     def handle_endtag(self, tag: str):
@@ -278,36 +343,333 @@ class MDXParser(HTMLParser):
         return self.entries if self.entries else []
 
 
+class FastMDXParser(MDXParser):
+    """
+    基于正则分词的MDX解析器
+
+    用一个预编译正则一次切出所有标签和文本，只提取class属性，
+    直接驱动 MDXParser 的状态机，省去 HTMLParser 逐标签解析属性的开销。
+    遇到注释、脚本、不规范的标签等情况时，整篇回退到 MDXParser，
+    保证两者产生完全相同的 WordEntry 列表。
+    """
+
+    # 结束标签 / 开始标签（含自闭合）
+    _TAG_RE = re.compile(
+        r'<(?:/\s*([a-zA-Z][-.a-zA-Z0-9:_]*)\s*'
+        r'|([a-zA-Z][-.a-zA-Z0-9:_]*)'
+        r'((?:\s+[^\s/>"\'=<]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s"\'=<>`]+))?)*)'
+        r'\s*(/?))>'
+    )
+    _ATTR_RE = re.compile(
+        r'([^\s/>"\'=<]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+)))?'
+    )
+    _CHARREF_END_RE = re.compile(r'[\s;]')
+    # HTMLParser 会按原始文本处理其内容的标签
+    _CDATA_TAGS = ('script', 'style')
+
+    def _extract_class(self, attrs: str) -> Optional[str]:
+        """从属性文本中提取class（与 dict(attrs).get('class', '') 一致）"""
+        if not attrs or 'class' not in attrs.lower():
+            return ''
+
+        css_class = ''
+        for match in self._ATTR_RE.finditer(attrs):
+            if match.group(1).lower() != 'class':
+                continue
+            value = match.group(2)
+            if value is None:
+                value = match.group(3)
+            if value is None:
+                value = match.group(4)
+            if value is None:
+                # 无值的class属性，交给 HTMLParser 处理
+                return None
+            css_class = unescape(value) if '&' in value else value
+        return css_class
+
+    def _feed_fast(self, html_content: str) -> bool:
+        """
+        快速解析
+
+        Returns:
+            是否成功（False 表示需要回退到 HTMLParser）
+        """
+        start_element = self._start_element
+        handle_endtag = self.handle_endtag
+        handle_data = self.handle_data
+        cdata_tags = self._CDATA_TAGS
+
+        pos = 0
+        for match in self._TAG_RE.finditer(html_content):
+            start = match.start()
+            if start > pos:
+                data = html_content[pos:start]
+                if '<' in data:
+                    return False
+                handle_data(unescape(data) if '&' in data else data)
+            pos = match.end()
+
+            end_tag = match.group(1)
+            if end_tag is not None:
+                handle_endtag(end_tag.lower())
+                continue
+
+            tag = match.group(2).lower()
+            if tag in cdata_tags:
+                return False
+            css_class = self._extract_class(match.group(3))
+            if css_class is None:
+                return False
+
+            start_element(tag, css_class)
+            if match.group(4):
+                handle_endtag(tag)
+
+        # 结尾文本：与 HTMLParser.feed 一致，疑似未结束的字符引用会被保留不输出
+        if pos < len(html_content):
+            data = html_content[pos:]
+            if '<' in data:
+                return False
+            amppos = data.rfind('&', max(0, len(data) - 34))
+            if amppos < 0 or self._CHARREF_END_RE.search(data, amppos):
+                handle_data(unescape(data) if '&' in data else data)
+
+        return True
+
+    def parse(self, html_content: str) -> List[WordEntry]:
+        """解析HTML内容，返回单词条目列表"""
+        if html_content.startswith('@@@LINK=') or '<!' in html_content or '<?' in html_content:
+            return super().parse(html_content)
+
+        self.entries = []
+        self._init_current_entry()
+        self.__dict__.pop('current_data', None)
+
+        if not self._feed_fast(html_content):
+            self.__dict__.pop('current_data', None)
+            return super().parse(html_content)
+
+        # 处理最后一个条目
+        self._save_current_entry()
+
+        return self.entries if self.entries else []
+
+
+# 常见不规则变化形式 -> 原形
+IRREGULAR_FORMS = {
+    'ran': 'run', 'bit': 'bite', 'ate': 'eat', 'drove': 'drive',
+    'saw': 'see', 'fell': 'fall', 'gave': 'give', 'knew': 'know',
+    'thought': 'think', 'threw': 'throw', 'came': 'come', 'went': 'go',
+    'bought': 'buy', 'brought': 'bring', 'caught': 'catch',
+    'fought': 'fight', 'taught': 'teach', 'sought': 'seek',
+    'bent': 'bend', 'bound': 'bind', 'built': 'build',
+    'dealt': 'deal', 'felt': 'feel', 'held': 'hold',
+    'kept': 'keep', 'led': 'lead', 'lost': 'lose',
+    'meant': 'mean', 'paid': 'pay', 'sold': 'sell',
+    'sent': 'send', 'spent': 'spend', 'stood': 'stand',
+    'understood': 'understand', 'won': 'win', 'wound': 'wind',
+    'does': 'do'
+}
+
+# 看起来像变化形式、实际是独立单词的常见词（不做词形还原）
+NON_INFLECTED_FORMS = frozenset({
+    'evening', 'morning', 'during', 'nothing', 'something', 'anything', 'everything',
+    'thing', 'things', 'ceiling', 'wedding', 'pudding', 'sibling', 'darling',
+    'news', 'means', 'series', 'species', 'physics', 'mathematics', 'economics',
+    'politics', 'always', 'perhaps', 'lens', 'wicked', 'naked', 'sacred', 'hundred'
+})
+
+# 词形还原时依次尝试的词性（动词 > 名词 > 形容词）
+_LEMMA_POS_ORDER = ('v', 'n', 'a')
+
+_shared_lemmatizer = None
+_shared_lemmatizer_checked = False
+# NLTK的WordNet语料在首次访问时才加载，之后的查询共用同一组数据文件句柄
+# （seek + readline），加载和查询都不是线程安全的，多个查词线程需要串行访问
+_wordnet_lock = threading.RLock()
+
+
+def _get_shared_lemmatizer() -> Optional['WordNetLemmatizer']:
+    """获取进程内共享的WordNet词形还原器（WordNet数据不可用时返回None）"""
+    global _shared_lemmatizer, _shared_lemmatizer_checked
+    if not _shared_lemmatizer_checked:
+        with _wordnet_lock:
+            if not _shared_lemmatizer_checked:
+                if NLTK_AVAILABLE:
+                    try:
+                        wordnet.synsets('test')
+                        _shared_lemmatizer = WordNetLemmatizer()
+                    except LookupError:
+                        _shared_lemmatizer = None
+                _shared_lemmatizer_checked = True
+    return _shared_lemmatizer
+
+
+def lemmatizer_name() -> str:
+    """
+    当前使用的词形还原方法
+
+    Returns:
+        'wordnet-3' 或 'rules-2'（已存储的词元需要用同一种方法计算才能比对，
+        规则变化时递增版本号，已有词库会重新计算词元）
+    """
+    return 'wordnet-3' if _get_shared_lemmatizer() else 'rules-2'
+
+
+def _in_lexicon(word: str) -> bool:
+    """单词是否在词表中（使用随项目提供的词频排名表）"""
+    try:
+        from word_frequency import get_frequency_table
+        return get_frequency_table().rank(word) is not None
+    except OSError:
+        return False
+
+
+def _is_cvc(base: str) -> bool:
+    """词干是否以 辅音-元音-辅音 结尾（hop/decid 这类词干去掉的通常是不发音的e）"""
+    vowels = 'aeiou'
+    return (
+        len(base) >= 3
+        and base[-1] not in vowels + 'wxy'
+        and base[-2] in vowels
+        and base[-3] not in vowels
+    )
+
+
+def _rule_candidates(word: str) -> List[str]:
+    """按后缀规则列出可能的原形（按优先顺序）"""
+    if len(word) > 4 and word.endswith(('ies', 'ied')):
+        return [word[:-3] + 'y', word[:-1]]
+
+    if len(word) > 5 and word.endswith('ing'):
+        base = word[:-3]
+    elif len(word) > 4 and word.endswith('ed'):
+        base = word[:-2]
+    elif len(word) > 4 and word.endswith(('ches', 'shes', 'sses', 'xes', 'zes')):
+        return [word[:-2], word[:-1]]
+    elif len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return [word[:-1], word[:-2]] if word.endswith('es') else [word[:-1]]
+    else:
+        return []
+
+    # hoped -> hope 而 hopped -> hop：辅音-元音-辅音结尾的词干优先补回e
+    candidates = [base + 'e', base] if _is_cvc(base) else [base, base + 'e']
+    # 去掉后缀后的双写辅音（stopped -> stop）
+    if len(base) > 2 and base[-1] == base[-2] and base[-1] not in 'aeiouls':
+        candidates.append(base[:-1])
+    return candidates
+
+
+def _rule_lemma(word: str) -> str:
+    """
+    基于后缀规则的词元（无WordNet时使用）
+
+    去掉后缀后的形式（或补回e、把i改回y后的形式）必须在词表中才采用，
+    否则保留单词本身，避免 during -> dur、morning -> morn 这类误合并。
+    """
+    for candidate in _rule_candidates(word):
+        if _in_lexicon(candidate):
+            return candidate
+    return word
+
+
+def lemma_candidates(word: str) -> List[str]:
+    """
+    按后缀规则列出单词可能的原形（不检查词表，只在没有WordNet时使用）
+
+    词表只收录常见词，perplexed 这类较少见单词的原形不在其中，
+    已知单词匹配时还会用这些候选去比对学生词库中已有的单词和词元。
+
+    Args:
+        word: 小写单词
+
+    Returns:
+        候选原形列表（使用WordNet或单词在 NON_INFLECTED_FORMS 中时为空）
+    """
+    if word in NON_INFLECTED_FORMS or _get_shared_lemmatizer() is not None:
+        return []
+    return _rule_candidates(word)
+
+
+def lemmatize(word: str) -> str:
+    """
+    计算单词的词元（用于已知单词匹配，不依赖词典数据库）
+
+    NON_INFLECTED_FORMS 中的单词保持不变，
+    这样 evening 不会被归到 even，news 不会被归到 new。
+
+    Args:
+        word: 单词
+
+    Returns:
+        小写词元
+    """
+    word = word.strip().lower()
+    if not word or word in NON_INFLECTED_FORMS:
+        return word
+
+    irregular = IRREGULAR_FORMS.get(word)
+    if irregular is not None:
+        return irregular
+
+    lemmatizer = _get_shared_lemmatizer()
+    if lemmatizer is None:
+        return _rule_lemma(word)
+
+    with _wordnet_lock:
+        for pos in _LEMMA_POS_ORDER:
+            lemma = lemmatizer.lemmatize(word, pos)
+            if lemma != word:
+                return lemma
+    return word
+
+
 class WordLookup:
     """单词查询类 - 支持智能语义匹配"""
 
     # 默认模型名称（轻量级，速度快）
     DEFAULT_MODEL = 'all-MiniLM-L6-v2'
 
-    def __init__(self, use_semantic_search: bool = True, model_name: str = None):
+    # 默认缓存的词条数量
+    DEFAULT_ENTRY_CACHE_SIZE = 50000
+
+    def __init__(self, use_semantic_search: bool = True, model_name: str = None,
+                 db_path: Optional[str] = None, fast_parser: bool = True,
+                 entry_cache_size: int = DEFAULT_ENTRY_CACHE_SIZE):
         self.db_dir = os.path.join(os.path.dirname(__file__), 'databases')
-        self.word_details_path = os.path.join(self.db_dir, 'word_details.db')
+        self.word_details_path = db_path or os.path.join(self.db_dir, 'word_details.db')
         self.lemmatizer = self._init_lemmatizer()
 
+        # 默认使用快速解析器（无法快速解析的条目会自动回退到HTMLParser）
+        self.parser_class = FastMDXParser if fast_parser else MDXParser
+
+        # 已解析词条缓存（LRU）：单词 -> 紧凑条目元组，为0时禁用
+        self.entry_cache_size = entry_cache_size
+        self.entry_cache: 'OrderedDict[str, Tuple[CompactWordEntry, ...]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         # 初始化语义模型
         self.use_semantic_search = use_semantic_search and SENTENCE_TRANSFORMER_AVAILABLE
         self.model_name = model_name or self.DEFAULT_MODEL
         self.semantic_model = None
         self.embedding_cache = {}
+        # 向量缓存在并发查词的线程间共享
+        self._embedding_lock = threading.Lock()
 
         if self.use_semantic_search:
             self._init_semantic_model()
 
-    def _init_lemmatizer(self) -> Optional[WordNetLemmatizer]:
+    def _init_lemmatizer(self) -> Optional['WordNetLemmatizer']:
         """初始化词形还原器"""
         if not NLTK_AVAILABLE:
             return None
 
         try:
             lemmatizer = WordNetLemmatizer()
-            # 验证WordNet数据是否可用
+            # 验证WordNet数据是否可用（同时完成语料加载，之后并发查词时不会再触发加载）
             try:
-                wordnet.synsets('test')
+                with _wordnet_lock:
+                    wordnet.synsets('test')
             except LookupError:
                 print("警告: 未找到WordNet数据，请运行以下命令安装:")
                 print("import nltk; nltk.download('wordnet'); nltk.download('omw-1.4')")
@@ -352,7 +714,7 @@ class WordLookup:
         return cache_dir / f'embeddings_{self.model_name.replace("-", "_")}.pkl'
 
     def _save_cache(self):
-        """保存向量缓存"""
+        """保存向量缓存（调用方持有向量缓存锁）"""
         try:
             cache_file = self._get_cache_file()
             with open(cache_file, 'wb') as f:
@@ -379,17 +741,20 @@ class WordLookup:
 
         # 检查缓存
         text_hash = self._get_text_hash(text)
-        if text_hash in self.embedding_cache:
-            return self.embedding_cache[text_hash]
+        with self._embedding_lock:
+            embedding = self.embedding_cache.get(text_hash)
+        if embedding is not None:
+            return embedding
 
-        # 计算新的向量
+        # 计算新的向量（不持有锁，多个线程可以同时计算）
         try:
             embedding = self.semantic_model.encode(text, convert_to_numpy=True)
-            self.embedding_cache[text_hash] = embedding
+            with self._embedding_lock:
+                self.embedding_cache[text_hash] = embedding
 
-            # 每100次计算保存一次缓存
-            if len(self.embedding_cache) % 100 == 0:
-                self._save_cache()
+                # 每100次计算保存一次缓存（持有锁，避免保存时字典被修改）
+                if len(self.embedding_cache) % 100 == 0:
+                    self._save_cache()
 
             return embedding
         except Exception as e:
@@ -487,18 +852,38 @@ class WordLookup:
 
     def parse_entry(self, html_content: str) -> List[WordEntry]:
         """解析HTML内容为单词条目"""
-        parser = MDXParser()
+        parser = self.parser_class()
         return parser.parse(html_content)
 
     def get_word_entries(self, word: str) -> List[WordEntry]:
-        """获取单词的所有条目"""
+        """获取单词的所有条目（优先读取已解析词条缓存）"""
+        with self._cache_lock:
+            cached = self.entry_cache.get(word)
+            if cached is not None:
+                self.entry_cache.move_to_end(word)
+        if cached is not None:
+            return [compact.to_entry() for compact in cached]
+
         html_contents = self.get_all_entries_html(word)
         entries = []
         for html_content in html_contents:
             parsed = self.parse_entry(html_content)
             entries.extend(parsed)
+
+        if self.entry_cache_size > 0:
+            compact = tuple(CompactWordEntry.from_entry(entry) for entry in entries)
+            with self._cache_lock:
+                self.entry_cache[word] = compact
+                while len(self.entry_cache) > self.entry_cache_size:
+                    self.entry_cache.popitem(last=False)
+
         return entries
 
+    def clear_cache(self):
+        """清空已解析词条缓存"""
+        with self._cache_lock:
+            self.entry_cache.clear()
+
     def get_base_form_from_db(self, word: str) -> Optional[str]:
         """从数据库获取单词的基本形式"""
         html_content = self.get_entry_html(word)
@@ -521,12 +906,14 @@ class WordLookup:
         # 尝试不同的词性进行词形还原
         pos_tags = ['n', 'v', 'a', 'r']
         for pos in pos_tags:
-            lemma = self.lemmatizer.lemmatize(word, pos)
+            with _wordnet_lock:
+                lemma = self.lemmatizer.lemmatize(word, pos)
             if lemma != word and not word_exists and self.word_exists(lemma):
                 return lemma
 
         # 默认词形还原
-        default_lemma = self.lemmatizer.lemmatize(word)
+        with _wordnet_lock:
+            default_lemma = self.lemmatizer.lemmatize(word)
         if default_lemma != word and not word_exists and self.word_exists(default_lemma):
             return default_lemma
 
@@ -537,23 +924,9 @@ class WordLookup:
         word_exists = self.word_exists(word)
 
         # 特殊不规则动词
-        special_cases = {
-            'ran': 'run', 'bit': 'bite', 'ate': 'eat', 'drove': 'drive',
-            'saw': 'see', 'fell': 'fall', 'gave': 'give', 'knew': 'know',
-            'thought': 'think', 'threw': 'throw', 'came': 'come', 'went': 'go',
-            'bought': 'buy', 'brought': 'bring', 'caught': 'catch',
-            'fought': 'fight', 'taught': 'teach', 'sought': 'seek',
-            'bent': 'bend', 'bound': 'bind', 'built': 'build',
-            'dealt': 'deal', 'felt': 'feel', 'held': 'hold',
-            'kept': 'keep', 'led': 'lead', 'lost': 'lose',
-            'meant': 'mean', 'paid': 'pay', 'sold': 'sell',
-            'sent': 'send', 'spent': 'spend', 'stood': 'stand',
-            'understood': 'understand', 'won': 'win', 'wound': 'wind'
-        }
-
         word_lower = word.lower()
-        if word_lower in special_cases:
-            base = special_cases[word_lower]
+        if word_lower in IRREGULAR_FORMS:
+            base = IRREGULAR_FORMS[word_lower]
             if not word_exists and self.word_exists(base):
                 return base
 
@@ -1173,8 +1546,227 @@ class WordLookup:
         return result
 
 
-def main():
-    """命令行交互界面"""
+# ==================== 批量查询 ====================
+
+# 每个工作进程持有自己的查词器
+_batch_lookup: Optional[WordLookup] = None
+
+
+def _init_batch_worker(use_semantic_search: bool, db_path: Optional[str]):
+    """
+    批量查询工作进程初始化：创建本进程专属的WordLookup
+
+    Args:
+        use_semantic_search: 是否启用语义匹配
+        db_path: 词典数据库路径
+    """
+    global _batch_lookup
+    # 工作进程的提示信息写到stderr，避免混入JSONL输出
+    sys.stdout = sys.stderr
+    _batch_lookup = WordLookup(use_semantic_search=use_semantic_search, db_path=db_path)
+
+
+def _lookup_batch_chunk(chunk: List[Tuple[int, str, str]]) -> List[Dict[str, Any]]:
+    """
+    查询一批单词
+
+    Args:
+        chunk: [(行号, 单词, 语境)]
+
+    Returns:
+        每个单词的结果记录
+    """
+    records = []
+    for line_no, word, context in chunk:
+        try:
+            result = _batch_lookup.lookup(word, context).to_dict()
+        except Exception as e:
+            result = {'success': False, 'word': word, 'message': f'查询失败: {e}'}
+        record = {'line': line_no, 'input': word}
+        if context:
+            record['context'] = context
+        record.update(result)
+        records.append(record)
+    return records
+
+
+def _load_completed_lines(path: str) -> Set[int]:
+    """
+    读取之前的JSONL输出，返回已完成的行号
+
+    Args:
+        path: 之前的输出文件
+
+    Returns:
+        已完成的行号集合（文件不存在时为空）
+    """
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                completed.add(int(json.loads(line)['line']))
+            except (ValueError, KeyError, TypeError):
+                # 中断时写了一半的行或非结果行，忽略
+                continue
+    return completed
+
+
+def _read_batch_items(stream: TextIO, skip_lines: Set[int]) -> Iterator[Tuple[int, str, str]]:
+    """
+    逐行读取批量输入
+
+    每行格式为 "单词" 或 "单词<TAB>语境"，空行会被跳过（但仍占用行号）。
+
+    Args:
+        stream: 输入流
+        skip_lines: 需要跳过的行号（断点续跑）
+
+    Yields:
+        (行号, 单词, 语境)
+    """
+    for line_no, line in enumerate(stream, 1):
+        if line_no in skip_lines:
+            continue
+        line = line.rstrip('\r\n')
+        word, _, context = line.partition('\t')
+        word = word.strip()
+        if not word:
+            continue
+        yield line_no, word, context.strip()
+
+
+def _chunked(items: Iterator[Tuple[int, str, str]], size: int) -> Iterator[List[Tuple[int, str, str]]]:
+    """将输入按固定大小分块"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    input_path: str,
+    output: TextIO,
+    workers: int = 1,
+    ordered: bool = False,
+    resume_from: Optional[str] = None,
+    chunk_size: int = 16,
+    use_semantic_search: bool = True,
+    db_path: Optional[str] = None
+) -> int:
+    """
+    非交互批量查询，结果以JSONL流式输出
+
+    Args:
+        input_path: 输入文件路径（'-' 表示stdin）
+        output: 结果输出流
+        workers: 工作进程数（<=1 时在当前进程中执行）
+        ordered: 是否按输入顺序输出
+        resume_from: 之前的JSONL输出，其中已完成的行会被跳过
+        chunk_size: 每个任务包含的单词数
+        use_semantic_search: 是否启用语义匹配
+        db_path: 词典数据库路径
+
+    Returns:
+        成功写出的结果数
+    """
+    skip_lines = _load_completed_lines(resume_from) if resume_from else set()
+    if skip_lines:
+        print(f"✓ 断点续跑: 跳过已完成的 {len(skip_lines)} 行", file=sys.stderr)
+
+    stream = sys.stdin if input_path == '-' else open(input_path, 'r', encoding='utf-8')
+    chunks = _chunked(_read_batch_items(stream, skip_lines), max(1, chunk_size))
+
+    written = 0
+    start = time.perf_counter()
+
+    def emit(records: List[Dict[str, Any]]):
+        nonlocal written
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        output.flush()
+        written += len(records)
+
+    try:
+        # 库内部的提示信息改写到stderr，stdout只保留JSONL
+        with redirect_stdout(sys.stderr):
+            if workers <= 1:
+                _init_batch_worker(use_semantic_search, db_path)
+                for chunk in chunks:
+                    emit(_lookup_batch_chunk(chunk))
+            else:
+                # 限制在途任务数量，保证输入可以是任意长度的流
+                max_pending = workers * 4
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_batch_worker,
+                    initargs=(use_semantic_search, db_path)
+                ) as executor:
+                    if ordered:
+                        pending = deque()
+                        for chunk in chunks:
+                            pending.append(executor.submit(_lookup_batch_chunk, chunk))
+                            if len(pending) >= max_pending:
+                                emit(pending.popleft().result())
+                        while pending:
+                            emit(pending.popleft().result())
+                    else:
+                        pending = set()
+                        for chunk in chunks:
+                            pending.add(executor.submit(_lookup_batch_chunk, chunk))
+                            if len(pending) >= max_pending:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    emit(future.result())
+                        for future in pending:
+                            emit(future.result())
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"✓ 批量查询完成: {written} 个单词，用时 {elapsed:.1f} 秒（{rate:.1f} 个/秒）", file=sys.stderr)
+    return written
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='单词查询系统（不带参数时进入交互模式）')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='批量查询：从文件读取单词（"-" 表示stdin），每行 "单词" 或 "单词<TAB>语境"')
+    parser.add_argument('--workers', type=int, default=1, help='工作进程数（默认1）')
+    parser.add_argument('--ordered', action='store_true', help='按输入顺序输出结果')
+    parser.add_argument('--resume-from', metavar='JSONL', help='之前的输出文件，跳过其中已完成的行')
+    parser.add_argument('--chunk-size', type=int, default=16, help='每个任务包含的单词数（默认16）')
+    parser.add_argument('--no-semantic', action='store_true', help='禁用AI语义匹配')
+    parser.add_argument('--db', help='词典数据库路径（默认 databases/word_details.db）')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口（交互界面 / 批量查询）"""
+    args = _parse_args(argv)
+
+    if args.batch:
+        run_batch(
+            input_path=args.batch,
+            output=sys.stdout,
+            workers=args.workers,
+            ordered=args.ordered,
+            resume_from=args.resume_from,
+            chunk_size=args.chunk_size,
+            use_semantic_search=not args.no_semantic,
+            db_path=args.db
+        )
+        return
+
     print("=" * 70)
     print("单词查询系统 - AI智能语义匹配")
     print("=" * 70)
@@ -1198,7 +1790,7 @@ def main():
     print("• 匹配分数可视化 - 显示每个释义的匹配程度")
 
     try:
-        lookup = WordLookup(use_semantic_search=True)
+        lookup = WordLookup(use_semantic_search=not args.no_semantic, db_path=args.db)
 
         # 显示使用的模式
         if lookup.use_semantic_search:
@@ -1212,7 +1804,7 @@ def main():
     except Exception as e:
         print(f"\n初始化失败: {e}")
         print("如果模型下载失败，将自动降级到传统匹配算法")
-        lookup = WordLookup(use_semantic_search=False)
+        lookup = WordLookup(use_semantic_search=False, db_path=args.db)
 
     while True:
         print("\n" + "=" * 70)
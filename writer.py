@@ -11,11 +11,17 @@
 
 import cv2
 import numpy as np
+import os
+import json
+import tempfile
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterable
 from dataclasses import dataclass
 from PIL import Image, ImageDraw, ImageFont
 import re
+import threading
+
+from bambu_adapter import PrinterConfig
 
 
 @dataclass
@@ -252,6 +258,262 @@ class Skeletonizer:
         return strokes
 
 
+DEFAULT_GLYPH_CACHE_DIR = str(Path(__file__).parent / "glyph_cache")
+
+# 字形缓存默认预热的字符：ASCII可打印字符、音标符号和常用中文标点
+GLYPH_WARMUP_CHARS = ''.join(chr(c) for c in range(32, 127)) + 'ˈˌːəɪʊæɒʌɔɜɑθðʃʒŋ'
+GLYPH_WARMUP_CHARS_CHINESE = '，。、；：？！（）《》“”‘’…—'
+
+
+@dataclass
+class Glyph:
+    """缓存的字形"""
+    advance: float  # 前进宽度（以字号为单位）
+    strokes: List[np.ndarray]  # 笔画折线 (N, 2)，以字号为单位，原点为基线左端，y向下
+
+
+class GlyphCache:
+    """
+    字形笔画缓存
+
+    按 (字体, 字号, 字符) 缓存每个字符骨架化后提取的笔画折线（以字号为单位
+    归一化）和前进宽度。书写时按前进宽度依次摆放缓存的笔画即可，
+    不需要每次都渲染整段文字、骨架化并提取轮廓。
+
+    磁盘格式：每个字体和字号一个JSON文件
+        <cache_dir>/<字体名>-<字体文件大小>-<字号>.json
+        {"format": 1, "font": ..., "size": ..., "ascent": ..., "descent": ...,
+         "glyphs": {字符: {"advance": ..., "strokes": [[x0, y0, x1, y1, ...], ...]}}}
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_GLYPH_CACHE_DIR,
+        skeletonizer: Optional['Skeletonizer'] = None,
+        simplify: float = 0.5
+    ):
+        """
+        初始化字形缓存
+
+        Args:
+            cache_dir: 缓存目录（为None时只缓存在内存中）
+            skeletonizer: 骨架化器（默认新建）
+            simplify: 笔画折线简化的容差（像素，0表示不简化）
+        """
+        self.cache_dir = cache_dir
+        self.skeletonizer = skeletonizer or Skeletonizer()
+        self.simplify = simplify
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        # (字体路径, 字号) -> 字形表 / 度量 (上升, 下降) / PIL字体
+        self._tables: Dict[Tuple[str, int], Dict[str, Glyph]] = {}
+        self._metrics: Dict[Tuple[str, int], Tuple[float, float]] = {}
+        self._fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        self._dirty: set = set()
+
+    @staticmethod
+    def font_id(font_path: str) -> str:
+        """字体标识（文件名 + 文件大小，替换字体文件后不会误用旧缓存）"""
+        try:
+            size = os.path.getsize(font_path)
+        except OSError:
+            size = 0
+        return f"{Path(font_path).stem}-{size}"
+
+    def _path(self, font_path: str, size: int) -> str:
+        return os.path.join(self.cache_dir, f"{self.font_id(font_path)}-{size}.json")
+
+    def _font(self, font_path: str, size: int):
+        """加载PIL字体（调用方持有锁）"""
+        key = (font_path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            try:
+                font = ImageFont.truetype(font_path, size)
+            except Exception as e:
+                print(f"警告: 无法加载字体 {font_path}: {e}")
+                font = ImageFont.load_default()
+            self._fonts[key] = font
+        return font
+
+    def _table(self, font_path: str, size: int) -> Dict[str, Glyph]:
+        """获取字形表（首次使用时从磁盘加载，调用方持有锁）"""
+        key = (font_path, size)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        table = {}
+        if self.cache_dir:
+            try:
+                with open(self._path(font_path, size), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == self.FORMAT_VERSION:
+                    for char, item in data['glyphs'].items():
+                        table[char] = Glyph(
+                            advance=item['advance'],
+                            strokes=[np.asarray(stroke, dtype=np.float32).reshape(-1, 2)
+                                     for stroke in item['strokes']]
+                        )
+                    self._metrics[key] = (data['ascent'], data['descent'])
+            except (OSError, ValueError, KeyError):
+                pass
+
+        if key not in self._metrics:
+            ascent, descent = self._font(font_path, size).getmetrics()
+            self._metrics[key] = (ascent / size, descent / size)
+
+        self._tables[key] = table
+        return table
+
+    def metrics(self, font_path: str, size: int) -> Tuple[float, float]:
+        """
+        获取字体度量
+
+        Args:
+            font_path: 字体路径
+            size: 字号（像素）
+
+        Returns:
+            (上升, 下降)，以字号为单位
+        """
+        with self._lock:
+            self._table(font_path, size)
+            return self._metrics[(font_path, size)]
+
+    def get_many(self, font_path: str, size: int, text: str) -> List[Glyph]:
+        """
+        获取一段文字中每个字符的字形（未缓存的字符现场生成）
+
+        Args:
+            font_path: 字体路径
+            size: 字号（像素）
+            text: 文字
+
+        Returns:
+            字形列表（与字符一一对应）
+        """
+        with self._lock:
+            table = self._table(font_path, size)
+            glyphs = []
+            for char in text:
+                glyph = table.get(char)
+                if glyph is None:
+                    self.misses += 1
+                    glyph = table[char] = self._build(font_path, size, char)
+                    self._dirty.add((font_path, size))
+                else:
+                    self.hits += 1
+                glyphs.append(glyph)
+            return glyphs
+
+    def _build(self, font_path: str, size: int, char: str) -> Glyph:
+        """渲染单个字符并提取笔画（调用方持有锁）"""
+        font = self._font(font_path, size)
+        advance = float(font.getlength(char))
+        if char.isspace():
+            return Glyph(advance=advance / size, strokes=[])
+
+        ascent, descent = font.getmetrics()
+        left, top, right, bottom = font.getbbox(char, anchor='ls')
+        pad = size // 4 + 2
+        origin_x = pad - min(0, left)
+        origin_y = pad + max(ascent, -top)
+        width = int(np.ceil(max(right, advance))) + origin_x + pad
+        height = origin_y + max(descent, bottom) + pad
+
+        image = Image.new('L', (width, height), color=255)
+        ImageDraw.Draw(image).text((origin_x, origin_y), char, font=font, fill=0, anchor='ls')
+
+        skeleton = self.skeletonizer.skeletonize(np.array(image))
+        strokes = []
+        for points in self.skeletonizer.extract_strokes(skeleton):
+            path = np.asarray(points, dtype=np.float32).reshape(-1, 1, 2)
+            if self.simplify > 0:
+                path = cv2.approxPolyDP(path, self.simplify, closed=False)
+            path = path.reshape(-1, 2)
+            if len(path) > 1:
+                strokes.append((path - (origin_x, origin_y)) / size)
+
+        return Glyph(advance=advance / size, strokes=strokes)
+
+    def warm_up(self, font_path: str, size: int, chars: Iterable[str] = GLYPH_WARMUP_CHARS) -> int:
+        """
+        预先生成常用字符的字形并保存到磁盘
+
+        Args:
+            font_path: 字体路径
+            size: 字号（像素）
+            chars: 字符集
+
+        Returns:
+            新生成的字形数量
+        """
+        misses = self.misses
+        self.get_many(font_path, size, ''.join(dict.fromkeys(chars)))
+        built = self.misses - misses
+        if built:
+            self.save()
+            print(f"✓ 字形缓存预热完成: {Path(font_path).name} {size}px，新生成 {built} 个字形")
+        return built
+
+    def save(self):
+        """把新增的字形写入磁盘（原子替换）"""
+        if not self.cache_dir:
+            return
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            if not dirty:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for font_path, size in dirty:
+                ascent, descent = self._metrics[(font_path, size)]
+                data = {
+                    'format': self.FORMAT_VERSION,
+                    'font': Path(font_path).name,
+                    'size': size,
+                    'ascent': ascent,
+                    'descent': descent,
+                    'glyphs': {
+                        char: {
+                            'advance': round(glyph.advance, 5),
+                            'strokes': [[round(float(v), 4) for v in stroke.ravel()] for stroke in glyph.strokes],
+                        }
+                        for char, glyph in self._tables[(font_path, size)].items()
+                    },
+                }
+                path = self._path(font_path, size)
+                fd, tmp_path = tempfile.mkstemp(prefix='.glyph-', dir=self.cache_dir)
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    os.unlink(tmp_path)
+                    self._dirty.add((font_path, size))
+                    print(f"警告: 字形缓存写入失败: {e}")
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计
+
+        Returns:
+            {'hits', 'misses', 'hit_rate', 'glyphs', 'fonts'}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'glyphs': sum(len(table) for table in self._tables.values()),
+                'fonts': len(self._tables),
+            }
+
+
 class GcodeGenerator:
     """Gcode生成器 - 将笔画转化为Gcode命令"""
 
@@ -290,6 +552,7 @@ class GcodeGenerator:
         self.layer_height = layer_height
         self.nozzle_temp = nozzle_temp
         self.bed_temp = bed_temp
+        self.printer_config = PrinterConfig.get_model_config(printer_model)
 
         # Gcode命令列表
         self.gcode_lines: List[str] = []
@@ -358,6 +621,56 @@ class GcodeGenerator:
 
         return '\n'.join(self.gcode_lines)
 
+    def generate_gcode_from_paths(
+        self,
+        paths: List[np.ndarray],
+        image_width: int,
+        image_height: int,
+        margin_x: float = 10.0,
+        margin_y: float = 10.0
+    ) -> str:
+        """
+        由笔画折线数组生成Gcode（坐标换算与 generate_gcode 相同）
+
+        Args:
+            paths: 笔画列表，每个笔画为图像坐标的 (N, 2) 数组
+            image_width: 图像宽度（像素）
+            image_height: 图像高度（像素）
+            margin_x: X方向边距（毫米）
+            margin_y: Y方向边距（毫米）
+
+        Returns:
+            Gcode字符串
+        """
+        self.gcode_lines = []
+        self._add_header()
+
+        # 与整段渲染一样，图像外的部分不书写（防止越出工作区）
+        paths = [np.clip(path, 0, (image_width, image_height)) for path in paths]
+
+        scale = np.array([
+            (self.work_area_width - 2 * margin_x) / image_width,
+            -(self.work_area_height - 2 * margin_y) / image_height
+        ])
+        offset = np.array([margin_x, self.work_area_height - margin_y])
+        pen_down = f"G1 Z{self.z_down} F{self.feed_rate}"
+        pen_up = f"G1 Z{self.z_up} F{self.feed_rate}"
+        draw = f" F{self.feed_rate}"
+
+        lines = self.gcode_lines
+        for path in paths:
+            if len(path) == 0:
+                continue
+            points = (np.asarray(path, dtype=np.float64) * scale + offset).tolist()
+            x, y = points[0]
+            lines.append(f"G0 X{x:.3f} Y{y:.3f}")
+            lines.append(pen_down)
+            lines.extend(f"G1 X{x:.3f} Y{y:.3f}{draw}" for x, y in points[1:])
+            lines.append(pen_up)
+
+        self._add_footer()
+        return '\n'.join(self.gcode_lines)
+
     def _add_header(self):
         """添加Gcode头部"""
         # 获取工作区域配置
@@ -430,6 +743,11 @@ class GcodeGenerator:
 class WriterMachine:
     """写字机控制器 - 整合所有功能"""
 
+    # 与 TextRenderer.render_text 的默认值一致
+    FONT_SIZE = 40
+    CANVAS_WIDTH = 800
+    CANVAS_HEIGHT = 400
+
     def __init__(
         self,
         chinese_font_path: Optional[str] = None,
@@ -439,7 +757,9 @@ class WriterMachine:
         printer_model: str = 'A1MINI',
         layer_height: float = 0.2,
         nozzle_temp: int = 200,
-        bed_temp: int = 60
+        bed_temp: int = 60,
+        glyph_cache: Optional[GlyphCache] = None,
+        use_glyph_cache: bool = True
     ):
         """
         初始化写字机控制器
@@ -453,9 +773,15 @@ class WriterMachine:
             layer_height: 层高（毫米）
             nozzle_temp: 喷嘴温度（摄氏度）
             bed_temp: 热床温度（摄氏度）
+            glyph_cache: 字形缓存（默认新建，缓存在 glyph_cache/ 目录）
+            use_glyph_cache: 是否用缓存的字形拼接文字（Handright手写体不使用缓存）
         """
         self.renderer = TextRenderer(chinese_font_path, english_font_path)
         self.skeletonizer = Skeletonizer()
+        self.use_glyph_cache = use_glyph_cache
+        self.glyph_cache = glyph_cache
+        if use_glyph_cache and glyph_cache is None:
+            self.glyph_cache = GlyphCache(skeletonizer=self.skeletonizer)
         self.gcode_generator = GcodeGenerator(
             work_area_width,
             work_area_height,
@@ -469,6 +795,9 @@ class WriterMachine:
         self.work_area_height = work_area_height
         self.printer_model = printer_model
 
+        # GcodeGenerator保存生成过程中的状态，共享实例时串行书写
+        self._write_lock = threading.Lock()
+
     def write_text(
         self,
         text: str,
@@ -488,8 +817,22 @@ class WriterMachine:
         Returns:
             Gcode字符串
         """
+        with self._write_lock:
+            return self._write_text(text, use_handright, save_gcode_path, save_image_path)
+
+    def _write_text(
+        self,
+        text: str,
+        use_handright: bool,
+        save_gcode_path: Optional[str],
+        save_image_path: Optional[str]
+    ) -> str:
+        """write_text的实现（调用方持有书写锁）"""
         print(f"正在渲染文字: {text}")
 
+        if self.glyph_cache is not None and self.use_glyph_cache and not (use_handright and self._has_chinese(text)):
+            return self._write_cached_text(text, save_gcode_path, save_image_path)
+
         # 1. 渲染文字
         if use_handright and self._has_chinese(text):
             rendered_image = self.renderer.render_text_with_handright(text)
@@ -536,6 +879,105 @@ class WriterMachine:
 
         return gcode
 
+    def _font_for(self, text: str) -> str:
+        """选择字体（与 TextRenderer.render_text 相同：含中文时整段使用中文字体）"""
+        if self._has_chinese(text):
+            return self.renderer.chinese_font_path
+        return self.renderer.english_font_path
+
+    def compose_text(self, text: str) -> List[np.ndarray]:
+        """
+        用缓存的字形拼接文字的笔画
+
+        按前进宽度依次摆放每个字符的笔画，整段文字在画布上水平居中，
+        基线使文字垂直居中（不做字距调整）。画布放不下时整段文字
+        以画布中心等比缩小，保证所有笔画都在画布内。
+
+        Args:
+            text: 要书写的文字
+
+        Returns:
+            笔画列表，每个笔画为画布像素坐标的 (N, 2) 数组
+        """
+        font_path = self._font_for(text)
+        size = self.FONT_SIZE
+        glyphs = self.glyph_cache.get_many(font_path, size, text)
+        ascent, descent = self.glyph_cache.metrics(font_path, size)
+
+        advances = np.array([glyph.advance for glyph in glyphs])
+        starts = np.concatenate(([0.0], np.cumsum(advances)[:-1])) if glyphs else advances
+        origin_x = (self.CANVAS_WIDTH - advances.sum() * size) / 2
+        baseline = (self.CANVAS_HEIGHT + (ascent - descent) * size) / 2
+
+        paths = []
+        for glyph, start in zip(glyphs, starts):
+            offset = np.array([origin_x + start * size, baseline])
+            paths.extend(stroke * size + offset for stroke in glyph.strokes)
+        if not paths:
+            return paths
+
+        # 超出画布时以画布中心等比缩小（笔画可能超出前进宽度，按实际范围计算）
+        points = np.concatenate(paths)
+        center = np.array([self.CANVAS_WIDTH / 2, self.CANVAS_HEIGHT / 2])
+        extent = np.abs(points - center).max(axis=0)
+        scale = min(1.0, *(center / np.maximum(extent, 1e-6)))
+        if scale < 1.0:
+            paths = [(path - center) * scale + center for path in paths]
+        return paths
+
+    def _write_cached_text(
+        self,
+        text: str,
+        save_gcode_path: Optional[str],
+        save_image_path: Optional[str]
+    ) -> str:
+        """用字形缓存书写（调用方持有书写锁）"""
+        paths = self.compose_text(text)
+        self.glyph_cache.save()
+        print(f"[OK] 由字形缓存拼接了 {len(paths)} 个笔画")
+
+        # 保存笔画预览图像
+        if save_image_path:
+            preview = np.full((self.CANVAS_HEIGHT, self.CANVAS_WIDTH), 255, dtype=np.uint8)
+            cv2.polylines(preview, [np.round(p).astype(np.int32) for p in paths], False, 0, 1)
+            cv2.imwrite(save_image_path, preview)
+            print(f"[OK] 渲染图像已保存到: {save_image_path}")
+
+        print("正在生成Gcode...")
+        gcode = self.gcode_generator.generate_gcode_from_paths(
+            paths,
+            image_width=self.CANVAS_WIDTH,
+            image_height=self.CANVAS_HEIGHT
+        )
+
+        if save_gcode_path:
+            self.gcode_generator.save_gcode(gcode, save_gcode_path)
+
+        return gcode
+
+    def warm_up_glyphs(self, chars: Optional[str] = None) -> int:
+        """
+        预热字形缓存（英文字体的ASCII和音标字符，中文字体的常用标点）
+
+        Args:
+            chars: 额外预热的字符（按是否为中文选择字体）
+
+        Returns:
+            新生成的字形数量
+        """
+        if self.glyph_cache is None:
+            return 0
+        built = 0
+        if Path(self.renderer.english_font_path).exists():
+            built += self.glyph_cache.warm_up(self.renderer.english_font_path, self.FONT_SIZE)
+        if Path(self.renderer.chinese_font_path).exists():
+            built += self.glyph_cache.warm_up(
+                self.renderer.chinese_font_path, self.FONT_SIZE, GLYPH_WARMUP_CHARS_CHINESE
+            )
+        if chars:
+            built += self.glyph_cache.warm_up(self._font_for(chars), self.FONT_SIZE, chars)
+        return built
+
     def _has_chinese(self, text: str) -> bool:
         """检查文本是否包含中文字符"""
         return bool(re.search(r'[\u4e00-\u9fff]', text))